@@ -0,0 +1,6 @@
+"""
+Micro-benchmarks for the scoring, serialization and formatting hot paths.
+
+Cases live in benchmarks.cases, timing and the JSON history in
+benchmarks.runner; see benchmarks.__main__ for the command line.
+"""
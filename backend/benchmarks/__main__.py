@@ -0,0 +1,94 @@
+"""
+python -m benchmarks run [--only NAME ...] [--scales 1000,10000] [--repeat N] [--label TEXT]
+python -m benchmarks compare [BASE] [HEAD] [--threshold 0.1] [--stat median|min]
+python -m benchmarks list
+
+Run from backend/. `run` uses a throwaway test database (like the test
+suite) and appends the results to the history file; `compare` exits with
+status 1 when any case regressed beyond the threshold.
+"""
+import argparse
+import os
+import sys
+
+import django
+
+
+def _scales(value):
+    return tuple(int(part) for part in value.split(',') if part)
+
+
+def main(argv=None):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings.dev')
+    django.setup()
+
+    from benchmarks import runner
+    from benchmarks.cases import CASES
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('--history', default=runner.DEFAULT_HISTORY, help='JSON history file')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = sub.add_parser('run', help='Run benchmarks and append the results to the history')
+    run_parser.add_argument('--only', nargs='+', choices=sorted(CASES), help='Cases to run (default: all)')
+    run_parser.add_argument('--scales', type=_scales, default=runner.DEFAULT_SCALES,
+                            help='Comma-separated scales (default: 1000,10000,100000)')
+    run_parser.add_argument('--repeat', type=int, default=runner.DEFAULT_REPEAT, help='Timed calls per case and scale')
+    run_parser.add_argument('--label', default='', help='Free-text note stored with the run')
+
+    compare_parser = sub.add_parser('compare', help='Compare two runs from the history')
+    compare_parser.add_argument('base', nargs='?', type=int, default=-2, help='Base run id (default: second latest)')
+    compare_parser.add_argument('head', nargs='?', type=int, default=-1, help='Head run id (default: latest)')
+    compare_parser.add_argument('--threshold', type=float, default=runner.DEFAULT_THRESHOLD,
+                                help='Flag slowdowns above this fraction (default: 0.10)')
+    compare_parser.add_argument('--stat', choices=('median', 'min'), default='median')
+
+    sub.add_parser('list', help='List the recorded runs')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        return _run(runner, args)
+    if args.command == 'compare':
+        return _compare(runner, args)
+    for run in runner.load_history(args.history):
+        print(f"{run['id']:>4}  {run['timestamp']}  {run['commit'] or '-':<10} {run['database']:<10} {run['label']}")
+    return 0
+
+
+def _run(runner, args):
+    from django.db import connection
+
+    # Same isolation as the test suite: never touch the configured database
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        results = runner.run_benchmarks(args.only, args.scales, args.repeat, log=print)
+        run = runner.record_run(args.history, results, args.label)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+    print(f"Recorded run {run['id']} in {args.history}")
+    return 0
+
+
+def _compare(runner, args):
+    history = runner.load_history(args.history)
+    try:
+        base, head = runner.find_run(history, args.base), runner.find_run(history, args.head)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+
+    rows = runner.compare_runs(base, head, args.threshold, args.stat)
+    print(f"Run {base['id']} ({base['commit'] or '-'}) -> run {head['id']} ({head['commit'] or '-'}), {args.stat}")
+    for name, scale, before, after, change, regressed in rows:
+        flag = 'REGRESSION' if regressed else ''
+        print(f'{name:<24} n={scale:<8} {before * 1000:10.3f} ms -> {after * 1000:10.3f} ms  {change:+7.1%}  {flag}')
+
+    regressions = sum(1 for row in rows if row[-1])
+    if regressions:
+        print(f'{regressions} regression(s) above {args.threshold:.0%}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
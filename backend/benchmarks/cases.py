@@ -0,0 +1,247 @@
+"""
+Benchmark cases. Each case is `setup(n) -> callable`; only the callable is
+timed. `n` is the scale: status logs on the scored task for the scoring
+cases, serialized rows for the serializer cases, EXP values for the level
+helpers.
+
+Serializer cases use unsaved model instances, so they measure Python work
+(field lookup, timestamp formatting, URL building) and no SQL. Scoring cases
+read the task's status logs, which is what the production code does, so
+they need a database (benchmarks.__main__ creates a throwaway one).
+
+The `*_list` pairs time a whole list response body from a table of `n` rows,
+query included: `serializer` is the DRF serializer plus JSONRenderer, `fast`
+the compiled read path (tasks.utils.fastread). Both produce the same bytes.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+from django.utils import timezone
+
+from rest_framework.renderers import JSONRenderer
+
+from tasks.models import Notification, Task, TaskStatusLog
+from tasks.serializers import NotificationSerializer, TaskSerializer, UserHallOfFameSerializer
+from tasks.utils.fastread import ReadPlan
+from tasks.utils.fragments import reset_fragment_cache
+from tasks.utils.levels import get_exp_bar_percent
+from tasks.utils.task_logic import calculate_exp, calculate_honor, total_time_in_work
+
+User = get_user_model()
+
+BULK_BATCH_SIZE = 5000
+
+CASES = {}
+
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+# ───────────────────────────────────────────────────────────
+# Fixtures
+# ───────────────────────────────────────────────────────────
+
+_scored_tasks = {}
+
+
+def scored_task(n):
+    """An in-work task with `n` status logs (alternating in/out of work), shared by the scoring cases."""
+    if n not in _scored_tasks:
+        giver, _ = User.objects.get_or_create(username='bench-giver', defaults={'email': 'bench-giver@example.com'})
+        task = Task.objects.create(
+            title=f'Benchmark {n}', giver=giver, assignee=giver, status='in_work',
+            priority='high', difficulty='medium', approx_time=3.0,
+            deadline=timezone.now() + timedelta(days=2),
+        )
+        TaskStatusLog.objects.bulk_create(
+            (TaskStatusLog(task=task, user=giver,
+                           old_status='not_in_work' if i % 2 == 0 else 'in_work',
+                           new_status='in_work' if i % 2 == 0 else 'not_moderated')
+             for i in range(n)),
+            batch_size=BULK_BATCH_SIZE,
+        )
+        _scored_tasks[n] = task
+    # Fresh instance per case: no cached relations carry over between runs
+    return Task.objects.get(pk=_scored_tasks[n].pk)
+
+
+_list_owners = {}
+
+
+def list_owner(n):
+    """A user giving `n` tasks and holding `n` notifications, plus `n` users named after it; shared by the list cases."""
+    if n not in _list_owners:
+        owner = User.objects.create(username=f'bench-owner-{n}', email=f'bench-owner-{n}@example.com')
+        now = timezone.now()
+        Task.objects.bulk_create(
+            (Task(title=f'Task {i}', description='Lorem ipsum dolor sit amet ' * (i % 8), giver=owner,
+                  assignee=owner if i % 2 else None, status='in_work', deadline=now + timedelta(hours=i % 72))
+             for i in range(n)),
+            batch_size=BULK_BATCH_SIZE,
+        )
+        Notification.objects.bulk_create(
+            (Notification(user=owner, title=f'Notification {i}', message='Task updated') for i in range(n)),
+            batch_size=BULK_BATCH_SIZE,
+        )
+        User.objects.bulk_create(
+            (User(username=f'{owner.username}-{i}', email=f'{owner.username}-{i}@example.com', level=i % 60, exp=i,
+                  avatar=f'avatars/user{i}.png', feedback_count=i % 5, feedback_rating_sum=i % 5 * 4)
+             for i in range(n)),
+            batch_size=BULK_BATCH_SIZE,
+        )
+        _list_owners[n] = owner
+    return _list_owners[n]
+
+
+def reset_fixtures():
+    _scored_tasks.clear()
+    _list_owners.clear()
+
+
+def memory_users(n):
+    return [
+        User(id=i + 1, username=f'user{i}', first_name='Bench', last_name=str(i),
+             exp=i * 37, honor=i, level=i % 60, avatar=f'avatars/user{i}.png')
+        for i in range(n)
+    ]
+
+
+def memory_tasks(n):
+    giver, assignee = memory_users(2)
+    now = timezone.now()
+    return [
+        Task(id=i + 1, title=f'Task {i}', description='Lorem ipsum dolor sit amet ' * (i % 8),
+             giver=giver, assignee=assignee, status='in_work',
+             created_at=now - timedelta(minutes=i), updated_at=now - timedelta(seconds=i),
+             deadline=now + timedelta(hours=i % 72) if i % 3 else None)
+        for i in range(n)
+    ]
+
+# ───────────────────────────────────────────────────────────
+# Scoring
+# ───────────────────────────────────────────────────────────
+
+@case('total_time_in_work')
+def bench_total_time_in_work(n):
+    task = scored_task(n)
+    return lambda: total_time_in_work(task)
+
+
+@case('calculate_exp')
+def bench_calculate_exp(n):
+    task = scored_task(n)
+    return lambda: calculate_exp(task)
+
+
+@case('calculate_honor')
+def bench_calculate_honor(n):
+    task = scored_task(n)
+    return lambda: calculate_honor(task)
+
+# ───────────────────────────────────────────────────────────
+# Serialization and formatting
+# ───────────────────────────────────────────────────────────
+
+@case('task_serializer')
+def bench_task_serializer(n):
+    tasks = memory_tasks(n)
+    return lambda: TaskSerializer(tasks, many=True).data
+
+
+@case('hall_of_fame_avatars')
+def bench_hall_of_fame_avatars(n):
+    users = memory_users(n)
+    request = RequestFactory(HTTP_HOST=settings.ALLOWED_HOSTS[0]).get('/hall-of-fame/')
+    return lambda: UserHallOfFameSerializer(users, many=True, context={'request': request}).data
+
+
+# ───────────────────────────────────────────────────────────
+# List responses: serializer vs compiled read path
+# ───────────────────────────────────────────────────────────
+
+def _request():
+    return RequestFactory(HTTP_HOST=settings.ALLOWED_HOSTS[0]).get('/')
+
+
+def _serializer_list(serializer_class, queryset):
+    request = _request()
+    return lambda: JSONRenderer().render(serializer_class(queryset.all(), many=True, context={'request': request}).data)
+
+
+def _fast_list(serializer_class, queryset):
+    request = _request()
+
+    def run():
+        plan = ReadPlan.for_serializer(serializer_class, {'request': request})
+        return plan.render(plan.fetch(queryset.all()))
+    return run
+
+
+def owner_tasks(n):
+    return Task.objects.filter(giver=list_owner(n)).select_related('giver', 'assignee').order_by('-created_at')
+
+
+def owner_notifications(n):
+    return Notification.objects.filter(user=list_owner(n))
+
+
+def ranked_users(n):
+    return User.objects.filter(username__startswith=f'{list_owner(n).username}-').order_by('-level', '-exp')
+
+
+@case('task_list_serializer')
+def bench_task_list_serializer(n):
+    return _serializer_list(TaskSerializer, owner_tasks(n))
+
+
+@case('task_list_fast')
+def bench_task_list_fast(n):
+    return _fast_list(TaskSerializer, owner_tasks(n))
+
+
+def _cold(run):
+    def cold():
+        reset_fragment_cache()
+        return run()
+    return cold
+
+
+@case('task_list_serializer_cold')
+def bench_task_list_serializer_cold(n):
+    return _cold(_serializer_list(TaskSerializer, owner_tasks(n)))
+
+
+@case('task_list_fast_cold')
+def bench_task_list_fast_cold(n):
+    return _cold(_fast_list(TaskSerializer, owner_tasks(n)))
+
+
+@case('notification_list_serializer')
+def bench_notification_list_serializer(n):
+    return _serializer_list(NotificationSerializer, owner_notifications(n))
+
+
+@case('notification_list_fast')
+def bench_notification_list_fast(n):
+    return _fast_list(NotificationSerializer, owner_notifications(n))
+
+
+@case('hall_of_fame_list_serializer')
+def bench_hall_of_fame_list_serializer(n):
+    return _serializer_list(UserHallOfFameSerializer, ranked_users(n))
+
+
+@case('hall_of_fame_list_fast')
+def bench_hall_of_fame_list_fast(n):
+    return _fast_list(UserHallOfFameSerializer, ranked_users(n))
+
+
+@case('exp_bar_percent')
+def bench_exp_bar_percent(n):
+    values = [i * 37 for i in range(n)]
+    return lambda: [get_exp_bar_percent(exp) for exp in values]
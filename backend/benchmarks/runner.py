@@ -0,0 +1,131 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from django.db import connection
+
+from benchmarks.cases import CASES, reset_fixtures
+
+DEFAULT_SCALES = (1_000, 10_000, 100_000)
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'history.json')
+
+# ───────────────────────────────────────────────────────────
+# Running
+# ───────────────────────────────────────────────────────────
+
+def time_case(setup, n, repeat):
+    """Warm up once, then time `repeat` calls; returns seconds per call."""
+    call = setup(n)
+    call()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def run_benchmarks(names=None, scales=DEFAULT_SCALES, repeat=DEFAULT_REPEAT, log=None):
+    """
+    Run the named cases (default: all) at every scale. Returns
+    {case: {scale: {'min', 'median', 'repeat'}}}; scales are string keys so
+    the structure round-trips through JSON unchanged.
+    """
+    unknown = set(names or ()) - set(CASES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    results = {}
+    try:
+        for name, setup in CASES.items():
+            if names and name not in names:
+                continue
+            for n in scales:
+                samples = time_case(setup, n, repeat)
+                results.setdefault(name, {})[str(n)] = {
+                    'min': min(samples),
+                    'median': statistics.median(samples),
+                    'repeat': repeat,
+                }
+                if log:
+                    log(f'{name:<24} n={n:<8} median {statistics.median(samples) * 1000:10.3f} ms')
+    finally:
+        reset_fixtures()
+    return results
+
+# ───────────────────────────────────────────────────────────
+# History
+# ───────────────────────────────────────────────────────────
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def record_run(path, results, label=''):
+    """Append a run to the JSON history file and return it."""
+    history = load_history(path)
+    run = {
+        'id': (history[-1]['id'] + 1) if history else 1,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'label': label,
+        'python': platform.python_version(),
+        'database': connection.vendor,
+        'results': results,
+    }
+    history.append(run)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+    os.replace(path + '.tmp', path)
+    return run
+
+# ───────────────────────────────────────────────────────────
+# Comparison
+# ───────────────────────────────────────────────────────────
+
+def find_run(history, run_id):
+    """Look a run up by id; negative ids count from the end (-1 is the latest)."""
+    if run_id < 0:
+        if len(history) < -run_id:
+            raise ValueError(f'History has only {len(history)} run(s).')
+        return history[run_id]
+    for run in history:
+        if run['id'] == run_id:
+            return run
+    raise ValueError(f'No run with id {run_id}.')
+
+
+def compare_runs(base, head, threshold=DEFAULT_THRESHOLD, stat='median'):
+    """
+    Rows of (case, scale, base seconds, head seconds, relative change,
+    regressed) for every case/scale present in both runs. A row regresses
+    when head is slower than base by more than `threshold` (0.10 = 10%).
+    """
+    rows = []
+    for name, scales in head['results'].items():
+        for scale, timing in scales.items():
+            before = base['results'].get(name, {}).get(scale)
+            if before is None:
+                continue
+            change = (timing[stat] - before[stat]) / before[stat] if before[stat] else 0.0
+            rows.append((name, int(scale), before[stat], timing[stat], change, change > threshold))
+    return rows
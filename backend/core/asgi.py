@@ -0,0 +1,33 @@
+import os
+
+import django
+from django.core.handlers.asgi import ASGIHandler
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings.dev')  # or base/prod if needed
+
+
+class AsyncReadsASGIHandler(ASGIHandler):
+    """Resolves requests against core.asgi_urls, where the read-heavy endpoints are async views."""
+    urlconf = 'core.asgi_urls'
+
+    async def get_response_async(self, request):
+        request.urlconf = self.urlconf
+        return await super().get_response_async(request)
+
+
+def create_application(async_reads=None):
+    """
+    Build the ASGI application. With `async_reads` (default: the
+    ASGI_ASYNC_READS setting) task list/detail, notifications, Hall of Fame
+    and public profiles are served by async views; otherwise every route is
+    the same sync view WSGI serves.
+    """
+    django.setup(set_prefix=False)
+    from django.conf import settings
+
+    if async_reads is None:
+        async_reads = settings.ASGI_ASYNC_READS
+    return AsyncReadsASGIHandler() if async_reads else ASGIHandler()
+
+
+application = create_application()
@@ -0,0 +1,17 @@
+"""
+URLconf used by the ASGI application: async read views for the hot
+endpoints first, then every regular route (see tasks.async_views).
+"""
+from django.urls import path
+
+from tasks import async_views
+from core.urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('tasks/', async_views.task_list),
+    path('tasks/<int:pk>/', async_views.task_detail),
+    path('notifications/', async_views.notification_list),
+    path('notifications/<int:pk>/', async_views.notification_detail),
+    path('hall-of-fame/', async_views.hall_of_fame),
+    path('auth/public-profile/<int:id>/', async_views.public_profile),
+] + sync_urlpatterns
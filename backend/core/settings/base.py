@@ -29,6 +29,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',                  # must be at the top for CORS
+    'tasks.middleware.metrics.MetricsMiddleware',             # request latency/SQL/serializer metrics
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -37,6 +38,7 @@ MIDDLEWARE = [
 
     'django.contrib.auth.middleware.AuthenticationMiddleware',  # ⬅️ This must be above ActiveUserMiddleware
     'tasks.middleware.live_status.ActiveUserMiddleware',        # ⬅️ Your middleware depends on request.user
+    'tasks.middleware.db_routing.ReplicaRoutingMiddleware',     # inside live_status: its last_seen write is not a client write
 
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -73,6 +75,32 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
         'HOST': os.getenv('POSTGRES_HOST'),
         'PORT': os.getenv('POSTGRES_PORT'),
+        # Persistent connections, re-validated before reuse. Under ASGI set
+        # DB_CONN_MAX_AGE=0 and pool with PgBouncer instead.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+# Optional read replica: safe GET reads go there (tasks.db_router), except for
+# clients that wrote in the last REPLICA_STICKY_SECONDS
+if os.getenv('POSTGRES_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('POSTGRES_REPLICA_HOST'),
+        'PORT': os.getenv('POSTGRES_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_REPLICA_ALIAS = 'replica' if 'replica' in DATABASES else None
+DATABASE_ROUTERS = ['tasks.db_router.PrimaryReplicaRouter']
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 5))
+REPLICA_STICKY_COOKIE = os.getenv('REPLICA_STICKY_COOKIE', 'db_primary')  # set on every write response
+
+# Cache (set CACHE_BACKEND/CACHE_LOCATION to a shared backend, e.g. Redis, for multi-worker deployments)
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'gtm-default'),
     }
 }
 
@@ -106,13 +134,26 @@ CORS_ALLOW_ALL_ORIGINS = False
 # REST
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'tasks.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_THROTTLE_CLASSES': (
+        'tasks.throttling.TokenBucketThrottle',
+    ),
+    # Token buckets: "<burst>/<period>" per user (or per IP when anonymous)
+    'DEFAULT_THROTTLE_RATES': {
+        'read': os.getenv('THROTTLE_READ', '600/min'),
+        'write': os.getenv('THROTTLE_WRITE', '120/min'),
+        'auth': os.getenv('THROTTLE_AUTH', '20/min'),
+        'export': os.getenv('THROTTLE_EXPORT', '10/hour'),
+    },
 }
 
+# 'local' (per-process buckets) or 'cache' (shared through CACHES['default'])
+THROTTLE_BACKEND = os.getenv('THROTTLE_BACKEND', 'local')
+
 # JWT
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
@@ -120,4 +161,74 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'UPDATE_LAST_LOGIN': True,
-}
\ No newline at end of file
+}
+
+# Bulk import (tasks.utils.importer); the hashing pool is for the import_data
+# command only, /admin/import/ hashes in-process
+IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 1000))
+IMPORT_HASH_WORKERS = int(os.getenv('IMPORT_HASH_WORKERS', os.cpu_count() or 1))
+
+# Retention (python manage.py apply_retention). `days: None` disables a policy.
+RETENTION_POLICIES = {
+    'notifications': {'days': int(os.getenv('RETENTION_NOTIFICATIONS_DAYS', 90)), 'only_read': True},
+    'tasks': {
+        'days': int(os.getenv('RETENTION_TASKS_DAYS', 180)),
+        'statuses': ['completed', 'failed'],
+        'keep_with_feedback': True,
+    },
+    'archived_tasks': {'days': None},
+    # Deletes ?since= clients can still learn about (tasks.utils.delta); older cursors get 410
+    'tombstones': {'days': int(os.getenv('RETENTION_TOMBSTONES_DAYS', 30))},
+}
+RETENTION_BATCH_SIZE = int(os.getenv('RETENTION_BATCH_SIZE', 500))
+RETENTION_BATCH_PAUSE = float(os.getenv('RETENTION_BATCH_PAUSE', 0.05))  # seconds between batches
+
+# Soft-delete purger (python manage.py purge_deleted)
+PURGE_BATCH_SIZE = int(os.getenv('PURGE_BATCH_SIZE', 500))
+PURGE_BATCH_PAUSE = float(os.getenv('PURGE_BATCH_PAUSE', 0.05))
+PURGE_GRACE = timedelta(minutes=int(os.getenv('PURGE_GRACE_MINUTES', 0)))
+
+# Admin changelists switch to planner estimates above this many rows (PostgreSQL)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.getenv('ADMIN_ESTIMATED_COUNT_THRESHOLD', 100000))
+
+# Auth caching (tasks.authentication.CachedJWTAuthentication)
+AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', 60))  # seconds
+TOKEN_BLACKLIST_REFRESH_SECONDS = int(os.getenv('TOKEN_BLACKLIST_REFRESH_SECONDS', 30))
+TOKEN_BLACKLIST_FULL_RELOAD_SECONDS = int(os.getenv('TOKEN_BLACKLIST_FULL_RELOAD_SECONDS', 600))
+LAST_SEEN_UPDATE_INTERVAL = int(os.getenv('LAST_SEEN_UPDATE_INTERVAL', 60))  # ActiveUserMiddleware write throttle
+
+# Public profile bundle cache (seconds); invalidated on profile/feedback/comment changes
+PROFILE_BUNDLE_CACHE_TTL = int(os.getenv('PROFILE_BUNDLE_CACHE_TTL', 300))
+
+# Serve the read-heavy endpoints from async views when running under ASGI (core.asgi)
+ASGI_ASYNC_READS = os.getenv('ASGI_ASYNC_READS', 'True') == 'True'
+
+# Metrics (tasks.utils.metrics): Server-Timing header on responses, bearer token
+# required by /metrics when set (otherwise only staff sessions can read it), and
+# where management commands drop .prom files (empty: commands write none)
+SERVER_TIMING = os.getenv('SERVER_TIMING', str(DEBUG)) == 'True'
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_TEXTFILE_DIR = os.getenv('METRICS_TEXTFILE_DIR', '')
+
+# TaskSerializer *_formatted fields when the client sends no ?timestamps=
+# (relative: "exact — x ago", exact: no relative part, none: omitted)
+TASK_TIMESTAMPS_DEFAULT = os.getenv('TASK_TIMESTAMPS_DEFAULT', 'relative')
+
+# Unpaginated task/notification/Hall of Fame lists render through tasks.utils.fastread
+# (values() + compiled field plan) instead of DRF serializers; same bytes
+FAST_READ_LISTS = os.getenv('FAST_READ_LISTS', 'True') == 'True'
+
+# TaskSerializer fragment cache (tasks.utils.fragments): entries in the per-process
+# LRU (0 disables it), an optional CACHES alias shared between processes, and the
+# shared entries' lifetime in seconds
+TASK_FRAGMENT_CACHE_SIZE = int(os.getenv('TASK_FRAGMENT_CACHE_SIZE', 10000))
+TASK_FRAGMENT_CACHE_ALIAS = os.getenv('TASK_FRAGMENT_CACHE_ALIAS', '')
+TASK_FRAGMENT_CACHE_TTL = int(os.getenv('TASK_FRAGMENT_CACHE_TTL', 3600))
+
+# ?since= delta sync (tasks.utils.delta): how far before the cursor each poll reads
+# again, so rows committed by transactions open at the previous poll are not missed
+DELTA_SYNC_OVERLAP_SECONDS = int(os.getenv('DELTA_SYNC_OVERLAP_SECONDS', 5))
+
+# Notification digests (tasks.utils.notify): how many held notifications a digest
+# lists before "...and N more"
+NOTIFICATION_DIGEST_MAX_ITEMS = int(os.getenv('NOTIFICATION_DIGEST_MAX_ITEMS', 10))
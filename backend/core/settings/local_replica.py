@@ -0,0 +1,22 @@
+"""
+Local stand-in for a primary + read replica: two SQLite files and no
+replication, so the replica only changes when you migrate or copy it.
+Handy for watching the routing and read-your-writes stickiness:
+
+    DJANGO_SETTINGS_MODULE=core.settings.local_replica python manage.py migrate
+    DJANGO_SETTINGS_MODULE=core.settings.local_replica python manage.py migrate --database=replica
+    pytest --ds=core.settings.local_replica tests/test_db_router.py
+"""
+from .dev import *
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'primary.sqlite3',
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'replica.sqlite3',
+    },
+}
+DATABASE_REPLICA_ALIAS = 'replica'
@@ -1,12 +1,125 @@
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.auth.forms import UserChangeForm, UserCreationForm
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.utils import timezone
+from django.utils.functional import cached_property
 from .models import (
     User, Task, TaskStatusLog, TaskAssigneeHistory,
-    TaskFeedback, UserComment, Notification, StoreItem, Purchase
+    TaskFeedback, UserComment, Notification, StoreItem, Purchase,
+    ArchivedTask, ArchivedTaskStatusLog, AdminActionLog, Tombstone
 )
+from .utils.user_actions import apply_user_action
+from .utils.counters import refresh_counters
 
-class UserAdmin(BaseUserAdmin):
+# ───────────────────────────────────────────────────────────
+# Large-table helpers
+# ───────────────────────────────────────────────────────────
+
+class EstimatedCountPaginator(Paginator):
+    """
+    On PostgreSQL, unfiltered changelists use the planner's row estimate
+    (pg_class.reltuples) instead of an exact COUNT(*) once the table is
+    larger than ADMIN_ESTIMATED_COUNT_THRESHOLD rows.
+    """
+    estimate = False
+
+    @cached_property
+    def count(self):
+        if self.estimate:
+            estimated = self._estimated_count()
+            if estimated is not None and estimated >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return estimated
+        return super().count
+
+    def _estimated_count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] > 0 else None
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+    # Changelist query parameters that do not narrow the result set
+    unfiltered_params = {'o', 'p', '_popup', '_to_field'}
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        paginator = super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+        paginator.estimate = not (set(request.GET) - self.unfiltered_params)
+        return paginator
+
+
+class SoftDeleteAdminMixin:
+    """
+    Deleting from the admin only stamps `deleted_at` (set-based for bulk
+    deletes); the `purge_deleted` command removes dependents later. This also skips building the full
+    cascade tree on the confirmation page.
+    """
+
+    def delete_model(self, request, obj):
+        obj.soft_delete()
+
+    def delete_queryset(self, request, queryset):
+        self.model.soft_delete_many(list(queryset.values_list('id', flat=True)))
+
+    def get_deleted_objects(self, objs, request):
+        objs = list(objs)
+        return [str(obj) for obj in objs], {self.model._meta.verbose_name_plural: len(objs)}, set(), []
+
+
+class ReadOnlyAdminMixin:
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+# ───────────────────────────────────────────────────────────
+# Users
+# ───────────────────────────────────────────────────────────
+
+class AllUsersUniqueFormMixin:
+    """
+    ModelForm.validate_unique checks the default manager, which hides
+    soft-deleted users; they still hold their username and email until
+    purged (see serializers.unique_user_field).
+    """
+
+    def validate_unique(self):
+        super().validate_unique()
+        for field in ('username', 'email'):
+            value = self.cleaned_data.get(field)
+            if not value or field in self._errors:
+                continue
+            if User.all_objects.filter(**{field: value}).exclude(pk=self.instance.pk).exists():
+                self.add_error(field, f"A user with that {field} already exists.")
+
+
+class UserAdminCreationForm(AllUsersUniqueFormMixin, UserCreationForm):
+    pass
+
+
+class UserAdminChangeForm(AllUsersUniqueFormMixin, UserChangeForm):
+    pass
+
+
+class UserAdmin(SoftDeleteAdminMixin, BaseUserAdmin, LargeTableAdmin):
     model = User
+    form = UserAdminChangeForm
+    add_form = UserAdminCreationForm
 
     list_display = (
         'id', 'username', 'email', 'first_name', 'last_name', 'role',
@@ -15,6 +128,7 @@ class UserAdmin(BaseUserAdmin):
     list_filter = ('role', 'is_active', 'dark_mode_enabled')
     ordering = ('-level', 'username')
     search_fields = ('username', 'email', 'first_name', 'last_name')
+    actions = ['reset_exp', 'reset_honor', 'deactivate', 'make_admin', 'make_user']
 
     fieldsets = (
         *BaseUserAdmin.fieldsets,
@@ -25,7 +139,7 @@ class UserAdmin(BaseUserAdmin):
             'fields': ('avatar', 'job_position', 'about_me')
         }),
         ("Preferences & Flags", {
-            'fields': ('dark_mode_enabled', 'notifications_enabled', 'default_password', 'last_seen', 'is_online')
+            'fields': ('dark_mode_enabled', 'notifications_enabled', 'notification_digest', 'default_password', 'last_seen', 'is_online')
         }),
     )
 
@@ -37,13 +151,190 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
 
+    # Bulk actions: one UPDATE each, no per-row save() (and no avatar re-encode)
+    def _bulk_update(self, request, queryset, action, message):
+        updated = apply_user_action(
+            queryset, action, actor=request.user,
+            criteria={'user_ids': list(queryset.values_list('id', flat=True)), 'source': 'admin'},
+        )
+        self.message_user(request, f"{updated} user(s) {message}.")
+
+    @admin.action(description="Reset EXP to 0")
+    def reset_exp(self, request, queryset):
+        self._bulk_update(request, queryset, 'reset_exp', "had EXP reset")
+
+    @admin.action(description="Reset Honor to 0")
+    def reset_honor(self, request, queryset):
+        self._bulk_update(request, queryset, 'reset_honor', "had Honor reset")
+
+    @admin.action(description="Deactivate selected users")
+    def deactivate(self, request, queryset):
+        self._bulk_update(request, queryset, 'deactivate', "deactivated")
+
+    @admin.action(description="Set role: admin")
+    def make_admin(self, request, queryset):
+        self._bulk_update(request, queryset, 'make_admin', "promoted to admin")
+
+    @admin.action(description="Set role: user")
+    def make_user(self, request, queryset):
+        self._bulk_update(request, queryset, 'make_user', "set to user")
+
+# ───────────────────────────────────────────────────────────
+# Tasks
+# ───────────────────────────────────────────────────────────
+
+class TaskAdmin(SoftDeleteAdminMixin, LargeTableAdmin):
+    list_display = ('id', 'title', 'status', 'priority', 'difficulty', 'giver', 'assignee', 'deadline', 'created_at')
+    list_select_related = ('giver', 'assignee')
+    list_filter = ('status', 'priority', 'difficulty', 'is_template')
+    search_fields = ('=id', '^title')
+    autocomplete_fields = ('giver', 'assignee')
+    date_hierarchy = 'created_at'
+    ordering = ('-id',)
+    actions = ['mark_failed', 'return_to_assignee', 'reset_to_not_in_work']
+
+    def _transition(self, request, queryset, new_status, **extra):
+        """
+        Move the selected tasks to `new_status` with a single UPDATE and record
+        the transitions with a single bulk INSERT (no per-task notifications).
+        """
+        changes = list(queryset.exclude(status=new_status).values_list('id', 'status', 'assignee_id'))
+        ids = [task_id for task_id, _, _ in changes]
+        with transaction.atomic():
+            Task.objects.filter(id__in=ids).update(status=new_status, updated_at=timezone.now(), **extra)
+            TaskStatusLog.objects.bulk_create([
+                TaskStatusLog(task_id=task_id, user=request.user, old_status=old_status, new_status=new_status)
+                for task_id, old_status, _ in changes
+            ])
+            # Completed/failed counts may have moved for these assignees
+            refresh_counters(assignee_id for _, _, assignee_id in changes)
+        self.message_user(request, f"{len(ids)} task(s) moved to '{new_status}'.")
+
+    @admin.action(description="Mark as failed")
+    def mark_failed(self, request, queryset):
+        self._transition(request, queryset, 'failed', exp_earned=0, honor_earned=0)
+
+    @admin.action(description="Return to assignee")
+    def return_to_assignee(self, request, queryset):
+        self._transition(request, queryset, 'returned')
+
+    @admin.action(description="Reset to 'Not in Work'")
+    def reset_to_not_in_work(self, request, queryset):
+        self._transition(request, queryset, 'not_in_work')
+
+
+class TaskStatusLogAdmin(LargeTableAdmin):
+    list_display = ('id', 'task', 'user', 'old_status', 'new_status', 'timestamp')
+    list_select_related = ('task', 'user')
+    list_filter = ('new_status',)
+    raw_id_fields = ('task',)
+    autocomplete_fields = ('user',)
+    date_hierarchy = 'timestamp'
+    ordering = ('-id',)
+
+
+class TaskAssigneeHistoryAdmin(LargeTableAdmin):
+    list_display = ('id', 'task', 'old_assignee', 'new_assignee', 'changed_by', 'timestamp')
+    list_select_related = ('task', 'old_assignee', 'new_assignee', 'changed_by')
+    raw_id_fields = ('task',)
+    autocomplete_fields = ('old_assignee', 'new_assignee', 'changed_by')
+    ordering = ('-id',)
+
+
+class TaskFeedbackAdmin(LargeTableAdmin):
+    list_display = ('id', 'task', 'giver', 'assignee', 'rating', 'created_at')
+    list_select_related = ('task', 'giver', 'assignee')
+    list_filter = ('rating',)
+    raw_id_fields = ('task',)
+    autocomplete_fields = ('giver', 'assignee')
+    ordering = ('-id',)
+
+
+class UserCommentAdmin(LargeTableAdmin):
+    list_display = ('id', 'user', 'profile', 'created_at')
+    list_select_related = ('user', 'profile')
+    autocomplete_fields = ('user', 'profile')
+    ordering = ('-id',)
+
+
+class ArchivedTaskStatusLogInline(admin.TabularInline):
+    model = ArchivedTaskStatusLog
+    fields = ('old_status', 'new_status', 'user', 'timestamp')
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user')
+
+
+class ArchivedTaskAdmin(ReadOnlyAdminMixin, LargeTableAdmin):
+    list_display = ('id', 'title', 'status', 'giver', 'assignee', 'updated_at', 'archived_at')
+    list_select_related = ('giver', 'assignee')
+    list_filter = ('status',)
+    search_fields = ('=id', '^title')
+    inlines = [ArchivedTaskStatusLogInline]
+    ordering = ('-id',)
+
+# ───────────────────────────────────────────────────────────
+# Notifications & Store
+# ───────────────────────────────────────────────────────────
+
+class NotificationAdmin(LargeTableAdmin):
+    list_display = ('id', 'user', 'title', 'type', 'category', 'count', 'is_read', 'created_at')
+    list_select_related = ('user',)
+    list_filter = ('is_read', 'type', 'category')
+    raw_id_fields = ('task',)
+    autocomplete_fields = ('user',)
+    date_hierarchy = 'created_at'
+    ordering = ('-id',)
+    actions = ['mark_read']
+
+    @admin.action(description="Mark as read")
+    def mark_read(self, request, queryset):
+        updated = queryset.update(is_read=True, updated_at=timezone.now())
+        self.message_user(request, f"{updated} notification(s) marked as read.")
+
+    # ?since= clients learn about deletes from tombstones (tasks.utils.delta)
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            Tombstone.record(Tombstone.NOTIFICATION, [(obj.id, obj.user_id)])
+            super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            Tombstone.record(Tombstone.NOTIFICATION, queryset.values_list('id', 'user_id'))
+            super().delete_queryset(request, queryset)
+
+
+class AdminActionLogAdmin(ReadOnlyAdminMixin, LargeTableAdmin):
+    list_display = ('id', 'action', 'affected', 'actor', 'created_at')
+    list_select_related = ('actor',)
+    list_filter = ('action',)
+    ordering = ('-id',)
+
+
+class StoreItemAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'cost', 'active')
+    list_filter = ('active',)
+
+
+class PurchaseAdmin(LargeTableAdmin):
+    list_display = ('id', 'user', 'item', 'timestamp')
+    list_select_related = ('user', 'item')
+    autocomplete_fields = ('user',)
+    date_hierarchy = 'timestamp'
+    ordering = ('-id',)
+
 
 admin.site.register(User, UserAdmin)
-admin.site.register(Task)
-admin.site.register(TaskStatusLog)
-admin.site.register(TaskAssigneeHistory)
-admin.site.register(TaskFeedback)
-admin.site.register(UserComment)
-admin.site.register(Notification)
-admin.site.register(StoreItem)
-admin.site.register(Purchase)
+admin.site.register(Task, TaskAdmin)
+admin.site.register(TaskStatusLog, TaskStatusLogAdmin)
+admin.site.register(TaskAssigneeHistory, TaskAssigneeHistoryAdmin)
+admin.site.register(TaskFeedback, TaskFeedbackAdmin)
+admin.site.register(UserComment, UserCommentAdmin)
+admin.site.register(ArchivedTask, ArchivedTaskAdmin)
+admin.site.register(AdminActionLog, AdminActionLogAdmin)
+admin.site.register(Notification, NotificationAdmin)
+admin.site.register(StoreItem, StoreItemAdmin)
+admin.site.register(Purchase, PurchaseAdmin)
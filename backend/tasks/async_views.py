@@ -0,0 +1,189 @@
+"""
+Async (ASGI) versions of the read-heavy endpoints.
+
+Mounted ahead of the regular routes by `core.asgi_urls`, which only the ASGI
+application uses (see `core.asgi.create_application`). GET/HEAD run here on
+the async ORM, with related rows joined up front so serializing never
+touches the database; any other method falls through to the sync DRF view
+registered for the same path, so writes behave exactly as under WSGI.
+
+Authentication, throttling and response rendering reuse the DRF pieces the
+sync views use, so status codes, error bodies and JSON bytes match.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from .models import Task, Notification, Tombstone
+from .serializers import TaskSerializer, NotificationSerializer, UserSerializer, UserHallOfFameSerializer
+from .utils.delta import EPOCH, changed, delta, deleted_ids, sync_since
+from .utils.fastread import ReadPlan
+
+User = get_user_model()
+
+SYNC_URLCONF = 'core.urls'
+READ_METHODS = ('GET', 'HEAD')
+
+
+def _render(data, status=200, headers=None):
+    response = HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
+    for name, value in (headers or {}).items():
+        response[name] = value
+    return response
+
+
+async def _render_plan(plan, queryset):
+    rows = await plan.afetch(queryset)
+    return HttpResponse(plan.render(rows), content_type='application/json')
+
+
+async def _render_delta(request, serializer_class, queryset, since, kind, scope=None):
+    # DeltaSyncMixin.list
+    cursor = timezone.now()
+    rows = [row async for row in changed(queryset, since)]
+    deleted = [] if since == EPOCH else [pk async for pk in deleted_ids(kind, since, scope)]
+    return _render(delta(serializer_class(rows, many=True, context={'request': request}).data, deleted, cursor))
+
+
+def _not_found(model):
+    # Same message DRF derives from get_object_or_404's Http404
+    return exceptions.NotFound(f'No {model._meta.object_name} matches the given query.')
+
+
+def _error(exc):
+    headers = {}
+    if isinstance(exc, exceptions.Throttled) and exc.wait is not None:
+        headers['Retry-After'] = str(int(exc.wait))
+    if exc.status_code == 401:
+        headers['WWW-Authenticate'] = 'Bearer realm="api"'
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    return _render(data, exc.status_code, headers)
+
+
+async def _authenticate(request, required):
+    """Set `request.user` like DRF would; raise a DRF APIException on failure."""
+    request.user = AnonymousUser()
+    for authenticator_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        # Sync: the blacklist refresh and cache misses hit the database
+        result = await sync_to_async(authenticator_class().authenticate)(request)
+        if result is not None:
+            request.user = result[0]
+            break
+
+    if required and not request.user.is_authenticated:
+        raise exceptions.NotAuthenticated()
+
+    for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+        throttle = throttle_class()
+        if not throttle.allow_request(request, None):
+            raise exceptions.Throttled(throttle.wait())
+
+
+def read_endpoint(auth_required=True):
+    """
+    Decorate an async read view: authenticate + throttle, translate DRF
+    exceptions, and hand non-read methods to the sync route for the path.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in READ_METHODS:
+                match = resolve(request.path_info, urlconf=SYNC_URLCONF)
+                return await sync_to_async(match.func)(request, *match.args, **match.kwargs)
+            try:
+                await _authenticate(request, auth_required)
+                return await view(request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                return _error(exc)
+
+        # The DRF views this stands in for are CSRF-exempt (JWT, not session auth)
+        wrapper.csrf_exempt = True
+        return wrapper
+    return decorator
+
+# ───────────────────────────────────────────────────────────
+# Tasks
+# ───────────────────────────────────────────────────────────
+
+def _tasks():
+    return Task.objects.select_related('giver', 'assignee').order_by('-created_at')
+
+
+@read_endpoint()
+async def task_list(request):
+    tasks = TaskSerializer.sparse_queryset(_tasks(), request)
+    since = sync_since(request)
+    if since is not None:
+        return await _render_delta(request, TaskSerializer, tasks, since, Tombstone.TASK)
+    plan = ReadPlan.for_serializer(TaskSerializer, {'request': request})
+    if plan is not None:
+        return await _render_plan(plan, tasks)
+    tasks = [task async for task in tasks]
+    return _render(TaskSerializer(tasks, many=True, context={'request': request}).data)
+
+
+@read_endpoint()
+async def task_detail(request, pk):
+    try:
+        task = await TaskSerializer.sparse_queryset(_tasks(), request).aget(pk=pk)
+    except (Task.DoesNotExist, ValueError):
+        raise _not_found(Task)
+    return _render(TaskSerializer(task, context={'request': request}).data)
+
+# ───────────────────────────────────────────────────────────
+# Notifications
+# ───────────────────────────────────────────────────────────
+
+@read_endpoint()
+async def notification_list(request):
+    notifications = Notification.objects.filter(user_id=request.user.pk)
+    notifications = NotificationSerializer.sparse_queryset(notifications, request)
+    since = sync_since(request)
+    if since is not None:
+        return await _render_delta(request, NotificationSerializer, notifications, since, Tombstone.NOTIFICATION,
+                                   request.user.pk)
+    plan = ReadPlan.for_serializer(NotificationSerializer, {'request': request})
+    if plan is not None:
+        return await _render_plan(plan, notifications)
+    notifications = [n async for n in notifications]
+    return _render(NotificationSerializer(notifications, many=True, context={'request': request}).data)
+
+
+@read_endpoint()
+async def notification_detail(request, pk):
+    try:
+        notification = await NotificationSerializer.sparse_queryset(Notification.objects.all(), request).aget(
+            pk=pk, user_id=request.user.pk)
+    except (Notification.DoesNotExist, ValueError):
+        raise _not_found(Notification)
+    return _render(NotificationSerializer(notification, context={'request': request}).data)
+
+# ───────────────────────────────────────────────────────────
+# Users
+# ───────────────────────────────────────────────────────────
+
+@read_endpoint(auth_required=False)
+async def hall_of_fame(request):
+    users = UserHallOfFameSerializer.sparse_queryset(User.objects.order_by('-level', '-exp'), request)
+    plan = ReadPlan.for_serializer(UserHallOfFameSerializer, {'request': request})
+    if plan is not None:
+        return await _render_plan(plan, users)
+    users = [user async for user in users]
+    return _render(UserHallOfFameSerializer(users, many=True, context={'request': request}).data)
+
+
+@read_endpoint(auth_required=False)
+async def public_profile(request, id):
+    try:
+        user = await User.objects.aget(id=id)
+    except User.DoesNotExist:
+        raise _not_found(User)
+    return _render(UserSerializer(user, context={'request': request}).data)
@@ -0,0 +1,58 @@
+"""
+Primary/replica database routing.
+
+Reads go to the replica alias (DATABASE_REPLICA_ALIAS) only while a request
+marked as replica-safe is being handled -- see
+tasks.middleware.db_routing, which marks plain GET/HEAD requests from
+clients that have not written recently. Everything else (writes,
+transactions, management commands, background jobs) uses the primary.
+
+Routing state lives in a context variable, so it follows the request into
+sync_to_async threads under ASGI and never leaks between threads under WSGI.
+"""
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_state = ContextVar('db_routing', default=None)
+
+
+class RoutingState:
+    __slots__ = ('use_replica', 'wrote')
+
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+def begin_request(use_replica):
+    state = RoutingState(use_replica)
+    return state, _state.set(state)
+
+
+def end_request(token):
+    _state.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replica = settings.DATABASE_REPLICA_ALIAS
+        state = _state.get()
+        if not replica or state is None or not state.use_replica or state.wrote:
+            return DEFAULT_DB_ALIAS
+        # Reads inside a transaction must see the transaction's own writes
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            # Later reads in this request, and this client's next requests, see the write
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica rows are the primary's rows
+        return True
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.utils import timezone
+import os
+from datetime import datetime
+
+from tasks.utils.retention import POLICY_HANDLERS, run_retention
+
+class Command(BaseCommand):
+    help = 'Prune old notifications and archive finished tasks in small throttled batches, then log rows moved.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', nargs='+', choices=list(POLICY_HANDLERS), help='Run only these policies')
+        parser.add_argument('--dry-run', action='store_true', help='Count matching rows without changing anything')
+        parser.add_argument('--batch-size', type=int, help='Rows per batch (default: RETENTION_BATCH_SIZE)')
+        parser.add_argument('--pause', type=float, help='Seconds to sleep between batches (default: RETENTION_BATCH_PAUSE)')
+
+    def handle(self, *args, **options):
+        log_dir = os.path.join(settings.BASE_DIR, 'logs')
+        os.makedirs(log_dir, exist_ok=True)
+        log_file = os.path.join(log_dir, f'retention_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
+        started = timezone.now()
+        log_lines = [f"[START] {started.strftime('%Y-%m-%d %H:%M:%S')}{' (dry run)' if options['dry_run'] else ''}"]
+
+        report = run_retention(
+            only=options['only'],
+            dry_run=options['dry_run'],
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+            now=started,
+        )
+
+        verb = 'would move' if options['dry_run'] else 'moved'
+        for name, count in report.items():
+            msg = f"{name}: {verb} {count} row(s)"
+            self.stdout.write(self.style.SUCCESS(msg))
+            log_lines.append(f"[{name.upper()}] {msg}")
+
+        log_lines.append(f"[END] {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        with open(log_file, 'w', encoding='utf-8') as f:
+            f.writelines(line + '\n' for line in log_lines)
+
+        self.stdout.write(f"📄 Log written to: {log_file}")
@@ -0,0 +1,134 @@
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.asgi import AsyncReadsASGIHandler
+from tasks.utils.loadgen import percentile
+
+User = get_user_model()
+
+DEFAULT_PATHS = ['/tasks/', '/notifications/', '/hall-of-fame/']
+
+
+def run_wsgi(handler, total, paths, concurrency, headers, host):
+    def call(i):
+        path = paths[i % len(paths)]
+        environ = {'PATH_INFO': path, 'REQUEST_METHOD': 'GET', 'HTTP_HOST': host, 'wsgi.input': io.BytesIO()}
+        environ.update({'HTTP_' + name.upper().replace('-', '_'): value for name, value in headers.items()})
+        setup_testing_defaults(environ)
+        status = []
+        started = time.perf_counter()
+        body = b''.join(handler(environ, lambda s, h, exc_info=None: status.append(int(s.split()[0]))))
+        return time.perf_counter() - started, status[0], len(body)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(call, range(total)))
+
+
+def run_asgi(handler, total, paths, concurrency, headers, host):
+    raw_headers = [(b'host', host.encode())] + [
+        (name.lower().encode(), value.encode()) for name, value in headers.items()
+    ]
+
+    async def call(i, semaphore):
+        path = paths[i % len(paths)]
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+            'query_string': b'', 'root_path': '', 'headers': raw_headers,
+            'client': ('127.0.0.1', 50000), 'server': (host, 80),
+        }
+        done = asyncio.Event()
+        sent = {'status': 0, 'size': 0}
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            await done.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                sent['status'] = message['status']
+            elif message['type'] == 'http.response.body':
+                sent['size'] += len(message.get('body', b''))
+                if not message.get('more_body'):
+                    done.set()
+
+        async with semaphore:
+            started = time.perf_counter()
+            await handler(scope, receive, send)
+            return time.perf_counter() - started, sent['status'], sent['size']
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(call(i, semaphore) for i in range(total)))
+
+    return asyncio.run(main())
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare throughput and tail latency of the read endpoints served by the WSGI handler, '
+        'the plain ASGI handler and the ASGI handler with async read views, in-process, '
+        'at the same concurrency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS, help='GET paths to cycle through')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per mode')
+        parser.add_argument('--concurrency', type=int, default=16, help='Requests in flight per mode')
+        parser.add_argument('--host', help='Host header to send (default: first ALLOWED_HOSTS entry)')
+        parser.add_argument('--user', help='Username to authenticate as (default: first active user)')
+        parser.add_argument('--modes', nargs='+', default=['wsgi', 'asgi', 'asgi-async'],
+                            choices=['wsgi', 'asgi', 'asgi-async'])
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options['user']) if options['user'] else User.objects.filter(is_active=True)
+        user = user.order_by('id').first()
+        if user is None:
+            raise CommandError('No user to authenticate as; create one or run seed_data first.')
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+
+        run_args = (options['paths'], options['concurrency'], headers, options['host'] or settings.ALLOWED_HOSTS[0])
+        runners = {
+            'wsgi': lambda total: run_wsgi(WSGIHandler(), total, *run_args),
+            'asgi': lambda total: run_asgi(ASGIHandler(), total, *run_args),
+            'asgi-async': lambda total: run_asgi(AsyncReadsASGIHandler(), total, *run_args),
+        }
+
+        # Budgets would throttle the benchmark itself
+        rest_framework = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}}
+        self.stdout.write(
+            f"{options['requests']} requests/mode, concurrency {options['concurrency']}, "
+            f"paths: {' '.join(options['paths'])}"
+        )
+        self.stdout.write(f"{'mode':<12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            for mode in options['modes']:
+                runners[mode](min(options['requests'], 50))  # warm-up: imports, caches, connections
+                started = time.perf_counter()
+                results = runners[mode](options['requests'])
+                elapsed = time.perf_counter() - started
+
+                latencies = [latency * 1000 for latency, _, _ in results]
+                errors = sum(1 for _, status, _ in results if status != 200)
+                self.stdout.write(
+                    f"{mode:<12}{len(results) / elapsed:>10.1f}"
+                    f"{percentile(latencies, 50):>10.2f}{percentile(latencies, 95):>10.2f}"
+                    f"{percentile(latencies, 99):>10.2f}{errors:>8}"
+                )
@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from django.conf import settings 
 import os
 from datetime import datetime
+from tasks.utils.metrics import command_timer
 
 User = get_user_model()
 
@@ -10,6 +11,11 @@ class Command(BaseCommand):
     help = 'Deletes avatar files in media/avatars/ that are no longer referenced by any user and logs the results.'
 
     def handle(self, *args, **options):
+        with command_timer('clean_orphaned_avatars') as run:
+            run['affected'] = self._clean()
+
+    def _clean(self):
+        """Delete orphaned avatar files; return how many were removed."""
         avatar_dir = os.path.join(settings.MEDIA_ROOT, 'avatars')
         log_dir = os.path.join(settings.BASE_DIR, 'logs')
         log_file = os.path.join(log_dir, f'orphaned_avatar_cleanup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
@@ -22,7 +28,7 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(msg))
             log_lines.append(f"[ERROR] {msg}")
             self._write_log(log_file, log_lines)
-            return
+            return 0
 
         all_files = set(os.listdir(avatar_dir))
         used_files = set(
@@ -39,7 +45,7 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(msg))
             log_lines.append(f"[OK] {msg}")
             self._write_log(log_file, log_lines)
-            return
+            return 0
 
         deleted_count = 0
         for filename in orphaned_files:
@@ -61,6 +67,7 @@ class Command(BaseCommand):
 
         self._write_log(log_file, log_lines)
         self.stdout.write(f"📄 Log written to: {log_file}")
+        return deleted_count
 
     def _write_log(self, path, lines):
         with open(path, 'w', encoding='utf-8') as f:
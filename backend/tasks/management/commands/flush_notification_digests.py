@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from tasks.utils.metrics import command_timer
+from tasks.utils.notify import flush_digests
+
+class Command(BaseCommand):
+    help = 'Send each digest-mode user one summary of their held low-priority notifications (run on a schedule).'
+
+    def handle(self, *args, **options):
+        with command_timer('flush_notification_digests') as run:
+            sent = flush_digests()
+            run['affected'] = sent
+        self.stdout.write(f"Sent {sent} notification digest(s).")
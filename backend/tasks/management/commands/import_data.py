@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+
+from tasks.utils.importer import detect_format, read_rows, import_users, import_tasks
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Bulk import users or tasks from a CSV or JSONL file. Invalid rows are reported and skipped.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=['users', 'tasks'], help='What the file contains')
+        parser.add_argument('path', help='Path to a .csv or .jsonl file')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Override format detection by extension')
+        parser.add_argument('--batch-size', type=int, help='Rows per bulk_create batch (default: IMPORT_BATCH_SIZE)')
+        parser.add_argument('--workers', type=int, help='Password hashing processes (default: IMPORT_HASH_WORKERS)')
+        parser.add_argument('--created-by', help='Username recorded on initial task status logs (default: task giver)')
+        parser.add_argument('--report', help='Write the full JSON report to this path')
+
+    def handle(self, *args, **options):
+        kind = options['kind']
+        fmt = options['format'] or detect_format(options['path'])
+
+        created_by = None
+        if options['created_by']:
+            try:
+                created_by = User.objects.get(username=options['created_by'])
+            except User.DoesNotExist as exc:
+                raise CommandError(f"User '{options['created_by']}' not found") from exc
+
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as f:
+                rows = read_rows(f, fmt)
+                if kind == 'users':
+                    report = import_users(rows, batch_size=options['batch_size'], workers=options['workers'])
+                else:
+                    report = import_tasks(rows, batch_size=options['batch_size'], created_by=created_by)
+        except (OSError, UnicodeDecodeError) as exc:
+            raise CommandError(f"Cannot read '{options['path']}': {exc}") from exc
+
+        for error in report.errors[:20]:
+            self.stdout.write(self.style.ERROR(f"Row {error['row']}: {error['errors']}"))
+        if len(report.errors) > 20:
+            self.stdout.write(self.style.ERROR(f"... and {len(report.errors) - 20} more error(s)."))
+
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as f:
+                json.dump(report.as_dict(), f, indent=2)
+            self.stdout.write(f"📄 Report written to: {options['report']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Imported {report.created} of {report.processed} {kind} row(s); {len(report.errors)} failed."
+        ))
@@ -0,0 +1,81 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.models import StoreItem
+from tasks.utils.loadgen import percentile, run_load
+
+User = get_user_model()
+
+LOAD_TEST_ITEM = 'Load test item'
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay the task lifecycle over HTTP against a running server with N concurrent users '
+        '(register, JWT login, create -> in_work -> done -> moderation -> completed, notifications, '
+        'store purchase, Hall of Fame) and report throughput, p50/p95/p99 and error rate per endpoint. '
+        'Run it with the same settings as the server so the setup/cleanup steps use its database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server to load (default: %(default)s)')
+        parser.add_argument('--users', type=int, default=10, help='Concurrent virtual users')
+        parser.add_argument('--iterations', type=int, default=5, help='Lifecycles per user')
+        parser.add_argument('--ramp-up', type=float, default=0.0, help='Seconds over which to start the users')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds')
+        parser.add_argument('--item-id', type=int,
+                            help=f'Store item to buy (default: a free "{LOAD_TEST_ITEM}", created if missing)')
+        parser.add_argument('--cleanup', action='store_true', help='Delete the generated accounts and their data afterwards')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['iterations'] < 1:
+            raise CommandError('--users and --iterations must be at least 1.')
+
+        item_id = options['item_id']
+        if item_id is None:
+            item, _ = StoreItem.objects.get_or_create(name=LOAD_TEST_ITEM, defaults={'cost': 0})
+            item_id = item.id
+
+        prefix = f'loadtest-{int(time.time())}-'
+        self.stdout.write(
+            f"{options['users']} users x {options['iterations']} lifecycles against {options['base_url']} "
+            f"(accounts {prefix}*)"
+        )
+        stats, elapsed, failures = run_load(
+            options['base_url'], options['users'], options['iterations'], item_id, prefix,
+            ramp_up=options['ramp_up'], timeout=options['timeout'],
+        )
+        rows = stats.summary(elapsed)
+        total = sum(row['count'] for row in rows)
+
+        self.stdout.write(
+            f"\n{total} requests in {elapsed:.1f}s: {total / elapsed:.1f} req/s, "
+            f"{stats.lifecycles / elapsed:.2f} lifecycles/s ({stats.lifecycles} completed)\n"
+        )
+        self.stdout.write(f"{'endpoint':<36}{'count':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        for row in rows:
+            self.stdout.write(
+                f"{row['endpoint']:<36}{row['count']:>7}{row['rps']:>9.1f}"
+                f"{row['p50']:>9.1f}{row['p95']:>9.1f}{row['p99']:>9.1f}{row['error_rate']:>8.1%}"
+            )
+        all_ms = [latency * 1000 for latencies in stats.latencies.values() for latency in latencies]
+        self.stdout.write(
+            f"{'all':<36}{total:>7}{total / elapsed:>9.1f}{percentile(all_ms, 50):>9.1f}"
+            f"{percentile(all_ms, 95):>9.1f}{percentile(all_ms, 99):>9.1f}"
+        )
+
+        if failures:
+            self.stdout.write(self.style.WARNING(f'\n{len(failures)} failed step(s); first ones:'))
+            for message in failures[:10]:
+                self.stdout.write(f'  {message}')
+        if any(429 in row['statuses'] for row in rows):
+            self.stdout.write(self.style.WARNING(
+                'Requests were throttled (429): raise THROTTLE_AUTH / THROTTLE_WRITE / THROTTLE_READ on the server '
+                'to measure capacity rather than the rate limits.'
+            ))
+
+        if options['cleanup']:
+            deleted, _ = User.all_objects.filter(username__startswith=prefix).delete()
+            self.stdout.write(f'Cleanup: deleted {deleted} rows.')
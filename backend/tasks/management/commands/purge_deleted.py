@@ -0,0 +1,28 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from tasks.utils.purge import purge_deleted
+
+class Command(BaseCommand):
+    help = 'Permanently remove soft-deleted tasks and users (and their dependents) in bounded batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Rows per DELETE (default: PURGE_BATCH_SIZE)')
+        parser.add_argument('--pause', type=float, help='Seconds to sleep between batches (default: PURGE_BATCH_PAUSE)')
+        parser.add_argument('--grace-minutes', type=int, help='Only purge rows deleted at least this long ago')
+        parser.add_argument('--loop', type=float, metavar='SECONDS', help='Keep running, sleeping SECONDS between passes')
+
+    def handle(self, *args, **options):
+        grace = timedelta(minutes=options['grace_minutes']) if options['grace_minutes'] is not None else None
+
+        while True:
+            report = purge_deleted(batch_size=options['batch_size'], pause=options['pause'], grace=grace)
+            if any(report.values()) or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Purged {report['tasks']} task(s) and {report['users']} user(s)."
+                ))
+            if not options['loop']:
+                return
+            time.sleep(options['loop'])
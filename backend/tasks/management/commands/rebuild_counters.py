@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from tasks.utils.counters import rebuild_counters
+
+class Command(BaseCommand):
+    help = 'Recompute denormalized user counters from tasks, feedback and comments, fixing any drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, help='Users per reconciliation chunk (default: 1000)')
+        parser.add_argument('--dry-run', action='store_true', help='Report drifted users without writing')
+
+    def handle(self, *args, **options):
+        report = rebuild_counters(chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+        verb = 'would be fixed' if options['dry_run'] else 'fixed'
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {report['users']} user(s); {report['drifted']} drifted and {verb}."
+        ))
@@ -3,6 +3,7 @@ from django.utils import timezone
 from datetime import timedelta
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from tasks.utils.metrics import command_timer
 import os
 from datetime import datetime
 
@@ -22,7 +23,9 @@ class Command(BaseCommand):
         log_lines = [f"[START] {now_str} — Checking for inactive users..."]
 
         # Update user statuses
-        updated = User.objects.filter(is_online=True, last_seen__lt=threshold).update(is_online=False)
+        with command_timer('reset_online_with_logging') as run:
+            updated = User.objects.filter(is_online=True, last_seen__lt=threshold).update(is_online=False)
+            run['affected'] = updated
 
         if updated == 0:
             msg = "No stale users found. All users are recently active."
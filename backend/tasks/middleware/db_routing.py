@@ -0,0 +1,97 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from tasks.db_router import begin_request, end_request
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+_jwt = JWTAuthentication()
+
+
+def _user_key(request):
+    """
+    Identify the client by the user id in its access token, which survives
+    token refreshes. Only the signature is checked here (no DB, no blacklist);
+    DRF authenticates the request properly later.
+    """
+    header = request.META.get('HTTP_AUTHORIZATION')
+    if not header:
+        return None
+    try:
+        raw_token = _jwt.get_raw_token(header.encode())
+        user_id = raw_token and _jwt.get_validated_token(raw_token).get(api_settings.USER_ID_CLAIM)
+    except AuthenticationFailed:
+        return None
+    return user_id and f'db:primary:user:{user_id}'
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets safe GET/HEAD requests read from the replica (tasks.db_router).
+    A client that wrote is pinned to the primary for REPLICA_STICKY_SECONDS,
+    long enough for replication to catch up, so it always reads its own writes.
+
+    Every write response sets the REPLICA_STICKY_COOKIE cookie, so anonymous
+    writes (register, login) pin too; authenticated users are also pinned by
+    user id for clients that don't send cookies back.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if not settings.DATABASE_REPLICA_ALIAS:
+            return self.get_response(request)
+
+        key = _user_key(request)
+        pinned = self._has_cookie(request) or (key and cache.get(key))
+        state, token = begin_request(self._replica_safe(request, pinned))
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        if state.wrote or request.method not in SAFE_METHODS:
+            if key:
+                cache.set(key, 1, settings.REPLICA_STICKY_SECONDS)
+            self._pin(response)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICA_ALIAS:
+            return await self.get_response(request)
+
+        key = _user_key(request)
+        pinned = self._has_cookie(request) or (key and await cache.aget(key))
+        state, token = begin_request(self._replica_safe(request, pinned))
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+        if state.wrote or request.method not in SAFE_METHODS:
+            if key:
+                await cache.aset(key, 1, settings.REPLICA_STICKY_SECONDS)
+            self._pin(response)
+        return response
+
+    def _replica_safe(self, request, pinned):
+        return request.method in SAFE_METHODS and not pinned
+
+    def _has_cookie(self, request):
+        return settings.REPLICA_STICKY_COOKIE in request.COOKIES
+
+    def _pin(self, response):
+        response.set_cookie(
+            settings.REPLICA_STICKY_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS,
+            httponly=True, samesite='Lax', secure=settings.SESSION_COOKIE_SECURE,
+        )
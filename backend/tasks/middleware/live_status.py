@@ -1,18 +1,33 @@
 import datetime
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.utils import timezone
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject, empty
 
 User = get_user_model()
 
 class ActiveUserMiddleware:
+    # Runs natively under ASGI too, so async views don't pay a thread hop here
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
         response = self.get_response(request)
 
-        if request.user.is_authenticated:
+        # At most one write per user per LAST_SEEN_UPDATE_INTERVAL (cache.add is atomic)
+        if request.user.is_authenticated and cache.add(
+            f'live_status:{request.user.id}', 1, settings.LAST_SEEN_UPDATE_INTERVAL
+        ):
             now = timezone.now()
             # Update last_seen and is_online
             User.objects.filter(id=request.user.id).update(
@@ -21,3 +36,17 @@ class ActiveUserMiddleware:
             )
 
         return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+
+        user = request.user
+        if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+            # Session user nobody resolved yet (async views/DRF set a concrete one)
+            await sync_to_async(user._setup)()
+        if user.is_authenticated and await cache.aadd(
+            f'live_status:{user.id}', 1, settings.LAST_SEEN_UPDATE_INTERVAL
+        ):
+            await User.objects.filter(id=user.id).aupdate(last_seen=timezone.now(), is_online=True)
+
+        return response
@@ -0,0 +1,69 @@
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from tasks.utils import metrics
+
+
+def _view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unmatched>'
+    return match.view_name or match._func_path
+
+
+class MetricsMiddleware:
+    """
+    Records latency, SQL count/time, serializer time and response size per
+    view (tasks.utils.metrics) and, with SERVER_TIMING on, reports the
+    breakdown in a `Server-Timing` header.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        for connection in connections.all(initialized_only=True):
+            metrics.install_query_hook(connection)
+        timings, token = metrics.begin_request()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self._finish(request, response, timings, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        # ORM work runs in sync_to_async threads; their connections get the hook on creation
+        timings, token = metrics.begin_request()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self._finish(request, response, timings, time.perf_counter() - started)
+
+    def _finish(self, request, response, timings, elapsed):
+        view = _view_label(request)
+        metrics.REQUEST_LATENCY.observe(elapsed, view=view, method=request.method, status=response.status_code)
+        metrics.REQUEST_QUERIES.observe(timings.queries, view=view)
+        metrics.REQUEST_DB_TIME.observe(timings.db_time, view=view)
+        metrics.REQUEST_SERIALIZER_TIME.observe(timings.serializer_time, view=view)
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.observe(len(response.content), view=view)
+
+        if settings.SERVER_TIMING:
+            response['Server-Timing'] = (
+                f'db;dur={timings.db_time * 1000:.1f};desc="{timings.queries} queries", '
+                f'serialize;dur={timings.serializer_time * 1000:.1f}, '
+                f'total;dur={elapsed * 1000:.1f}'
+            )
+        return response
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:44
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_taskevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('not_in_work', 'Not in Work'), ('in_work', 'In Work'), ('not_moderated', 'Not Moderated'), ('moderation', 'Moderation'), ('moderation_stopped', 'Moderation Stopped'), ('returned', 'Returned'), ('completed', 'Completed'), ('failed', 'Failed')], max_length=30)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], max_length=10)),
+                ('difficulty', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], max_length=10)),
+                ('deadline', models.DateTimeField(blank=True, null=True)),
+                ('approx_time', models.FloatField(default=1.0)),
+                ('files', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('exp_earned', models.IntegerField(default=0)),
+                ('honor_earned', models.IntegerField(default=0)),
+                ('time_in_work', models.FloatField(default=0.0)),
+                ('history', models.JSONField(blank=True, default=dict)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedTaskStatusLog',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('old_status', models.CharField(choices=[('not_in_work', 'Not in Work'), ('in_work', 'In Work'), ('not_moderated', 'Not Moderated'), ('moderation', 'Moderation'), ('moderation_stopped', 'Moderation Stopped'), ('returned', 'Returned'), ('completed', 'Completed'), ('failed', 'Failed')], max_length=30)),
+                ('new_status', models.CharField(choices=[('not_in_work', 'Not in Work'), ('in_work', 'In Work'), ('not_moderated', 'Not Moderated'), ('moderation', 'Moderation'), ('moderation_stopped', 'Moderation Stopped'), ('returned', 'Returned'), ('completed', 'Completed'), ('failed', 'Failed')], max_length=30)),
+                ('timestamp', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['created_at'], name='notification_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'updated_at'], name='task_status_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedtaskstatuslog',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_logs', to='tasks.archivedtask'),
+        ),
+        migrations.AddField(
+            model_name='archivedtaskstatuslog',
+            name='user',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedtask',
+            name='assignee',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_assigned_tasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedtask',
+            name='giver',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_given_tasks', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
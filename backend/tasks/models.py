@@ -1,11 +1,15 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
+from django.utils import timezone
 from PIL import Image
 import os
 import uuid
 
+from tasks.utils.user_cache import invalidate_user
+from tasks.utils.metrics import image_timer
+
 def avatar_upload_path(instance, filename):
     ext = filename.split('.')[-1]
     filename = f"{uuid.uuid4()}.{ext}"
@@ -16,6 +20,11 @@ class Role(models.TextChoices):
     ADMIN = 'admin', _('Admin')
     GUEST = 'guest', _('Guest')
 
+class ActiveUserManager(UserManager):
+    """Default manager: hides soft-deleted users until the purger removes them."""
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
 class User(AbstractUser):
     username = models.CharField(max_length=150, unique=True)
     email = models.EmailField(unique=True)
@@ -32,31 +41,71 @@ class User(AbstractUser):
     is_online = models.BooleanField(default=False)
     default_password = models.BooleanField(default=True)
     notifications_enabled = models.BooleanField(default=True)
+    notification_digest = models.BooleanField(default=False)  # low-priority notifications batched (tasks.utils.notify)
     dark_mode_enabled = models.BooleanField(default=False)
     
     exp = models.PositiveIntegerField(default=0)
     honor = models.IntegerField(default=0)
     level = models.PositiveIntegerField(default=1)
 
+    # Denormalized stats, kept current with F() updates (tasks.utils.counters)
+    # and reconciled by `manage.py rebuild_counters`
+    tasks_completed = models.IntegerField(default=0)
+    tasks_failed = models.IntegerField(default=0)
+    feedback_count = models.IntegerField(default=0)
+    feedback_rating_sum = models.IntegerField(default=0)
+    comment_count = models.IntegerField(default=0)
+    time_worked = models.FloatField(default=0.0)  # hours, completed tasks
+
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = ActiveUserManager()
+    all_objects = UserManager()
+
+    def soft_delete(self):
+        """
+        Hide the user and everything that would cascade from them with two
+        UPDATEs; `purge_deleted` removes the rows later in batches.
+        """
+        self.deleted_at = User.soft_delete_many([self.id])
+        self.is_active = False
+
+    @classmethod
+    def soft_delete_many(cls, ids):
+        """`soft_delete` for every user in `ids` with the same two UPDATEs; returns the timestamp used."""
+        now = timezone.now()
+        cls.all_objects.filter(id__in=ids).update(deleted_at=now, is_active=False, is_online=False)
+        Task.all_objects.filter(
+            models.Q(giver_id__in=ids) | models.Q(assignee_id__in=ids), deleted_at__isnull=True
+        ).update(deleted_at=now)
+        for user_id in ids:
+            invalidate_user(user_id)
+        return now
+
+    @property
+    def average_rating(self):
+        return round(self.feedback_rating_sum / self.feedback_count, 2) if self.feedback_count else None
+
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
         if self.avatar:
             img_path = self.avatar.path
             try:
-                img = Image.open(img_path)
-                img.thumbnail((256, 256), Image.LANCZOS)
-
-                # Preserve original format if supported
-                ext = os.path.splitext(img_path)[1].lower()
-                format_map = {
-                    '.jpg': 'JPEG',
-                    '.jpeg': 'JPEG',
-                    '.png': 'PNG',
-                    '.webp': 'WEBP'
-                }
-                img_format = format_map.get(ext, 'PNG')  # default to PNG if unknown
-
-                img.save(img_path, img_format, quality=90, optimize=True)
+                with image_timer('user_avatar'):
+                    img = Image.open(img_path)
+                    img.thumbnail((256, 256), Image.LANCZOS)
+
+                    # Preserve original format if supported
+                    ext = os.path.splitext(img_path)[1].lower()
+                    format_map = {
+                        '.jpg': 'JPEG',
+                        '.jpeg': 'JPEG',
+                        '.png': 'PNG',
+                        '.webp': 'WEBP'
+                    }
+                    img_format = format_map.get(ext, 'PNG')  # default to PNG if unknown
+
+                    img.save(img_path, img_format, quality=90, optimize=True)
             except Exception as e:
                 print(f"Error processing avatar: {e}")
 
@@ -69,6 +118,20 @@ class UserComment(models.Model):
     text = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+class AdminActionLog(models.Model):
+    """Audit entry for one batch admin action (see tasks.utils.user_actions)."""
+    actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='admin_actions')
+    action = models.CharField(max_length=30)
+    criteria = models.JSONField(default=dict, blank=True)  # user_ids and/or filter used
+    affected = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.action} x{self.affected} at {self.created_at}"
+
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
@@ -92,6 +155,10 @@ STATUS_CHOICES = [
   ("failed", "Failed"),
 ]
 
+class ActiveTaskManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
 class Task(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
@@ -104,17 +171,38 @@ class Task(models.Model):
     approx_time = models.FloatField(help_text='Approx. time to complete in hours', default=1.0)
     files = models.FileField(upload_to=task_file_upload, null=True, blank=True)
     is_template = models.BooleanField(default=False)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
     moderation_started_at = models.DateTimeField(null=True, blank=True)
     moderation_stopped_at = models.DateTimeField(null=True, blank=True)
     exp_earned = models.IntegerField(default=0)
     honor_earned = models.IntegerField(default=0)
     time_in_work = models.FloatField(default=0.0)
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = ActiveTaskManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='task_status_updated_idx'),
+            models.Index(fields=['updated_at'], name='task_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} [{self.status}]"
 
+    def soft_delete(self):
+        """Hide the task now; dependents are removed later by `purge_deleted`."""
+        self.deleted_at = Task.soft_delete_many([self.id])
+
+    @classmethod
+    def soft_delete_many(cls, ids):
+        """`soft_delete` for every task in `ids` with one UPDATE; returns the timestamp used."""
+        now = timezone.now()
+        cls.all_objects.filter(id__in=ids).update(deleted_at=now)
+        return now
+
     def total_time_in_work(self):
         intervals = self.status_logs.filter(new_status='in_work')
         total = sum([interval.duration() for interval in intervals])
@@ -174,7 +262,7 @@ class TaskStatusLog(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     old_status = models.CharField(max_length=30, choices=STATUS_CHOICES)
     new_status = models.CharField(max_length=30, choices=STATUS_CHOICES)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
 
     def duration(self):
         next_log = TaskStatusLog.objects.filter(task=self.task, timestamp__gt=self.timestamp).order_by('timestamp').first()
@@ -218,14 +306,72 @@ class Notification(models.Model):
     type = models.CharField(max_length=10, choices=NOTIFICATION_TYPES, default='info')
     category = models.CharField(max_length=20, choices=NOTIFICATION_CATEGORIES, default='task')
     is_read = models.BooleanField(default=False)
+    task = models.ForeignKey('Task', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    count = models.PositiveIntegerField(default=1)  # events merged into this row while unread
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='notification_created_idx'),
+            models.Index(fields=['user', 'updated_at'], name='notification_user_updated_idx'),
+        ]
+        constraints = [
+            # One unread row per user and task: tasks.utils.notify merges into it
+            models.UniqueConstraint(fields=['user', 'task'], condition=models.Q(is_read=False),
+                                    name='notification_unread_task_uniq'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.title} ({self.type})"
 
+class PendingNotification(models.Model):
+    """A low-priority notification held for the user's next digest (tasks.utils.notify)."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='pending_notifications')
+    task = models.ForeignKey('Task', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    category = models.CharField(max_length=20, choices=NOTIFICATION_CATEGORIES, default='task')
+    count = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'task'], name='pending_notification_task_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.title} (pending)"
+
+class Tombstone(models.Model):
+    """A row removed from a `?since=` list (tasks.utils.delta), kept so polling clients drop it too."""
+    TASK = 'task'
+    NOTIFICATION = 'notification'
+    KIND_CHOICES = [(TASK, 'Task'), (NOTIFICATION, 'Notification')]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    scope = models.BigIntegerField(null=True, blank=True)  # owning user id; null: every user's list
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'scope', 'deleted_at'], name='tombstone_scope_deleted_idx'),
+        ]
+
+    @classmethod
+    def record(cls, kind, rows, deleted_at=None):
+        """Bulk-create tombstones for `(object_id, scope)` pairs."""
+        deleted_at = deleted_at or timezone.now()
+        cls.objects.bulk_create([
+            cls(kind=kind, object_id=object_id, scope=scope, deleted_at=deleted_at) for object_id, scope in rows
+        ])
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id} deleted at {self.deleted_at}"
+
 from django.db import models
 from django.conf import settings
 from PIL import Image
@@ -247,10 +393,11 @@ class StoreItem(models.Model):
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
         if self.image:
-            img = Image.open(self.image.path)
-            img = img.convert("RGB")
-            img.thumbnail((512, 512))
-            img.save(self.image.path, "JPEG", quality=85)
+            with image_timer('store_item'):
+                img = Image.open(self.image.path)
+                img = img.convert("RGB")
+                img.thumbnail((512, 512))
+                img.save(self.image.path, "JPEG", quality=85)
 
     def __str__(self):
         return f"{self.name} ({self.cost} Honor)"
@@ -258,4 +405,39 @@ class StoreItem(models.Model):
 class Purchase(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='purchases')
     item = models.ForeignKey(StoreItem, on_delete=models.CASCADE, related_name='purchases')
-    timestamp = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+
+class ArchivedTask(models.Model):
+    """Finished task moved out of the hot tables by the retention job (read-only)."""
+    id = models.BigIntegerField(primary_key=True)  # original Task id
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    giver = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='archived_given_tasks')
+    assignee = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='archived_assigned_tasks')
+    status = models.CharField(max_length=30, choices=STATUS_CHOICES)
+    priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES)
+    difficulty = models.CharField(max_length=10, choices=DIFFICULTY_CHOICES)
+    deadline = models.DateTimeField(null=True, blank=True)
+    approx_time = models.FloatField(default=1.0)
+    files = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    exp_earned = models.IntegerField(default=0)
+    honor_earned = models.IntegerField(default=0)
+    time_in_work = models.FloatField(default=0.0)
+    history = models.JSONField(default=dict, blank=True)  # comments, events, assignee changes
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-updated_at']
+
+    def __str__(self):
+        return f"{self.title} [{self.status}] (archived)"
+
+class ArchivedTaskStatusLog(models.Model):
+    id = models.BigIntegerField(primary_key=True)  # original TaskStatusLog id
+    task = models.ForeignKey(ArchivedTask, on_delete=models.CASCADE, related_name='status_logs')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='+')
+    old_status = models.CharField(max_length=30, choices=STATUS_CHOICES)
+    new_status = models.CharField(max_length=30, choices=STATUS_CHOICES)
+    timestamp = models.DateTimeField()
@@ -1,18 +1,27 @@
 # Standard
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
 
 # Third-Party
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 import humanize
 
 # Internal
 from .models import (
     Task, TaskStatusLog, TaskComment, TaskFeedback, TaskAssigneeHistory,
-    Notification, StoreItem, Purchase, UserComment 
+    Notification, StoreItem, Purchase, UserComment,
+    ArchivedTask, ArchivedTaskStatusLog
 )
 from django.utils.timezone import localtime
-from tasks.utils import format_timestamp
+from tasks.utils.formatting_dt import TimestampFormatter
+from tasks.utils.fragments import FragmentCacheMixin, FragmentListSerializer
+from tasks.utils.metrics import TimedSerializerMixin
+from tasks.utils.sparse import SparseFieldsMixin
+from tasks.utils.user_map import UserRefField
 
 User = get_user_model()
 
@@ -20,7 +29,15 @@ User = get_user_model()
 # AUTH / USERS
 # ────────────────────────────────────────────────
 
-class RegisterSerializer(serializers.ModelSerializer):
+def unique_user_field(field, **kwargs):
+    """
+    Field kwargs for a unique User column checked against `all_objects`:
+    soft-deleted users still hold their username and email until purged.
+    """
+    message = f"A user with that {field} already exists."
+    return {'validators': [UniqueValidator(User.all_objects.all(), message=message)], **kwargs}
+
+class RegisterSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
     password2 = serializers.CharField(write_only=True)
     first_name = serializers.CharField(required=True)
@@ -32,6 +49,8 @@ class RegisterSerializer(serializers.ModelSerializer):
             'id', 'username', 'email', 'password', 'password2',
             'first_name', 'last_name', 'job_position', 'about_me'
         )
+        extra_kwargs = {'username': unique_user_field('username'), 'email': unique_user_field('email')}
+
     def validate(self, data):
         if data['password'] != data['password2']:
             raise serializers.ValidationError("Passwords do not match.")
@@ -49,8 +68,15 @@ class RegisterSerializer(serializers.ModelSerializer):
             about_me=validated_data.get('about_me', '')
         )
 
-class UserSerializer(serializers.ModelSerializer):
+# Denormalized counters on User (see tasks.utils.counters); never client-writable
+USER_STAT_FIELDS = (
+    'tasks_completed', 'tasks_failed', 'feedback_count',
+    'average_rating', 'comment_count', 'time_worked',
+)
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     avatar = serializers.ImageField(required=False, allow_null=True)
+    average_rating = serializers.FloatField(read_only=True)
 
     class Meta:
         model = User
@@ -63,6 +89,21 @@ class UserSerializer(serializers.ModelSerializer):
             'role',
         ]
         extra_kwargs = {field: {'required': False} for field in fields}
+        extra_kwargs.update(
+            username=unique_user_field('username', required=False),
+            email=unique_user_field('email', required=False),
+        )
+        fields += USER_STAT_FIELDS
+        read_only_fields = USER_STAT_FIELDS
+
+    def update(self, instance, validated_data):
+        # `instance` may be the cached request.user: write back only the submitted
+        # columns so counters, EXP and Honor changed meanwhile are not overwritten
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        if validated_data:
+            instance.save(update_fields=list(validated_data))
+        return instance
 
     def get_avatar(self, obj):
         request = self.context.get('request')
@@ -70,7 +111,7 @@ class UserSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(obj.avatar.url) if request else obj.avatar.url
         return None
 
-class UserShortSerializer(serializers.ModelSerializer):
+class UserShortSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     avatar = serializers.SerializerMethodField()
 
     class Meta:
@@ -93,8 +134,8 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         data['user'] = UserSerializer(self.user).data
         return data
     
-class UserCommentSerializer(serializers.ModelSerializer):
-    user = UserShortSerializer(read_only=True)
+class UserCommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    user = UserRefField(UserShortSerializer)
     profile_id = serializers.IntegerField(write_only=True, required=True)
 
     class Meta:
@@ -105,14 +146,16 @@ class UserCommentSerializer(serializers.ModelSerializer):
 # ────────────────────────────────────────────────
 # Hall  of Fame
 # ───────────────────────────────────────────────
-class UserHallOfFameSerializer(serializers.ModelSerializer):
+class UserHallOfFameSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
+    sparse_sources = {'avatar': ('avatar',), 'average_rating': ('feedback_count', 'feedback_rating_sum')}
     avatar = serializers.SerializerMethodField()
+    average_rating = serializers.FloatField(read_only=True)
 
     class Meta:
         model = User
         fields = (
             'id', 'first_name', 'last_name', 'username', 'level', 'exp', 'honor', 'avatar'
-        )
+        ) + USER_STAT_FIELDS
 
     def get_avatar(self, obj):
         request = self.context.get('request')
@@ -124,8 +167,9 @@ class UserHallOfFameSerializer(serializers.ModelSerializer):
 # ✅ TASKS
 # ────────────────────────────────────────────────
 
-class TaskCommentSerializer(serializers.ModelSerializer):
-    user = UserShortSerializer(read_only=True)
+class TaskCommentSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = ('user',)
+    user = UserRefField(UserShortSerializer)
 
     class Meta:
         model = TaskComment
@@ -133,25 +177,26 @@ class TaskCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'task', 'user', 'created_at']
 
 
-class TaskStatusLogSerializer(serializers.ModelSerializer):
-    user = UserShortSerializer(read_only=True)
+class TaskStatusLogSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    user = UserRefField(UserShortSerializer)
 
     class Meta:
         model = TaskStatusLog
         fields = ['id', 'task', 'user', 'old_status', 'new_status', 'timestamp']
 
-class TaskAssigneeHistorySerializer(serializers.ModelSerializer):
-    old_assignee = UserShortSerializer(read_only=True)
-    new_assignee = UserShortSerializer(read_only=True)
-    changed_by = UserShortSerializer(read_only=True)
+class TaskAssigneeHistorySerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = ('old_assignee', 'new_assignee', 'changed_by')
+    old_assignee = UserRefField(UserShortSerializer)
+    new_assignee = UserRefField(UserShortSerializer)
+    changed_by = UserRefField(UserShortSerializer)
 
     class Meta:
         model = TaskAssigneeHistory
         fields = '__all__'
 
-class TaskFeedbackSerializer(serializers.ModelSerializer):
-    giver = UserShortSerializer(read_only=True)
-    assignee = UserShortSerializer(read_only=True)
+class TaskFeedbackSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    giver = UserRefField(UserShortSerializer)
+    assignee = UserRefField(UserShortSerializer)
 
     # Write-only inputs
     assignee_id = serializers.PrimaryKeyRelatedField(
@@ -172,11 +217,26 @@ class TaskFeedbackSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('id', 'created_at')
 
-class TaskSerializer(serializers.ModelSerializer):
+def description_preview(description):
+    if not description:
+        return ''
+    return description[:100] + ('...' if len(description) > 100 else '')
+
+class TaskSerializer(SparseFieldsMixin, TimedSerializerMixin, FragmentCacheMixin, serializers.ModelSerializer):
+    expandable_fields = ('giver', 'assignee')
+    # Rendered per response around the cached fragment (tasks.utils.fragments)
+    fragment_volatile = (
+        'giver', 'assignee', 'files', 'created_at_formatted', 'updated_at_formatted', 'deadline_formatted',
+    )
+    sparse_sources = {
+        'status_display': ('status',), 'description_preview': ('description',),
+        'created_at_formatted': ('created_at',), 'updated_at_formatted': ('updated_at',),
+        'deadline_formatted': ('deadline',),
+    }
     description_preview = serializers.SerializerMethodField()
 
-    giver = UserShortSerializer(read_only=True)
-    assignee = UserShortSerializer(read_only=True)
+    giver = UserRefField(UserShortSerializer)
+    assignee = UserRefField(UserShortSerializer)
     assignee_id = serializers.PrimaryKeyRelatedField(
         source="assignee",
         queryset=User.objects.all(),
@@ -193,22 +253,36 @@ class TaskSerializer(serializers.ModelSerializer):
         return obj.get_status_display()
 
     def get_description_preview(self, obj):
-        if not obj.description:
-            return ''
-        return obj.description[:100] + ('...' if len(obj.description) > 100 else '')
+        return description_preview(obj.description)
 
     def get_created_at_formatted(self, obj):
-        return format_timestamp(obj.created_at)
+        return self.timestamps(obj.created_at)
 
     def get_updated_at_formatted(self, obj):
-        return format_timestamp(obj.updated_at)
+        return self.timestamps(obj.updated_at)
 
     def get_deadline_formatted(self, obj):
-        return format_timestamp(obj.deadline)
+        return self.timestamps(obj.deadline)
+
+    @property
+    def timestamps(self):
+        # Stored in the root context, so every row of a list shares one formatter
+        context = self.context
+        if 'timestamps' not in context:
+            context['timestamps'] = TimestampFormatter.for_request(context.get('request'))
+        return context['timestamps']
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.timestamps.mode == 'none':  # ?timestamps=none: machine timestamps only
+            for name in ('created_at_formatted', 'updated_at_formatted', 'deadline_formatted'):
+                fields.pop(name, None)
+        return fields
 
     class Meta:
         model = Task
         fields = '__all__'  # includes created_at, updated_at, etc.
+        list_serializer_class = FragmentListSerializer
         read_only_fields = (
             'exp_earned', 'honor_earned', 'time_in_work',
             'created_at', 'updated_at'
@@ -219,26 +293,55 @@ class TaskSerializer(serializers.ModelSerializer):
         validated_data['giver'] = self.context['request'].user
         return super().create(validated_data)
     
+class ArchivedTaskStatusLogSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    user = UserRefField(UserShortSerializer)
+
+    class Meta:
+        model = ArchivedTaskStatusLog
+        fields = ['id', 'task', 'user', 'old_status', 'new_status', 'timestamp']
+
+class ArchivedTaskSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = ('giver', 'assignee')
+    sparse_sources = {'status_display': ('status',)}
+    giver = UserRefField(UserShortSerializer)
+    assignee = UserRefField(UserShortSerializer)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+
+    class Meta:
+        model = ArchivedTask
+        fields = '__all__'
+
 # ────────────────────────────────────────────────
 # ✅ NOTIFICATIONS
 # ────────────────────────────────────────────────
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = '__all__'
-        read_only_fields = ('id', 'created_at', 'user')
+        # task and count are maintained by tasks.utils.notify (one unread row per task)
+        read_only_fields = ('id', 'created_at', 'user', 'task', 'count')
+
+    def validate_is_read(self, value):
+        notification = self.instance
+        if (
+            not value and notification is not None and notification.is_read and notification.task_id
+            and Notification.objects.filter(user_id=notification.user_id, task_id=notification.task_id, is_read=False).exists()
+        ):
+            raise serializers.ValidationError("There is already an unread notification for this task.")
+        return value
 
 # ────────────────────────────────────────────────
 # ✅ STORE
 # ────────────────────────────────────────────────
 
-class StoreItemSerializer(serializers.ModelSerializer):
+class StoreItemSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = StoreItem
         fields = '__all__'
 
-class PurchaseSerializer(serializers.ModelSerializer):
+class PurchaseSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = ('item',)
     item = StoreItemSerializer(read_only=True)
     item_id = serializers.PrimaryKeyRelatedField(
         queryset=StoreItem.objects.all(),
@@ -251,16 +354,17 @@ class PurchaseSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'item', 'item_id', 'timestamp']
         read_only_fields = ('user', 'timestamp')
 
-    def validate(self, attrs):
-        user = self.context['request'].user
-        item = attrs['item']
-        if user.honor < item.cost:
-            raise serializers.ValidationError("Not enough Honor Points.")
-        return attrs
-
     def create(self, validated_data):
+        from tasks.utils.counters import invalidate_cached_users  # counters -> profile_bundle -> serializers
+
+        # request.user may be a cached copy: charge with one conditional UPDATE
+        # instead of writing its (possibly stale) columns back
         user = self.context['request'].user
         item = validated_data['item']
-        user.honor -= item.cost
-        user.save()
-        return Purchase.objects.create(user=user, item=item)
+        with transaction.atomic():
+            charged = User.objects.filter(pk=user.pk, honor__gte=item.cost).update(honor=F('honor') - item.cost)
+            if not charged:
+                raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: ["Not enough Honor Points."]})
+            purchase = Purchase.objects.create(user=user, item=item)
+            invalidate_cached_users([user.pk])
+        return purchase
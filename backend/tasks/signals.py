@@ -1,10 +1,58 @@
-from django.db.models.signals import post_save
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.signals import user_logged_out
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import Task, TaskStatusLog, Notification
+from .models import Task, TaskStatusLog, TaskFeedback, UserComment
+from .utils.user_cache import invalidate_user
+from .utils.profile_bundle import invalidate_profile_bundle
+from .utils.counters import bump_counters
+from .utils.notify import notify
+from .utils.metrics import install_query_hook
 User = get_user_model()
 
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    # Per-request SQL count/time for MetricsMiddleware, on every thread's connection
+    install_query_hook(connection)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Role, is_active, password, exp/honor... any saved change refreshes request.user
+    invalidate_user(instance.pk)
+    invalidate_profile_bundle(instance.pk)
+
+@receiver(post_save, sender=TaskFeedback)
+@receiver(post_delete, sender=TaskFeedback)
+def invalidate_bundle_on_feedback(sender, instance, **kwargs):
+    invalidate_profile_bundle(instance.assignee_id)
+
+# Counter updates run inside the caller's transaction (views wrap the save in atomic);
+# rating edits are left to `rebuild_counters`
+@receiver(post_save, sender=TaskFeedback)
+def count_feedback(sender, instance, created, **kwargs):
+    if created:
+        bump_counters(instance.assignee_id, feedback_count=1, feedback_rating_sum=instance.rating)
+
+@receiver(post_delete, sender=TaskFeedback)
+def uncount_feedback(sender, instance, **kwargs):
+    bump_counters(instance.assignee_id, feedback_count=-1, feedback_rating_sum=-instance.rating)
+
+@receiver(post_save, sender=UserComment)
+@receiver(post_delete, sender=UserComment)
+def invalidate_bundle_on_comment(sender, instance, **kwargs):
+    invalidate_profile_bundle(instance.profile_id)
+
+@receiver(post_save, sender=UserComment)
+def count_comment(sender, instance, created, **kwargs):
+    if created:
+        bump_counters(instance.profile_id, comment_count=1)
+
+@receiver(post_delete, sender=UserComment)
+def uncount_comment(sender, instance, **kwargs):
+    bump_counters(instance.profile_id, comment_count=-1)
+
 @receiver(user_logged_out)
 def mark_user_offline(sender, request, user, **kwargs):
     if user:
@@ -14,12 +62,14 @@ def mark_user_offline(sender, request, user, **kwargs):
 @receiver(post_save, sender=Task)
 def task_created_notification(sender, instance, created, **kwargs):
     if created and instance.assignee:
-        Notification.objects.create(
-            user=instance.assignee,
+        notify(
+            instance.assignee,
             title="New Task Assigned",
             message=f"You have been assigned a new task: '{instance.title}' by {instance.giver.username}.",
             type="info",
-            category="task"
+            category="task",
+            task=instance,
+            coalesce=False,
         )
 
 @receiver(post_save, sender=TaskStatusLog)
@@ -27,20 +77,7 @@ def task_status_changed_notification(sender, instance, created, **kwargs):
     if created:
         task = instance.task
         message = f"Status of task '{task.title}' changed to '{instance.new_status}'."
-        # Notify both giver and assignee
-        if task.assignee:
-            Notification.objects.create(
-                user=task.assignee,
-                title="Task Status Updated",
-                message=message,
-                type="info",
-                category="task"
-            )
-        if task.giver:
-            Notification.objects.create(
-                user=task.giver,
-                title="Task Status Updated",
-                message=message,
-                type="info",
-                category="task"
-            )
\ No newline at end of file
+        # Notify both giver and assignee; unread ones for the task are updated in place
+        for user in (task.assignee, task.giver):
+            if user:
+                notify(user, title="Task Status Updated", message=message, type="info", category="task", task=task)
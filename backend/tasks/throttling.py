@@ -0,0 +1,149 @@
+"""
+Token-bucket throttling.
+
+Every request spends one token from the bucket for its (scope, identity):
+identity is the user id when authenticated, otherwise the client IP. The
+scope is the view's `throttle_scope` ('auth', 'export', ...) or, by
+default, 'read' for safe methods and 'write' for the rest. Budgets come from
+REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] as "<burst>/<period>"; a bucket
+holds up to <burst> tokens and refills at <burst>/<period> per second.
+
+Buckets live in a pluggable store (THROTTLE_BACKEND): 'local' keeps them in
+process memory (exact, per worker); 'cache' keeps them in the default cache
+so that workers sharing a cache share budgets (approximate under races).
+"""
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'120/min' -> (capacity=120, refill_per_second=2.0)"""
+    num, period = rate.split('/')
+    capacity = int(num)
+    return capacity, capacity / PERIODS[period[0]]
+
+# ───────────────────────────────────────────────────────────
+# Bucket stores
+# ───────────────────────────────────────────────────────────
+
+class LocalBucketStore:
+    prune_every = 1000
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._ops = 0
+
+    def consume(self, key, capacity, rate, now):
+        with self._lock:
+            tokens, last = self._buckets.get(key, (capacity, now))
+            allowed, tokens, wait = _spend(tokens, last, capacity, rate, now)
+            self._buckets[key] = (tokens, now)
+            self._ops += 1
+            if self._ops % self.prune_every == 0:
+                self._prune(now)
+        return allowed, wait
+
+    def _prune(self, now):
+        # A bucket untouched for an hour has refilled for every sane budget
+        self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < 3600}
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    prefix = 'throttle:'
+
+    def consume(self, key, capacity, rate, now):
+        cache_key = self.prefix + key
+        tokens, last = cache.get(cache_key) or (capacity, now)
+        allowed, tokens, wait = _spend(tokens, last, capacity, rate, now)
+        cache.set(cache_key, (tokens, now), int(capacity / rate) + 1)
+        return allowed, wait
+
+    def clear(self):
+        pass  # entries expire on their own
+
+
+def _spend(tokens, last, capacity, rate, now):
+    tokens = min(capacity, tokens + (now - last) * rate)
+    if tokens >= 1:
+        return True, tokens - 1, 0
+    return False, tokens, (1 - tokens) / rate
+
+
+STORES = {
+    'local': LocalBucketStore,
+    'cache': CacheBucketStore,
+}
+
+_store = None
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = STORES[settings.THROTTLE_BACKEND]()
+    return _store
+
+
+def throttle_metrics():
+    """{scope: {'allowed': n, 'throttled': n}} since process start."""
+    with _metrics_lock:
+        snapshot = dict(_metrics)
+    result = {}
+    for (scope, outcome), count in snapshot.items():
+        result.setdefault(scope, {'allowed': 0, 'throttled': 0})[outcome] = count
+    return result
+
+
+def reset_throttling():
+    get_store().clear()
+    with _metrics_lock:
+        _metrics.clear()
+
+# ───────────────────────────────────────────────────────────
+# DRF throttle
+# ───────────────────────────────────────────────────────────
+
+class TokenBucketThrottle(BaseThrottle):
+    def get_scope(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if scope:
+            return scope
+        return 'read' if request.method in SAFE_METHODS else 'write'
+
+    def get_identity(self, request):
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        if not rate:
+            return True
+
+        capacity, refill = parse_rate(rate)
+        allowed, self._wait = get_store().consume(
+            f'{scope}:{self.get_identity(request)}', capacity, refill, time.time()
+        )
+        with _metrics_lock:
+            _metrics[(scope, 'allowed' if allowed else 'throttled')] += 1
+        return allowed
+
+    def wait(self):
+        return getattr(self, '_wait', None)
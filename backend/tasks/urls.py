@@ -13,11 +13,12 @@ from rest_framework_simplejwt.views import (
 
 #  Internal
 from .views import (
-    RegisterView, ProfileView, PublicProfileView,
+    RegisterView, ProfileView, PublicProfileView, PublicProfileBundleView,
     PublicCommentListCreateView, PublicTestimonialListView,
-    TaskViewSet, NotificationViewSet, TaskCommentView,
+    TaskViewSet, NotificationViewSet, TaskCommentView, ArchivedTaskViewSet,
     StoreItemViewSet, PurchaseViewSet,
-    UserListView, HallOfFameView, delete_avatar, admin_user_action
+    UserListView, HallOfFameView, delete_avatar, admin_user_action, admin_import, throttle_metrics_view, prometheus_metrics,
+    TaskExportView, StatusLogExportView, PurchaseExportView
 )
 
 from .serializers import CustomTokenObtainPairSerializer
@@ -25,10 +26,18 @@ from .serializers import CustomTokenObtainPairSerializer
 #  Override token view to inject user data
 class CustomTokenView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_scope = 'auth'
+
+class ThrottledTokenRefreshView(TokenRefreshView):
+    throttle_scope = 'auth'
+
+class ThrottledTokenVerifyView(TokenVerifyView):
+    throttle_scope = 'auth'
 
 #  Router Setup
 router = DefaultRouter()
 router.register(r'tasks', TaskViewSet, basename='tasks')
+router.register(r'archive/tasks', ArchivedTaskViewSet, basename='archived-tasks')
 router.register(r'notifications', NotificationViewSet, basename='notifications')
 router.register(r'store', StoreItemViewSet, basename='store')
 router.register(r'purchases', PurchaseViewSet, basename='purchases')
@@ -41,8 +50,8 @@ urlpatterns = [
     
     # 🔐 JWT Token Auth
     path('auth/jwt/create/', CustomTokenView.as_view(), name='token_obtain_pair'),
-    path('auth/jwt/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-    path('auth/jwt/verify/', TokenVerifyView.as_view(), name='token_verify'),
+    path('auth/jwt/refresh/', ThrottledTokenRefreshView.as_view(), name='token_refresh'),
+    path('auth/jwt/verify/', ThrottledTokenVerifyView.as_view(), name='token_verify'),
 
     # 👥 All Users (for Hall of Fame page)
     path('auth/users/', UserListView.as_view(), name='user-list'),
@@ -51,6 +60,7 @@ urlpatterns = [
     path('auth/public-profile/<int:id>/', PublicProfileView.as_view(), name='public-profile'),
     path('auth/public-profile/<int:id>/testimonials/', PublicTestimonialListView.as_view(), name='public-testimonials'),
     path('auth/public-profile/<int:id>/comments/', PublicCommentListCreateView.as_view(), name='public-comments'),
+    path('auth/public-profile/<int:id>/bundle/', PublicProfileBundleView.as_view(), name='public-profile-bundle'),
 
     # Task-related views
     path('tasks/<int:task_id>/comments/', TaskCommentView.as_view(), name='task-comments'),
@@ -63,6 +73,14 @@ urlpatterns = [
 
     # Admin Views
     path('admin/user-action/', admin_user_action, name='admin-user-action'),
+    path('admin/import/', admin_import, name='admin-import'),
+    path('admin/throttle-metrics/', throttle_metrics_view, name='admin-throttle-metrics'),
+    path('metrics', prometheus_metrics, name='metrics'),
+
+    # 📤 Exports (streamed)
+    path('export/tasks.csv', TaskExportView.as_view(), name='export-tasks'),
+    path('export/status_logs.ndjson', StatusLogExportView.as_view(), name='export-status-logs'),
+    path('export/purchases.csv', PurchaseExportView.as_view(), name='export-purchases'),
 
     # 🔁 ViewSets
     path('', include(router.urls)),
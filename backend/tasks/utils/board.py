@@ -0,0 +1,112 @@
+"""
+Kanban board: `GET /tasks/board/` groups tasks into one column per status.
+
+The whole board costs two queries whatever the number of tasks:
+
+- the column counts come from one `GROUP BY status` aggregate
+- the first page of every column comes from one windowed query,
+  `ROW_NUMBER() OVER (PARTITION BY status ORDER BY created_at DESC, id DESC)`
+  filtered to the page size
+
+Columns paginate independently: each column's `next` link asks for
+`?status=<status>&page=2`, which returns that column alone in the usual
+paginated shape (`count`, `next`, `previous`, `results`).
+
+`?scope=giver` (default) and `?scope=assignee` show the requesting user's
+tasks from either side; `?scope=all` shows every task and is for admins.
+"""
+from django.core.exceptions import PermissionDenied
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+from django.utils.encoding import force_str
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from tasks.models import STATUS_CHOICES
+
+BOARD_SCOPES = ('giver', 'assignee', 'all')
+STATUS_LABELS = dict(STATUS_CHOICES)
+
+
+class BoardPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+def scoped(queryset, request):
+    """`queryset` narrowed to the board's `?scope=`."""
+    scope = request.query_params.get('scope', 'giver')
+    if scope not in BOARD_SCOPES:
+        raise ValidationError({'scope': f"Must be one of: {', '.join(BOARD_SCOPES)}."})
+    user = request.user
+    if scope == 'giver':
+        return queryset.filter(giver=user)
+    if scope == 'assignee':
+        return queryset.filter(assignee=user)
+    if user.role != 'admin':
+        raise PermissionDenied("Only admins can see the board for all tasks.")
+    return queryset
+
+
+def status_param(request):
+    """The column asked for with `?status=`, or None for the whole board."""
+    status = request.query_params.get('status')
+    if status is not None and status not in STATUS_LABELS:
+        raise ValidationError({'status': f"Unknown status '{status}'."})
+    return status
+
+
+def status_counts(queryset):
+    """{status: row count} for every status, from one GROUP BY."""
+    counts = dict.fromkeys(STATUS_LABELS, 0)
+    counts.update(queryset.order_by().values_list('status').annotate(count=Count('id')))
+    return counts
+
+
+def first_pages(queryset, page_size):
+    """
+    The first `page_size` rows of every status from one windowed query, ordered
+    by status then rank. Each row carries `board_status`, which is loaded even
+    when `?fields=` deferred `status`.
+    """
+    ranked = queryset.annotate(board_status=F('status'), board_rank=Window(
+        RowNumber(), partition_by=[F('status')], order_by=[F('created_at').desc(), F('id').desc()],
+    )).filter(board_rank__lte=page_size).order_by('status', 'board_rank')
+    return list(ranked)
+
+
+def column_response(status, paginator, data):
+    """One column on its own (`?status=`): the paginated shape plus the column's status and label."""
+    return {
+        'status': status,
+        'label': force_str(STATUS_LABELS[status]),
+        'count': paginator.page.paginator.count,
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link(),
+        'results': data,
+    }
+
+
+def board_response(request, counts, rows, data, page_size):
+    """The board body: one column per status with its count, first page and a link to the next."""
+    url = remove_query_param(request.build_absolute_uri(), 'page')
+    results = {status: [] for status in STATUS_LABELS}
+    for task, item in zip(rows, data):
+        results[task.board_status].append(item)
+
+    columns = []
+    for status, label in STATUS_LABELS.items():
+        next_url = None
+        if counts[status] > page_size:
+            next_url = replace_query_param(replace_query_param(url, 'status', status), 'page', 2)
+        columns.append({
+            'status': status,
+            'label': force_str(label),
+            'count': counts[status],
+            'next': next_url,
+            'previous': None,
+            'results': results[status],
+        })
+    return {'scope': request.query_params.get('scope', 'giver'), 'columns': columns}
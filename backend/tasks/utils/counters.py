@@ -0,0 +1,164 @@
+"""
+Denormalized per-user stats.
+
+`User.tasks_completed`, `tasks_failed`, `feedback_count`, `feedback_rating_sum`,
+`comment_count` and `time_worked` are bumped with `F()` expressions by the
+code path that causes the event, inside the same transaction, so readers
+(profiles, Hall of Fame) never aggregate. `rebuild_counters` recomputes them
+from the source tables in id-ordered chunks and rewrites only rows that
+drifted.
+
+Completed/failed counts include archived tasks and soft-deleted tasks that
+have not been purged yet, matching what the live increments saw.
+"""
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from tasks.models import Task, ArchivedTask, TaskFeedback, UserComment
+from tasks.utils.user_cache import invalidate_user, invalidate_all_users
+from tasks.utils.profile_bundle import invalidate_profile_bundle
+
+User = get_user_model()
+
+COUNTER_FIELDS = (
+    'tasks_completed', 'tasks_failed',
+    'feedback_count', 'feedback_rating_sum',
+    'comment_count', 'time_worked',
+)
+
+REBUILD_CHUNK_SIZE = 1000
+
+
+def bump_counters(user_id, **deltas):
+    """
+    Add `deltas` to the user's columns in one UPDATE, e.g.
+    `bump_counters(5, tasks_completed=1, exp=120)`. Call inside the
+    transaction that records the event.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not user_id or not deltas:
+        return
+    User.all_objects.filter(pk=user_id).update(**{field: F(field) + delta for field, delta in deltas.items()})
+    # UPDATE bypasses post_save
+    invalidate_cached_users([user_id])
+
+
+def invalidate_cached_users(user_ids):
+    """
+    Drop cached users and profile bundles now and again once the current
+    transaction commits: a request reading the row in between would cache
+    the old values under the new stamp.
+    """
+    user_ids = list(user_ids)
+
+    def invalidate():
+        for user_id in user_ids:
+            invalidate_user(user_id)
+            invalidate_profile_bundle(user_id)
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+def _task_totals(manager, user_ids, totals):
+    rows = (
+        manager.filter(assignee_id__in=user_ids)
+        .values('assignee_id')
+        .annotate(
+            completed=Count('id', filter=Q(status='completed')),
+            failed=Count('id', filter=Q(status='failed')),
+            worked=Sum('time_in_work', filter=Q(status='completed')),
+        )
+        .order_by()
+    )
+    for row in rows:
+        entry = totals[row['assignee_id']]
+        entry['tasks_completed'] += row['completed']
+        entry['tasks_failed'] += row['failed']
+        entry['time_worked'] += row['worked'] or 0.0
+
+
+def compute_counters(user_ids):
+    """{user_id: {field: value}} recomputed from the source tables."""
+    totals = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+    for user_id in user_ids:
+        totals[user_id]['time_worked'] = 0.0
+
+    _task_totals(Task.all_objects, user_ids, totals)
+    _task_totals(ArchivedTask.objects, user_ids, totals)
+
+    feedback = (
+        TaskFeedback.objects.filter(assignee_id__in=user_ids)
+        .values('assignee_id').annotate(n=Count('id'), rating=Sum('rating')).order_by()
+    )
+    for row in feedback:
+        totals[row['assignee_id']]['feedback_count'] = row['n']
+        totals[row['assignee_id']]['feedback_rating_sum'] = row['rating'] or 0
+
+    comments = (
+        UserComment.objects.filter(profile_id__in=user_ids)
+        .values('profile_id').annotate(n=Count('id')).order_by()
+    )
+    for row in comments:
+        totals[row['profile_id']]['comment_count'] = row['n']
+
+    return totals
+
+
+def _reconcile(users, dry_run=False):
+    """Rewrite drifted counters on `users` (loaded with COUNTER_FIELDS); return how many drifted."""
+    totals = compute_counters([user.pk for user in users])
+
+    drifted = []
+    for user in users:
+        expected = totals[user.pk]
+        changed = False
+        for field in COUNTER_FIELDS:
+            value = round(expected[field], 4) if field == 'time_worked' else expected[field]
+            current = round(getattr(user, field), 4) if field == 'time_worked' else getattr(user, field)
+            if current != value:
+                setattr(user, field, value)
+                changed = True
+        if changed:
+            drifted.append(user)
+
+    if drifted and not dry_run:
+        User.all_objects.bulk_update(drifted, COUNTER_FIELDS)
+    return len(drifted)
+
+
+def refresh_counters(user_ids):
+    """Recompute counters for a few users after a bulk change (admin actions)."""
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if not user_ids:
+        return 0
+    drifted = _reconcile(list(User.all_objects.filter(pk__in=user_ids).only('pk', *COUNTER_FIELDS)))
+    invalidate_cached_users(user_ids)
+    return drifted
+
+
+def rebuild_counters(chunk_size=None, dry_run=False):
+    """
+    Reconcile every user's counters, `chunk_size` users at a time.
+    Returns `{'users': scanned, 'drifted': rows_rewritten}`.
+    """
+    chunk_size = chunk_size or REBUILD_CHUNK_SIZE
+    report = {'users': 0, 'drifted': 0}
+    last_id = 0
+
+    while True:
+        users = list(
+            User.all_objects.filter(pk__gt=last_id).order_by('pk').only('pk', *COUNTER_FIELDS)[:chunk_size]
+        )
+        if not users:
+            break
+        last_id = users[-1].pk
+        report['users'] += len(users)
+        report['drifted'] += _reconcile(users, dry_run)
+
+    if report['drifted'] and not dry_run:
+        invalidate_all_users()
+    return report
@@ -0,0 +1,101 @@
+"""
+Delta sync for polled lists: `GET /tasks/?since=<cursor>` and `/notifications/?since=<cursor>`.
+
+Instead of the plain list the response is
+
+    {"results": [rows created or updated since the cursor],
+     "deleted": [ids of rows removed since the cursor],
+     "cursor": "<pass as ?since= next time>"}
+
+so a steady-state poll costs bytes proportional to what changed. `since=0`
+returns every row and starts a sync. Without `since` lists are unchanged.
+
+- changes are found through `updated_at`; every write path must move it
+  (bulk `update()` calls set it explicitly)
+- removals come from `Tombstone` rows written where rows are hard-deleted
+  or moved out (API deletes, retention, purge); soft-deleted tasks are their
+  own tombstone through `deleted_at` until `purge_deleted` removes them;
+  notifications pointing at a purged or archived task are re-sent with
+  `task` cleared
+- the cursor is the server time taken before reading, and reads go back
+  DELTA_SYNC_OVERLAP_SECONDS further, so rows committed by transactions
+  that were still open at the previous poll are not missed; clients get
+  such rows twice and apply them by id
+- tombstones are pruned by the `tombstones` retention policy; a cursor older
+  than that window gets 410 Gone and the client starts over with `since=0`
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from tasks.models import Task, Tombstone
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'Sync cursor is older than the deletion history; fetch again with since=0.'
+    default_code = 'cursor_expired'
+
+
+def encode_cursor(moment):
+    return str((moment - EPOCH) // timedelta(microseconds=1))
+
+
+def sync_since(request):
+    """The moment `?since=` points at (EPOCH for `0`), or None when the parameter is absent."""
+    params = getattr(request, 'query_params', None) or request.GET
+    value = params.get('since')
+    if value is None:
+        return None
+    try:
+        since = EPOCH + timedelta(microseconds=int(value))
+    except (ValueError, OverflowError):
+        raise ValidationError({'since': 'Invalid cursor.'})
+    days = settings.RETENTION_POLICIES.get('tombstones', {}).get('days')
+    if since != EPOCH and days is not None and since < timezone.now() - timedelta(days=days):
+        raise CursorExpired()
+    return since
+
+
+def changed(queryset, since):
+    """`queryset` narrowed to rows created or updated since the cursor."""
+    if since == EPOCH:
+        return queryset
+    return queryset.filter(updated_at__gte=since - timedelta(seconds=settings.DELTA_SYNC_OVERLAP_SECONDS))
+
+
+def deleted_ids(kind, since, scope=None):
+    """Query for the ids of `kind` rows removed since the cursor from the list of `scope` (a user id, or None)."""
+    since = since - timedelta(seconds=settings.DELTA_SYNC_OVERLAP_SECONDS)
+    ids = Tombstone.objects.filter(kind=kind, scope=scope, deleted_at__gte=since).values_list('object_id', flat=True)
+    if kind == Tombstone.TASK:
+        ids = ids.union(Task.all_objects.filter(deleted_at__gte=since).values_list('id', flat=True))
+    return ids
+
+
+def delta(results, deleted, cursor):
+    return {'results': results, 'deleted': sorted(set(deleted)), 'cursor': encode_cursor(cursor)}
+
+
+class DeltaSyncMixin:
+    """ViewSet mixin: `?since=` on `list` answers with a delta (see module docstring)."""
+    sync_kind = None  # Tombstone kind of the listed rows
+
+    def sync_scope(self):
+        """The `Tombstone.scope` of this user's list."""
+        return None
+
+    def list(self, request, *args, **kwargs):
+        since = sync_since(request)
+        if since is None:
+            return super().list(request, *args, **kwargs)
+        cursor = timezone.now()
+        rows = changed(self.filter_queryset(self.get_queryset()), since)
+        deleted = [] if since == EPOCH else deleted_ids(self.sync_kind, since, self.sync_scope())
+        return Response(delta(self.get_serializer(rows, many=True).data, deleted, cursor))
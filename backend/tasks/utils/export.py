@@ -0,0 +1,87 @@
+import csv
+from datetime import datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object whose write() hands the line back instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def parse_bound(value, end=False):
+    """Parse a ?from= / ?to= query value (date or datetime) into an aware datetime."""
+    if not value:
+        return None
+
+    try:
+        dt = parse_datetime(value)
+        day = parse_date(value) if dt is None else None
+    except ValueError:
+        dt = day = None
+
+    if dt is None:
+        if day is None:
+            raise ValidationError({'date': f"Invalid date: '{value}'. Use YYYY-MM-DD or ISO 8601."})
+        dt = datetime.combine(day, time.max if end else time.min)
+
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt)
+    return dt
+
+
+def filter_by_date(queryset, request, field):
+    """Apply ?from= and ?to= bounds (inclusive) on `field`."""
+    start = parse_bound(request.query_params.get('from'))
+    end = parse_bound(request.query_params.get('to'), end=True)
+    if start:
+        queryset = queryset.filter(**{f'{field}__gte': start})
+    if end:
+        queryset = queryset.filter(**{f'{field}__lte': end})
+    return queryset
+
+
+def _encode_cell(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def iter_rows(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """Iterate `values()` dicts over a server-side cursor (constant memory)."""
+    return queryset.values(*fields).iterator(chunk_size=chunk_size)
+
+
+def stream_csv(queryset, fields, filename, chunk_size=EXPORT_CHUNK_SIZE):
+    writer = csv.writer(Echo())
+
+    def rows():
+        yield writer.writerow(fields)
+        for row in iter_rows(queryset, fields, chunk_size):
+            yield writer.writerow([_encode_cell(row[field]) for field in fields])
+
+    response = StreamingHttpResponse(rows(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def stream_ndjson(queryset, fields, filename, chunk_size=EXPORT_CHUNK_SIZE):
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+
+    def rows():
+        for row in iter_rows(queryset, fields, chunk_size):
+            yield encoder.encode(row) + '\n'
+
+    response = StreamingHttpResponse(rows(), content_type='application/x-ndjson')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,415 @@
+"""
+Compiled read path for hot read-only lists (task list, notifications, Hall of Fame).
+
+DRF serializes a list by walking every field of every row: `get_attribute`
+through the model instance, `to_representation`, nested serializers per
+related row. For large lists that dominates CPU time. A `ReadPlan` does the
+walk once per field set instead: it takes the fields the serializer would
+render for this request (sparse fields and `?timestamps=` included), maps
+each to the `values()` column(s) it reads and a converter, then renders
+plain dict rows straight to JSON.
+
+- plain columns whose DRF field returns the value unchanged are copied
+- other model fields go through the field's own `to_representation`
+- nested serializers read `<relation>__<column>` from the same query; nested
+  users are rendered once per user through the request's identity map
+- method and property fields need a handler registered with `computed()`
+
+A serializer with any field the compiler does not know (a method field
+without a handler, a dotted source, ...) gets no plan and the caller falls
+back to the serializer. Output is byte-for-byte what `JSONRenderer` makes
+of `serializer.data`; tests/test_fast_read.py holds both paths to that.
+"""
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.encoding import force_str
+from rest_framework import ISO_8601, serializers
+from rest_framework.compat import LONG_SEPARATORS, SHORT_SEPARATORS
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from tasks.models import Task
+from tasks.serializers import TaskSerializer, UserHallOfFameSerializer, UserShortSerializer, description_preview
+from tasks.utils import metrics
+from tasks.utils.fragments import FragmentCacheMixin, fragment_cache, fragment_key
+from tasks.utils.user_map import UserRefField, user_map
+
+User = get_user_model()
+
+# DRF fields whose to_representation returns database values unchanged
+PASSTHROUGH = (
+    serializers.IntegerField, serializers.CharField, serializers.EmailField,
+    serializers.BooleanField, serializers.ChoiceField, serializers.PrimaryKeyRelatedField,
+)
+
+PLAIN, VALUE, ROW = range(3)
+
+COMPUTED = {}
+
+
+class Unsupported(Exception):
+    """The serializer has a field the compiler cannot read from `values()`."""
+
+
+def computed(serializer_classes, name, *columns):
+    """
+    Register `fn(context, *values)` as the fast version of field `name` on
+    `serializer_classes`; `columns` are the model columns it reads.
+    """
+    def register(fn):
+        for serializer_class in serializer_classes:
+            COMPUTED[serializer_class, name] = (columns, fn)
+        return fn
+    return register
+
+
+def _handler(serializer, name):
+    for klass in type(serializer).__mro__:
+        if (klass, name) in COMPUTED:
+            return COMPUTED[klass, name]
+    return None
+
+# ───────────────────────────────────────────────────────────
+# Compiling
+# ───────────────────────────────────────────────────────────
+
+def _computed(keys, fn):
+    if len(keys) == 1:
+        key, = keys
+        return lambda context, row: fn(context, row[key])
+    return lambda context, row: fn(context, *[row[key] for key in keys])
+
+
+def _nested(pk, steps):
+    # A null foreign key renders as None, like DRF's nested serializer
+    return lambda context, row: None if row[pk] is None else _render_row(steps, row, context)
+
+
+def _user(key, serializer_class, steps):
+    # Rendered once per user per request and shared with the serializer path (tasks.utils.user_map)
+    def render(context, row):
+        user_id = row[key]
+        if user_id is None:
+            return None
+        serialized = user_map(context).serialized
+        data = serialized.get((user_id, serializer_class))
+        if data is None:
+            data = serialized[user_id, serializer_class] = _render_row(steps, row, context)
+        return data
+    return render
+
+
+def _file(key, field, model_field):
+    storage = model_field.storage
+    use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+
+    def render(context, row):
+        name = row[key]
+        if not name:
+            return None
+        if not use_url:
+            return name
+        url = storage.url(name)
+        request = context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+    return render
+
+
+def _datetime(field):
+    """DateTimeField.to_representation with the format and timezone looked up once, not per value."""
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if not settings.USE_TZ or output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    tz = field.timezone if hasattr(field, 'timezone') else timezone.get_current_timezone()
+    to_representation = field.to_representation
+
+    def convert(value):
+        if value.__class__ is not datetime or value.tzinfo is None:
+            return to_representation(value)
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _compile(serializer, prefix='', owners=None):
+    """
+    (columns, steps) for `serializer`'s readable fields, reading
+    `<prefix><column>` keys. `owners`, if given, gets each field's columns.
+    """
+    concrete = {f.name: f for f in serializer.Meta.model._meta.concrete_fields}
+    columns, steps = [], []
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        start = len(columns)
+        handler = _handler(serializer, name)
+        if handler is not None:
+            sources, fn = handler
+            keys = [prefix + source for source in sources]
+            columns.extend(keys)
+            steps.append((name, ROW, None, _computed(keys, fn)))
+            if owners is not None:
+                owners[name] = keys
+            continue
+
+        if field.source not in concrete or isinstance(field, serializers.SerializerMethodField):
+            raise Unsupported(f'{type(serializer).__name__}.{name}')
+        key, model_field = prefix + field.source, concrete[field.source]
+
+        if isinstance(field, UserRefField):
+            nested_columns, nested_steps = _compile(field.serializer, prefix=key + '__')
+            columns.append(key)
+            columns.extend(nested_columns)
+            steps.append((name, ROW, None, _user(key, type(field.serializer), nested_steps)))
+        elif isinstance(field, serializers.BaseSerializer):
+            if isinstance(field, serializers.ListSerializer):
+                raise Unsupported(f'{type(serializer).__name__}.{name}')
+            pk = f'{key}__{model_field.related_model._meta.pk.name}'
+            nested_columns, nested_steps = _compile(field, prefix=key + '__')
+            columns.append(pk)
+            columns.extend(nested_columns)
+            steps.append((name, ROW, None, _nested(pk, nested_steps)))
+        elif isinstance(model_field, models.FileField):
+            columns.append(key)
+            steps.append((name, ROW, None, _file(key, field, model_field)))
+        elif isinstance(field, serializers.RelatedField) and not isinstance(field, serializers.PrimaryKeyRelatedField):
+            raise Unsupported(f'{type(serializer).__name__}.{name}')
+        elif type(field) in PASSTHROUGH and getattr(field, 'pk_field', None) is None:
+            columns.append(key)
+            steps.append((name, PLAIN, key, None))
+        elif type(field) is serializers.FloatField:
+            columns.append(key)
+            steps.append((name, VALUE, key, float))
+        elif type(field) is serializers.DateTimeField:
+            columns.append(key)
+            steps.append((name, VALUE, key, _datetime(field)))
+        else:
+            columns.append(key)
+            steps.append((name, VALUE, key, field.to_representation))
+        if owners is not None:
+            owners[name] = columns[start:]
+    return columns, steps
+
+
+def _render_row(steps, row, context):
+    out = {}
+    for name, kind, key, fn in steps:
+        if kind is PLAIN:
+            out[name] = row[key]
+        elif kind is VALUE:
+            value = row[key]
+            out[name] = None if value is None else fn(value)
+        else:
+            out[name] = fn(context, row)
+    return out
+
+
+class ReadPlan:
+    """The compiled form of one serializer field set, bound to a request's serializer context."""
+
+    def __init__(self, columns, steps, context):
+        self.columns = list(dict.fromkeys(columns))
+        self.steps = steps
+        self.context = context
+        self.fragments = None
+
+    @classmethod
+    def for_serializer(cls, serializer_class, context):
+        """
+        The plan for what `serializer_class(..., context=context)` would
+        render, or None when FAST_READ_LISTS is off or a field is unsupported.
+        """
+        if not settings.FAST_READ_LISTS:
+            return None
+        # Built per request like DRF's own field set, so ?fields=, ?expand= and ?timestamps= apply
+        serializer, owners = serializer_class(context=context), {}
+        try:
+            plan = cls(*_compile(serializer, owners=owners), context)
+        except Unsupported:
+            return None
+        if isinstance(serializer, FragmentCacheMixin) and serializer.fragments_enabled():
+            plan.fragments = _FragmentPlan(serializer_class, plan.steps, owners)
+            plan.columns = list(dict.fromkeys(plan.columns + plan.fragments.columns))
+        return plan
+
+    def fetch(self, queryset):
+        """
+        The rows to `render()`. With a warm fragment cache: the key and
+        volatile columns of every row, then the full columns of the misses.
+        """
+        fragments = self.fragments
+        if fragments is None or not fragments.warm():
+            return self._lookup(list(queryset.values(*self.columns)))
+        rows = list(queryset.values(*fragments.columns))
+        misses = fragments.lookup(rows)
+        if not misses:
+            return rows
+        if fragments.refetch_all(misses, rows):
+            return list(queryset.values(*self.columns))
+        return fragments.merge(rows, queryset.filter(pk__in=misses).values(*self.columns))
+
+    async def afetch(self, queryset):
+        """`fetch()` for async views."""
+        fragments = self.fragments
+        if fragments is None or not fragments.warm():
+            return self._lookup([row async for row in queryset.values(*self.columns)])
+        rows = [row async for row in queryset.values(*fragments.columns)]
+        misses = fragments.lookup(rows)
+        if not misses:
+            return rows
+        if fragments.refetch_all(misses, rows):
+            return [row async for row in queryset.values(*self.columns)]
+        return fragments.merge(rows, [row async for row in queryset.filter(pk__in=misses).values(*self.columns)])
+
+    def _lookup(self, rows):
+        # Full rows: render hits from their fragments all the same
+        if self.fragments is not None:
+            self.fragments.lookup(rows)
+        return rows
+
+    def render(self, rows):
+        """JSON bytes for `rows` from `fetch()`; the same bytes JSONRenderer makes of the serializer's data."""
+        with metrics.serializer_timer():
+            steps, context = self.steps, self.context
+            if self.fragments is not None:
+                return encode(self.fragments.render(rows, context))
+            return encode([_render_row(steps, row, context) for row in rows])
+
+
+class _FragmentPlan:
+    """The fragment cache side of a ReadPlan (tasks.utils.fragments)."""
+
+    def __init__(self, serializer_class, steps, owners):
+        volatile = serializer_class.fragment_volatile
+        pk = serializer_class.Meta.model._meta.pk.name
+        self.serializer_class = serializer_class
+        self.pk = pk
+        self.steps = steps
+        self.names = [step[0] for step in steps]
+        self.volatile = frozenset(volatile)
+        self.cached = frozenset(name for name in self.names if name not in self.volatile)
+        self.volatile_steps = [step for step in steps if step[0] in self.volatile]
+        self.columns = list(dict.fromkeys(
+            [pk, 'updated_at'] + [column for name in self.names if name in self.volatile for column in owners[name]]
+        ))
+        self.hits = {}
+
+    def key(self, row):
+        return fragment_key(self.serializer_class, row[self.pk], row['updated_at'])
+
+    def lookup(self, rows):
+        """Fetch the fragments for `rows`; returns the pks of the rows without a usable one."""
+        keys = [self.key(row) for row in rows]
+        found = fragment_cache().get_many(keys)
+        cached = self.cached
+        # A fragment written for another field set lacks some names: treat it as a miss
+        self.hits = {key: fragment for key, fragment in found.items() if fragment.keys() >= cached}
+        misses = [row[self.pk] for row, key in zip(rows, keys) if key not in self.hits]
+        if rows:
+            fragment_cache().warm[self.serializer_class] = not self.refetch_all(misses, rows)
+        return misses
+
+    def warm(self):
+        # A list that last found most fragments missing reads all columns in one query
+        # rather than a narrow one and then the rest
+        return fragment_cache().warm.get(self.serializer_class, False)
+
+    @staticmethod
+    def refetch_all(misses, rows):
+        # Mostly misses: read everything again instead of naming most rows in an IN clause
+        return 2 * len(misses) > len(rows)
+
+    def merge(self, rows, full_rows):
+        """`rows` in order, each miss replaced by its full row (and dropped if it is gone)."""
+        full = {row[self.pk]: row for row in full_rows}
+        pk, hits = self.pk, self.hits
+        return [full[row[pk]] if row[pk] in full else row
+                for row in rows if row[pk] in full or self.key(row) in hits]
+
+    def render(self, rows, context):
+        hits, misses, data = self.hits, {}, []
+        steps, volatile_steps, names, volatile = self.steps, self.volatile_steps, self.names, self.volatile
+        for row in rows:
+            key = self.key(row)
+            fragment = hits.get(key)
+            if fragment is None:
+                out = _render_row(steps, row, context)
+                misses[key] = {name: value for name, value in out.items() if name not in volatile}
+            else:
+                fresh = _render_row(volatile_steps, row, context)
+                out = {name: fresh[name] if name in volatile else fragment[name] for name in names}
+            data.append(out)
+        fragment_cache().set_many(misses)
+        return data
+
+
+def encode(data):
+    """`JSONRenderer().render(data)` (no indent) without the per-call encoder setup."""
+    renderer = JSONRenderer
+    encoder = renderer.encoder_class(
+        ensure_ascii=renderer.ensure_ascii, allow_nan=not renderer.strict, check_circular=False,
+        separators=SHORT_SEPARATORS if renderer.compact else LONG_SEPARATORS,
+    )
+    # JSONRenderer always escapes these two so the output is a strict JavaScript subset
+    return encoder.encode(data).replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+
+class FastListMixin:
+    """Serves unpaginated `list` responses through the serializer's ReadPlan when the client gets plain JSON."""
+
+    def list(self, request, *args, **kwargs):
+        renderer = getattr(request, 'accepted_renderer', None)
+        if (self.paginator is None and type(renderer) is JSONRenderer
+                and renderer.get_indent(request.accepted_media_type, {}) is None):
+            plan = ReadPlan.for_serializer(self.get_serializer_class(), self.get_serializer_context())
+            if plan is not None:
+                rows = plan.fetch(self.filter_queryset(self.get_queryset()))
+                return HttpResponse(plan.render(rows), content_type=renderer.media_type)
+        return super().list(request, *args, **kwargs)
+
+# ───────────────────────────────────────────────────────────
+# Method and property fields
+# ───────────────────────────────────────────────────────────
+
+_avatar_storage = User._meta.get_field('avatar').storage
+
+
+@computed((UserShortSerializer, UserHallOfFameSerializer), 'avatar', 'avatar')
+def _avatar(context, name):
+    if not name:
+        return None
+    url = _avatar_storage.url(name)
+    request = context.get('request')
+    return request.build_absolute_uri(url) if request else url
+
+
+@computed((UserHallOfFameSerializer,), 'average_rating', 'feedback_rating_sum', 'feedback_count')
+def _average_rating(context, rating_sum, count):
+    # User.average_rating, then FloatField.to_representation
+    return float(round(rating_sum / count, 2)) if count else None
+
+
+_status_labels = dict(Task._meta.get_field('status').flatchoices)
+
+
+@computed((TaskSerializer,), 'status_display', 'status')
+def _status_display(context, status):
+    return force_str(_status_labels.get(status, status), strings_only=True)
+
+
+@computed((TaskSerializer,), 'description_preview', 'description')
+def _description_preview(context, description):
+    return description_preview(description)
+
+
+@computed((TaskSerializer,), 'created_at_formatted', 'created_at')
+@computed((TaskSerializer,), 'updated_at_formatted', 'updated_at')
+@computed((TaskSerializer,), 'deadline_formatted', 'deadline')
+def _timestamp(context, value):
+    return context['timestamps'](value)
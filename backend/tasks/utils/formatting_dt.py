@@ -1,6 +1,13 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+
 import humanize
+from django.conf import settings
+from django.utils import timezone
 from django.utils.timezone import localtime
 
+TIMESTAMP_MODES = ('relative', 'exact', 'none')
+
 def format_timestamp(dt):
     if not dt:
         return None
@@ -9,4 +16,51 @@ def format_timestamp(dt):
     exact = dt_local.strftime("%I:%M %p, %m/%d/%Y").lstrip("0").replace(" 0", " ")
     relative = humanize.naturaltime(dt_local)
     return f"{exact} — {relative}"
-    
\ No newline at end of file
+
+
+def _minute(dt):
+    return int(dt.timestamp() // 60)
+
+
+@lru_cache(maxsize=65536)
+def _exact(minute, tz):
+    dt_local = datetime.fromtimestamp(minute * 60, tz=dt_timezone.utc).astimezone(tz)
+    return dt_local.strftime("%I:%M %p, %m/%d/%Y").lstrip("0").replace(" 0", " ")
+
+
+@lru_cache(maxsize=4096)
+def _relative(minutes_ago):
+    return humanize.naturaltime(timedelta(minutes=minutes_ago))
+
+
+class TimestampFormatter:
+    """
+    `format_timestamp` at minute resolution for many rows at once.
+
+    One formatter serves a whole response: "now" is fixed to the minute it
+    was created, and each distinct minute (exact text) and minute distance
+    (relative text) is rendered once and shared through process-wide caches.
+    Responses are byte-identical for the rest of that minute, or for good
+    with mode 'exact'. Mode 'none' tells serializers to omit the fields.
+    """
+
+    def __init__(self, mode='relative', now=None):
+        self.mode = mode
+        self.tz = timezone.get_current_timezone()
+        self.now_minute = _minute(now or timezone.now())
+
+    @classmethod
+    def for_request(cls, request):
+        """Mode from `?timestamps=relative|exact|none`, else TASK_TIMESTAMPS_DEFAULT."""
+        params = getattr(request, 'query_params', None) or getattr(request, 'GET', {})
+        mode = params.get('timestamps')
+        return cls(mode if mode in TIMESTAMP_MODES else settings.TASK_TIMESTAMPS_DEFAULT)
+
+    def __call__(self, dt):
+        if not dt or self.mode == 'none':
+            return None
+        minute = _minute(dt)
+        exact = _exact(minute, self.tz)
+        if self.mode == 'exact':
+            return exact
+        return f"{exact} — {_relative(self.now_minute - minute)}"
@@ -0,0 +1,212 @@
+"""
+Fragment cache for serialized rows (TaskSerializer).
+
+A fragment is the part of one row's serialized output that depends only on
+the row, keyed by (serializer, `fragment_version`, pk, `updated_at`). Any
+save of the row moves `updated_at`, so a changed row gets a new key and
+its old fragment is never read again; it just ages out. Writes that bypass
+`save()` must set `updated_at` themselves (the admin bulk status action
+does).
+
+Fields named in the serializer's `fragment_volatile` are left out of the
+fragment and rendered for every response:
+
+- nested users come from the request's identity map (tasks.utils.user_map),
+  so a changed user shows up at once without touching any task fragment
+- `*_formatted` text depends on the clock and `?timestamps=`
+- file URLs depend on the request host
+
+Two tiers: a per-process LRU of TASK_FRAGMENT_CACHE_SIZE entries, then,
+when TASK_FRAGMENT_CACHE_ALIAS names a CACHES entry, that shared cache
+(entries expire after TASK_FRAGMENT_CACHE_TTL seconds). Lists look up all
+their rows with one `get_many` and store their misses with one `set_many`.
+Sparse responses (`?fields=` / `?expand=`) bypass the cache.
+
+Bump `fragment_version` whenever the serializer's output changes shape or
+meaning, so fragments written by older code are ignored.
+"""
+import threading
+from collections import OrderedDict
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.manager import BaseManager
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+
+class LRUCache:
+    """A thread-safe in-process LRU of at most `max_entries` keys."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_many(self, keys):
+        found = {}
+        with self._lock:
+            for key in keys:
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = value
+        return found
+
+    def set_many(self, mapping):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            for key, value in mapping.items():
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class FragmentCache:
+    def __init__(self, max_entries, alias='', ttl=None):
+        self.local = LRUCache(max_entries)
+        self.shared = caches[alias] if alias else None
+        self.ttl = ttl
+        self.warm = {}  # serializer class -> whether its last list mostly hit (tasks.utils.fastread)
+
+    def get_many(self, keys):
+        found = self.local.get_many(keys)
+        if self.shared is not None and len(found) < len(keys):
+            shared = self.shared.get_many([key for key in keys if key not in found])
+            self.local.set_many(shared)
+            found.update(shared)
+        return found
+
+    def set_many(self, mapping):
+        if not mapping:
+            return
+        self.local.set_many(mapping)
+        if self.shared is not None:
+            self.shared.set_many(mapping, self.ttl)
+
+    def clear(self):
+        self.local.clear()
+        self.warm.clear()
+
+
+_cache = None
+_config = None
+
+
+def fragment_cache():
+    """The process-wide FragmentCache for the current settings, or None when disabled."""
+    global _cache, _config
+    config = (settings.TASK_FRAGMENT_CACHE_SIZE, settings.TASK_FRAGMENT_CACHE_ALIAS, settings.TASK_FRAGMENT_CACHE_TTL)
+    if config != _config:
+        size, alias, ttl = config
+        _cache = FragmentCache(size, alias, ttl) if size > 0 or alias else None
+        _config = config
+    return _cache
+
+
+def reset_fragment_cache():
+    if _cache is not None:
+        _cache.clear()
+
+
+def fragment_key(serializer_class, pk, updated_at):
+    stamp = updated_at.astimezone(dt_timezone.utc).isoformat() if updated_at.tzinfo else updated_at.isoformat()
+    return f'fragment:{serializer_class.__name__}:{serializer_class.fragment_version}:{pk}:{stamp}'
+
+# ───────────────────────────────────────────────────────────
+# Serializer integration
+# ───────────────────────────────────────────────────────────
+
+class FragmentListSerializer(serializers.ListSerializer):
+    """Looks up every row's fragment in one round trip, and stores the misses in one."""
+
+    def to_representation(self, data):
+        rows = list(data.all() if isinstance(data, BaseManager) else data)
+        pending = self.child.prefetch_fragments(rows)
+        try:
+            return super().to_representation(rows)
+        finally:
+            if pending is not None:
+                fragment_cache().set_many(pending.misses)
+
+
+class _Pending:
+    __slots__ = ('hits', 'misses')
+
+    def __init__(self, hits):
+        self.hits = hits
+        self.misses = {}
+
+
+class FragmentCacheMixin:
+    """
+    Serializer mixin: caches `to_representation` minus `fragment_volatile`
+    per (pk, updated_at). Pair with `Meta.list_serializer_class =
+    FragmentListSerializer` so lists batch their lookups.
+    """
+    fragment_version = 1
+    fragment_volatile = ()
+
+    def fragments_enabled(self):
+        if fragment_cache() is None or getattr(self, 'sparse', None) is not None:
+            return False
+        parent = self.parent
+        return parent is None or (isinstance(parent, FragmentListSerializer) and parent.parent is None)
+
+    def prefetch_fragments(self, rows):
+        if not self.fragments_enabled():
+            return None
+        keys = [fragment_key(type(self), row.pk, row.updated_at) for row in rows]
+        pending = self.context['fragments'] = _Pending(fragment_cache().get_many(keys))
+        return pending
+
+    def to_representation(self, instance):
+        if not self.fragments_enabled():
+            return super().to_representation(instance)
+        key = fragment_key(type(self), instance.pk, instance.updated_at)
+        pending = self.context.get('fragments')
+        if pending is not None:
+            fragment = pending.hits.get(key)
+        else:
+            fragment = fragment_cache().get_many([key]).get(key)
+
+        if fragment is not None:
+            try:
+                return self._assemble(fragment, instance)
+            except KeyError:
+                pass  # written for another field set: render afresh
+
+        data = super().to_representation(instance)
+        fragment = {name: value for name, value in data.items() if name not in self.fragment_volatile}
+        if pending is not None:
+            pending.misses[key] = fragment
+        else:
+            fragment_cache().set_many({key: fragment})
+        return data
+
+    def _assemble(self, fragment, instance):
+        # Serializer.to_representation, taking the non-volatile fields from the fragment
+        ret = {}
+        for field in self._readable_fields:
+            name = field.field_name
+            if name not in self.fragment_volatile:
+                ret[name] = fragment[name]
+                continue
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                continue
+            check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            ret[name] = None if check_for_none is None else field.to_representation(attribute)
+        return ret
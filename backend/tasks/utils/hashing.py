@@ -0,0 +1,52 @@
+"""
+Password hashing helpers for process pools.
+
+Kept free of model imports so that `spawn`-based workers (Windows/macOS)
+can unpickle these functions before Django is set up.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def _hash(password):
+    from django.contrib.auth.hashers import make_password
+    return make_password(password)
+
+
+def hash_passwords(passwords, workers=1, pool=None):
+    """
+    Hash a list of raw passwords. `None` entries become unusable passwords
+    (cheap, no key stretching). Uses `pool` if given, otherwise hashes inline.
+    """
+    from django.contrib.auth.hashers import make_password
+
+    to_hash = [(i, p) for i, p in enumerate(passwords) if p]
+    result = [make_password(None) if not p else None for p in passwords]
+
+    if pool is not None and len(to_hash) > 1:
+        chunksize = max(1, len(to_hash) // (workers * 4))
+        hashed = pool.map(_hash, [p for _, p in to_hash], chunksize=chunksize)
+    else:
+        hashed = map(_hash, [p for _, p in to_hash])
+
+    for (i, _), encoded in zip(to_hash, hashed):
+        result[i] = encoded
+    return result
+
+
+def hashing_pool(workers):
+    """Return a ProcessPoolExecutor for `workers` > 1, else None (hash inline)."""
+    if workers <= 1:
+        return None
+    from django.conf import settings
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(settings.SETTINGS_MODULE,),
+    )
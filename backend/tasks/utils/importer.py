@@ -0,0 +1,349 @@
+"""
+Bulk import of users and tasks from CSV or JSONL.
+
+Rows are validated in a single streaming pass and inserted in batches with
+`bulk_create`, so neither the serializers nor the post_save signal chain
+(notifications) run per row. Invalid rows are collected in the report and
+skipped; the rest of the file is still imported.
+"""
+import csv
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email
+from django.db import DatabaseError, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from tasks.models import (
+    Role, Task, TaskStatusLog,
+    STATUS_CHOICES, PRIORITY_CHOICES, DIFFICULTY_CHOICES,
+)
+from tasks.utils.hashing import hash_passwords, hashing_pool
+
+User = get_user_model()
+
+STATUSES = {value for value, _ in STATUS_CHOICES}
+PRIORITIES = {value for value, _ in PRIORITY_CHOICES}
+DIFFICULTIES = {value for value, _ in DIFFICULTY_CHOICES}
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+
+
+class ImportReport:
+    def __init__(self, kind):
+        self.kind = kind
+        self.processed = 0
+        self.created = 0
+        self.errors = []
+
+    def add_error(self, row, errors):
+        self.errors.append({'row': row, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'kind': self.kind,
+            'processed': self.processed,
+            'created': self.created,
+            'failed': len(self.errors),
+            'errors': self.errors,
+        }
+
+
+def detect_format(filename, default='csv'):
+    name = (filename or '').lower()
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if name.endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def read_rows(lines, fmt):
+    """
+    Yield `(row_number, data)` from an iterable of text lines.
+    `data` is None for lines that could not be decoded.
+    """
+    if fmt == 'jsonl':
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                yield number, None
+                continue
+            yield number, data if isinstance(data, dict) else None
+    else:
+        reader = csv.DictReader(lines)
+        for data in reader:
+            yield reader.line_num, data
+
+
+def _batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _clean(data, key, default=''):
+    value = data.get(key)
+    if value is None:
+        return default
+    return str(value).strip()
+
+
+# ────────────────────────────────────────────────
+# Users
+# ────────────────────────────────────────────────
+
+def _validate_user(data, seen_usernames, seen_emails):
+    errors = {}
+    username = _clean(data, 'username')
+    email = _clean(data, 'email').lower()
+    role = _clean(data, 'role') or Role.USER
+
+    if not username:
+        errors['username'] = 'This field is required.'
+    elif len(username) > 150:
+        errors['username'] = 'Ensure this field has no more than 150 characters.'
+    elif username in seen_usernames:
+        errors['username'] = 'Duplicate username in file.'
+
+    try:
+        validate_email(email)
+    except DjangoValidationError:
+        errors['email'] = 'Enter a valid email address.'
+    else:
+        if email in seen_emails:
+            errors['email'] = 'Duplicate email in file.'
+
+    if role not in Role.values:
+        errors['role'] = f"'{role}' is not a valid role."
+
+    if errors:
+        return None, errors
+
+    seen_usernames.add(username)
+    seen_emails.add(email)
+    user = User(
+        username=username,
+        email=email,
+        first_name=_clean(data, 'first_name')[:150],
+        last_name=_clean(data, 'last_name')[:150],
+        job_position=_clean(data, 'job_position')[:100],
+        role=role,
+        default_password=True,
+    )
+    return (user, _clean(data, 'password') or None), None
+
+
+def import_users(rows, report=None, batch_size=None, workers=None):
+    """
+    Create users from `(row_number, data)` pairs.
+
+    Rows with a `password` are hashed in a process pool of `workers`
+    processes; rows without one get an unusable password and keep
+    `default_password=True` until the user sets one.
+    """
+    report = report or ImportReport('users')
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    workers = settings.IMPORT_HASH_WORKERS if workers is None else workers
+    seen_usernames, seen_emails = set(), set()
+
+    pool = hashing_pool(workers)
+    try:
+        for batch in _batched(rows, batch_size):
+            valid = []
+            for number, data in batch:
+                report.processed += 1
+                if data is None:
+                    report.add_error(number, {'row': 'Could not parse row.'})
+                    continue
+                result, errors = _validate_user(data, seen_usernames, seen_emails)
+                if errors:
+                    report.add_error(number, errors)
+                else:
+                    valid.append((number, *result))
+
+            valid = _drop_existing_users(valid, report)
+            if not valid:
+                continue
+
+            hashed = hash_passwords([password for _, _, password in valid], workers, pool)
+            for (_, user, _), encoded in zip(valid, hashed):
+                user.password = encoded
+
+            _bulk_insert(User, [user for _, user, _ in valid], [number for number, _, _ in valid], report)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return report
+
+
+def _drop_existing_users(valid, report):
+    if not valid:
+        return valid
+    usernames = {user.username for _, user, _ in valid}
+    emails = {user.email for _, user, _ in valid}
+    # all_objects: soft-deleted users keep their username and email until purged
+    taken_usernames = set(User.all_objects.filter(username__in=usernames).values_list('username', flat=True))
+    # Imported emails are lowercased; existing rows may not be
+    taken_emails = set(
+        User.all_objects.annotate(email_lower=Lower('email'))
+        .filter(email_lower__in=emails).values_list('email_lower', flat=True)
+    )
+
+    kept = []
+    for number, user, password in valid:
+        errors = {}
+        if user.username in taken_usernames:
+            errors['username'] = 'A user with that username already exists.'
+        if user.email in taken_emails:
+            errors['email'] = 'A user with that email already exists.'
+        if errors:
+            report.add_error(number, errors)
+        else:
+            kept.append((number, user, password))
+    return kept
+
+
+def _bulk_insert(model, objs, numbers, report):
+    try:
+        with transaction.atomic():
+            created = model.objects.bulk_create(objs)
+    except DatabaseError as e:
+        for number in numbers:
+            report.add_error(number, {'row': f'Batch insert failed: {e}'})
+        return []
+    report.created += len(created)
+    return created
+
+
+# ────────────────────────────────────────────────
+# Tasks
+# ────────────────────────────────────────────────
+
+def _resolve_usernames(batch):
+    names = set()
+    for _, data in batch:
+        if data:
+            names.update(filter(None, (_clean(data, 'giver'), _clean(data, 'assignee'))))
+    return dict(User.objects.filter(username__in=names).values_list('username', 'id'))
+
+
+def _validate_task(data, user_ids):
+    errors = {}
+    title = _clean(data, 'title')
+    giver = _clean(data, 'giver')
+    assignee = _clean(data, 'assignee')
+    task_status = _clean(data, 'status') or 'not_in_work'
+    priority = _clean(data, 'priority') or 'medium'
+    difficulty = _clean(data, 'difficulty') or 'medium'
+    deadline = _clean(data, 'deadline')
+    approx_time = _clean(data, 'approx_time') or '1.0'
+
+    if not title:
+        errors['title'] = 'This field is required.'
+    elif len(title) > 200:
+        errors['title'] = 'Ensure this field has no more than 200 characters.'
+
+    if not giver:
+        errors['giver'] = 'This field is required.'
+    elif giver not in user_ids:
+        errors['giver'] = f"Unknown user '{giver}'."
+    if assignee and assignee not in user_ids:
+        errors['assignee'] = f"Unknown user '{assignee}'."
+
+    if task_status not in STATUSES:
+        errors['status'] = f"'{task_status}' is not a valid choice."
+    if priority not in PRIORITIES:
+        errors['priority'] = f"'{priority}' is not a valid choice."
+    if difficulty not in DIFFICULTIES:
+        errors['difficulty'] = f"'{difficulty}' is not a valid choice."
+
+    deadline_dt = None
+    if deadline:
+        try:
+            deadline_dt = parse_datetime(deadline)
+        except ValueError:
+            deadline_dt = None
+        if deadline_dt is None:
+            errors['deadline'] = 'Enter a valid ISO 8601 datetime.'
+        elif timezone.is_naive(deadline_dt):
+            deadline_dt = timezone.make_aware(deadline_dt)
+
+    try:
+        approx_time = float(approx_time)
+    except ValueError:
+        errors['approx_time'] = 'A valid number is required.'
+
+    if errors:
+        return None, errors
+
+    return Task(
+        title=title,
+        description=_clean(data, 'description'),
+        giver_id=user_ids[giver],
+        assignee_id=user_ids.get(assignee) if assignee else None,
+        status=task_status,
+        priority=priority,
+        difficulty=difficulty,
+        deadline=deadline_dt,
+        approx_time=approx_time,
+        is_template=_clean(data, 'is_template').lower() in TRUE_VALUES,
+    ), None
+
+
+def import_tasks(rows, report=None, batch_size=None, created_by=None):
+    """
+    Create tasks from `(row_number, data)` pairs, referencing users by
+    username, and write each task's initial TaskStatusLog in bulk.
+    """
+    report = report or ImportReport('tasks')
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+
+    for batch in _batched(rows, batch_size):
+        user_ids = _resolve_usernames(batch)
+        valid, numbers = [], []
+        for number, data in batch:
+            report.processed += 1
+            if data is None:
+                report.add_error(number, {'row': 'Could not parse row.'})
+                continue
+            task, errors = _validate_task(data, user_ids)
+            if errors:
+                report.add_error(number, errors)
+            else:
+                valid.append(task)
+                numbers.append(number)
+
+        if not valid:
+            continue
+
+        try:
+            with transaction.atomic():
+                created = Task.objects.bulk_create(valid)
+                TaskStatusLog.objects.bulk_create([
+                    TaskStatusLog(
+                        task=task,
+                        user_id=created_by.id if created_by else task.giver_id,
+                        old_status='not_in_work',
+                        new_status=task.status,
+                    )
+                    for task in created
+                ])
+        except DatabaseError as e:
+            for number in numbers:
+                report.add_error(number, {'row': f'Batch insert failed: {e}'})
+            continue
+        report.created += len(created)
+
+    return report
@@ -0,0 +1,163 @@
+"""
+HTTP load generator for the task lifecycle (see the `load_test` command).
+
+Each virtual user is a thread with its own account. It registers, logs in
+with JWT, and then repeats the real workflow over HTTP:
+create task -> in_work -> mark_done -> start_moderation -> mark_completed,
+poll notifications, buy a store item, browse the Hall of Fame. Users are
+both giver and assignee of their tasks, so no extra accounts are needed.
+
+Latencies are recorded per endpoint template ("POST /tasks/{id}/mark_done/"),
+not per URL, so the report has one row per endpoint.
+"""
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Stats:
+    """Thread-safe latency and status collection, keyed by endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.lifecycles = 0
+
+    def record(self, endpoint, latency, status):
+        with self._lock:
+            self.latencies[endpoint].append(latency)
+            self.statuses[endpoint][status] += 1
+
+    def lifecycle_done(self):
+        with self._lock:
+            self.lifecycles += 1
+
+    def summary(self, elapsed):
+        """One row per endpoint: count, req/s, p50/p95/p99 (ms), error rate and status breakdown."""
+        rows = []
+        for endpoint, latencies in self.latencies.items():
+            statuses = self.statuses[endpoint]
+            errors = sum(count for status, count in statuses.items() if status == 0 or status >= 400)
+            ms = [latency * 1000 for latency in latencies]
+            rows.append({
+                'endpoint': endpoint,
+                'count': len(latencies),
+                'rps': len(latencies) / elapsed if elapsed else 0.0,
+                'p50': percentile(ms, 50),
+                'p95': percentile(ms, 95),
+                'p99': percentile(ms, 99),
+                'error_rate': errors / len(latencies),
+                'statuses': dict(statuses),
+            })
+        return rows
+
+
+class StepFailed(Exception):
+    pass
+
+
+class VirtualUser:
+    def __init__(self, base_url, username, password, stats, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.username = username
+        self.password = password
+        self.stats = stats
+        self.timeout = timeout
+        self.token = None
+        self.user_id = None
+
+    def request(self, method, path, endpoint, data=None, expect=(200, 201)):
+        """Send one JSON request; record it under `endpoint`; raise StepFailed on an unexpected status."""
+        body = json.dumps(data).encode() if data is not None else None
+        request = urllib.request.Request(self.base_url + path, data=body, method=method)
+        request.add_header('Accept', 'application/json')
+        if body is not None:
+            request.add_header('Content-Type', 'application/json')
+        if self.token:
+            request.add_header('Authorization', f'Bearer {self.token}')
+
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                status, payload = response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            status, payload = exc.code, exc.read()
+        except (urllib.error.URLError, OSError):
+            status, payload = 0, b''
+        self.stats.record(f'{method} {endpoint}', time.perf_counter() - started, status)
+
+        if status not in expect:
+            raise StepFailed(f'{method} {path} -> {status or "connection error"}')
+        return json.loads(payload) if payload else None
+
+    def sign_up(self):
+        self.request('POST', '/auth/register/', '/auth/register/', {
+            'username': self.username, 'email': f'{self.username}@example.com',
+            'password': self.password, 'password2': self.password,
+            'first_name': 'Load', 'last_name': 'Test',
+        })
+        tokens = self.request('POST', '/auth/jwt/create/', '/auth/jwt/create/',
+                              {'username': self.username, 'password': self.password})
+        self.token = tokens['access']
+        self.user_id = tokens['user']['id']
+
+    def lifecycle(self, item_id):
+        task = self.request('POST', '/tasks/', '/tasks/', {
+            'title': f'Load test task for {self.username}', 'description': 'Generated by load_test.',
+            'assignee_id': self.user_id, 'approx_time': 1,
+        })
+        base = f"/tasks/{task['id']}"
+        self.request('POST', f'{base}/update_status/', '/tasks/{id}/update_status/', {'status': 'in_work'})
+        self.request('POST', f'{base}/mark_done/', '/tasks/{id}/mark_done/', {})
+        self.request('POST', f'{base}/start_moderation/', '/tasks/{id}/start_moderation/', {})
+        self.request('POST', f'{base}/mark_completed/', '/tasks/{id}/mark_completed/', {})
+        self.request('GET', '/notifications/', '/notifications/')
+        if item_id is not None:
+            self.request('POST', '/purchases/buy/', '/purchases/buy/', {'item_id': item_id})
+        self.request('GET', '/hall-of-fame/', '/hall-of-fame/')
+        self.stats.lifecycle_done()
+
+    def run(self, iterations, item_id, failures):
+        try:
+            self.sign_up()
+        except StepFailed as exc:
+            failures.append(f'{self.username}: {exc}')
+            return
+        for _ in range(iterations):
+            try:
+                self.lifecycle(item_id)
+            except StepFailed as exc:
+                # Later steps depend on this one; start the next lifecycle
+                failures.append(f'{self.username}: {exc}')
+
+
+def run_load(base_url, users, iterations, item_id, username_prefix, password='LoadTest!1', ramp_up=0.0, timeout=30):
+    """Run `users` virtual users concurrently; returns (stats, elapsed seconds, failure messages)."""
+    stats, failures = Stats(), []
+    threads = [
+        threading.Thread(
+            target=VirtualUser(base_url, f'{username_prefix}{i}', password, stats, timeout).run,
+            args=(iterations, item_id, failures), daemon=True,
+        )
+        for i in range(users)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+        if ramp_up:
+            time.sleep(ramp_up / users)
+    for thread in threads:
+        thread.join()
+    return stats, time.perf_counter() - started, failures
@@ -0,0 +1,299 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+`MetricsMiddleware` (tasks.middleware.metrics) records, per view: latency,
+DB query count and time, serializer time and response size, and adds a
+`Server-Timing` header. The registry lives in process memory, so each
+worker exposes its own series on `/metrics`; scrape every worker (or run
+one) and aggregate in Prometheus.
+
+Short-lived processes (management commands) cannot be scraped, so
+`command_timer` also writes their last-run gauges to
+METRICS_TEXTFILE_DIR/<name>.prom when that is set (the node_exporter
+textfile-collector layout); `/metrics` appends those files to its output.
+"""
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PREFIX = 'gtm_'
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_lock = threading.Lock()
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    escaped = (str(v).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') for v in values)
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name, self.help, self.labels = PREFIX + name, help_text, tuple(labels)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with _lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, _format_labels(self.labels, key), value
+
+    def clear(self):
+        with _lock:
+            self._values.clear()
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels = PREFIX + name, help_text, tuple(labels)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._values = {}  # label values -> [bucket counts..., sum, count]
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with _lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+                    break
+            entry[-2] += value
+            entry[-1] += 1
+
+    def samples(self):
+        with _lock:
+            items = [(key, list(entry)) for key, entry in self._values.items()]
+        for key, entry in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, entry):
+                cumulative += count
+                yield self.name + '_bucket', _format_labels(self.labels + ('le',), key + (_format_value(bound),)), cumulative
+            yield self.name + '_sum', _format_labels(self.labels, key), entry[-2]
+            yield self.name + '_count', _format_labels(self.labels, key), entry[-1]
+
+    def clear(self):
+        with _lock:
+            self._values.clear()
+
+
+REGISTRY = []
+
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+REQUEST_LATENCY = register(Histogram(
+    'http_request_duration_seconds', 'Request latency by view.', ('view', 'method', 'status')))
+REQUEST_QUERIES = register(Histogram(
+    'http_request_db_queries', 'SQL queries executed per request.', ('view',), COUNT_BUCKETS))
+REQUEST_DB_TIME = register(Histogram(
+    'http_request_db_duration_seconds', 'Time spent in SQL per request.', ('view',)))
+REQUEST_SERIALIZER_TIME = register(Histogram(
+    'http_request_serializer_duration_seconds', 'Time spent in top-level serializers per request.', ('view',)))
+RESPONSE_SIZE = register(Histogram(
+    'http_response_size_bytes', 'Response body size.', ('view',), SIZE_BUCKETS))
+IMAGE_PROCESSING = register(Histogram(
+    'image_processing_duration_seconds', 'Pillow thumbnail/re-encode time on save.', ('model',)))
+IMAGE_ERRORS = register(Counter(
+    'image_processing_errors_total', 'Uploads that Pillow failed to process.', ('model',)))
+COMMAND_DURATION = register(Histogram(
+    'command_duration_seconds', 'Management command run time (in-process runs).', ('command', 'status')))
+
+
+def reset_metrics():
+    for metric in REGISTRY:
+        metric.clear()
+
+# ───────────────────────────────────────────────────────────
+# Per-request accumulation
+# ───────────────────────────────────────────────────────────
+
+class RequestTimings:
+    __slots__ = ('queries', 'db_time', 'serializer_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+
+
+_current = ContextVar('request_timings', default=None)
+
+
+def begin_request():
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    """`connection.execute_wrapper` hook; installed on every connection (tasks.signals)."""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.db_time += time.perf_counter() - started
+
+
+def install_query_hook(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedSerializerMixin:
+    """Adds the root serializer's `to_representation` time to the current request."""
+
+    def to_representation(self, instance):
+        timings = _current.get()
+        parent = self.parent
+        if timings is None or (parent is not None and (parent.parent is not None or not getattr(parent, 'many', False))):
+            return super().to_representation(instance)
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            timings.serializer_time += time.perf_counter() - started
+
+
+@contextmanager
+def serializer_timer():
+    """Counts the block as serializer time, for responses rendered without a DRF serializer."""
+    timings = _current.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings.serializer_time += time.perf_counter() - started
+
+# ───────────────────────────────────────────────────────────
+# Hooks for code outside the request cycle
+# ───────────────────────────────────────────────────────────
+
+@contextmanager
+def image_timer(model):
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        IMAGE_ERRORS.inc(model=model)
+        raise
+    finally:
+        IMAGE_PROCESSING.observe(time.perf_counter() - started, model=model)
+
+
+@contextmanager
+def command_timer(command):
+    """
+    Time a management command. Yields a dict; put the number of rows or
+    files the run touched in `result['affected']`.
+    """
+    result = {'affected': 0}
+    started = time.perf_counter()
+    status = 'error'
+    try:
+        yield result
+        status = 'ok'
+    finally:
+        duration = time.perf_counter() - started
+        COMMAND_DURATION.observe(duration, command=command, status=status)
+        _write_textfile(command, status, duration, result['affected'])
+
+
+def _write_textfile(command, status, duration, affected):
+    directory = settings.METRICS_TEXTFILE_DIR
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    labels = _format_labels(('command',), (command,))
+    lines = [
+        f'# TYPE {PREFIX}command_last_run_timestamp_seconds gauge',
+        f'{PREFIX}command_last_run_timestamp_seconds{labels} {time.time():.3f}',
+        f'# TYPE {PREFIX}command_last_duration_seconds gauge',
+        f'{PREFIX}command_last_duration_seconds{labels} {duration:.6f}',
+        f'# TYPE {PREFIX}command_last_success gauge',
+        f'{PREFIX}command_last_success{labels} {1 if status == "ok" else 0}',
+        f'# TYPE {PREFIX}command_last_affected gauge',
+        f'{PREFIX}command_last_affected{labels} {affected}',
+    ]
+    path = os.path.join(directory, f'command_{command}.prom')
+    # Write-then-rename so a scrape never reads half a file
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(path + '.tmp', path)
+
+# ───────────────────────────────────────────────────────────
+# Exposition
+# ───────────────────────────────────────────────────────────
+
+def render_metrics(extra=()):
+    """Prometheus text format for the registry, `extra` metrics and any textfiles."""
+    lines = []
+    for metric in list(REGISTRY) + list(extra):
+        lines.append(f'# HELP {metric.name} {metric.help}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        for name, labels, value in metric.samples():
+            lines.append(f'{name}{labels} {_format_value(value)}')
+
+    lines.extend(_read_textfiles(settings.METRICS_TEXTFILE_DIR))
+    return '\n'.join(lines) + '\n'
+
+
+def _read_textfiles(directory):
+    """Merge *.prom files so each metric family is declared once, with its samples together."""
+    if not directory or not os.path.isdir(directory):
+        return []
+    types, samples = {}, {}
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.prom'):
+            continue
+        with open(os.path.join(directory, filename), encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith('# TYPE '):
+                    _, _, name, kind = line.split(None, 3)
+                    types[name] = kind
+                elif line and not line.startswith('#'):
+                    name = line.split('{', 1)[0].split(' ', 1)[0]
+                    samples.setdefault(name, []).append(line)
+    lines = []
+    for name, family in samples.items():
+        if name in types:
+            lines.append(f'# TYPE {name} {types[name]}')
+        lines.extend(family)
+    return lines
@@ -0,0 +1,98 @@
+"""
+Creating notifications: coalescing and digests. Signals notify through `notify()`.
+
+- Coalescing: a notification about a task is merged into the recipient's
+  unread notification for the same task, updated in place (latest title,
+  message and type, `count` + 1, `updated_at` moved for `?since=` clients)
+  instead of adding a row. Once that row is read, the next event starts a
+  new one. A task going in_work -> not_moderated -> moderation ->
+  completed leaves giver and assignee one row each instead of four.
+- Digests: for users with `notification_digest` set, low-priority (`info`)
+  notifications are held as PendingNotification rows (coalesced per task
+  the same way). `flush_digests()`, run on a schedule by
+  `python manage.py flush_notification_digests`, turns each user's pending
+  rows into one summary notification. Warnings and critical notifications
+  are never held.
+"""
+from itertools import groupby
+from operator import attrgetter
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from tasks.models import Notification, PendingNotification
+
+LOW_PRIORITY = ('info',)
+
+
+def notify(user, title, message, type='info', category='task', task=None, coalesce=True):
+    """
+    Notify `user`, merging into their unread notification about the same
+    `task` or holding it for their digest. Pass `coalesce=False` when there
+    cannot be one yet (a task just created) to insert directly.
+    """
+    if user.notification_digest and type in LOW_PRIORITY:
+        model, fields = PendingNotification, {}
+    else:
+        model, fields = Notification, {'type': type}
+    values = dict(title=title, message=message, category=category, **fields)
+    if task is None or not coalesce:
+        model.objects.create(user=user, task=task, **values)
+        return
+    if _merge(model, user, task, values):
+        return
+    try:
+        # Savepoint: losing the insert race must not abort the caller's transaction
+        with transaction.atomic():
+            model.objects.create(user=user, task=task, **values)
+    except IntegrityError:
+        # A concurrent request created the unread row first (unique per user and task)
+        _merge(model, user, task, values)
+
+
+def _merge(model, user, task, values):
+    unread = model.objects.filter(user=user, task=task)
+    if model is Notification:
+        unread = unread.filter(is_read=False)
+    return unread.update(count=F('count') + 1, updated_at=timezone.now(), **values)
+
+
+def digest_message(pending):
+    """One line per held notification (newest first), capped at NOTIFICATION_DIGEST_MAX_ITEMS."""
+    limit = settings.NOTIFICATION_DIGEST_MAX_ITEMS
+    lines = []
+    for row in pending[:limit]:
+        suffix = f" ({row.count} updates)" if row.count > 1 else ''
+        lines.append(f"- {row.title}: {row.message}{suffix}")
+    if len(pending) > limit:
+        lines.append(f"...and {len(pending) - limit} more.")
+    return '\n'.join(lines)
+
+
+def flush_digests():
+    """Replace every user's pending notifications with one summary notification. Returns the digests sent."""
+    cutoff = timezone.now()
+    with transaction.atomic():
+        # Locked until the rows are deleted: a concurrent merge waits, finds nothing
+        # and starts a new pending row for the next flush instead of being lost
+        pending = list(
+            PendingNotification.objects.select_for_update()
+            .filter(updated_at__lt=cutoff).order_by('user_id', '-updated_at')
+            .only('user_id', 'title', 'message', 'count')
+        )
+        digests = []
+        for user_id, rows in groupby(pending, key=attrgetter('user_id')):
+            rows = list(rows)
+            events = sum(row.count for row in rows)
+            digests.append(Notification(
+                user_id=user_id,
+                title=f"Digest: {events} update{'s' if events != 1 else ''}",
+                message=digest_message(rows),
+                type='info',
+                category='task',
+            ))
+        Notification.objects.bulk_create(digests)
+        PendingNotification.objects.filter(id__in=[row.id for row in pending]).delete()
+    return len(digests)
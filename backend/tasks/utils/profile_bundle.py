@@ -0,0 +1,57 @@
+"""
+Public profile bundle: profile + first page of testimonials and comments.
+
+The assembled payload is cached per (profile, version, host) -- the host is
+part of the key because avatar URLs are absolute. Saving the user, their
+received feedback or comments on their profile bumps the profile version;
+bulk user UPDATEs bump the shared user-cache generation, which is also part
+of the key.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from tasks.models import TaskFeedback, UserComment
+from tasks.serializers import UserSerializer, TaskFeedbackSerializer, UserCommentSerializer
+from tasks.utils.user_cache import GENERATION_KEY, bump_version
+
+BUNDLE_PAGE_SIZE = 5
+
+
+def _version_key(profile_id):
+    return f'profile-bundle:{profile_id}:ver'
+
+
+def bundle_cache_key(profile_id, host):
+    values = cache.get_many([_version_key(profile_id), GENERATION_KEY])
+    return f'profile-bundle:{profile_id}:{values.get(GENERATION_KEY, 0)}:{values.get(_version_key(profile_id), 0)}:{host}'
+
+
+def invalidate_profile_bundle(profile_id):
+    bump_version(_version_key(profile_id))
+
+
+def build_profile_bundle(user, request):
+    context = {'request': request}
+    testimonials = TaskFeedback.objects.filter(assignee=user).select_related('giver', 'assignee').order_by('-created_at')
+    comments = UserComment.objects.filter(profile=user).select_related('user').order_by('-created_at')
+
+    return {
+        'profile': UserSerializer(user, context=context).data,
+        'testimonials': {
+            'count': testimonials.count(),
+            'results': TaskFeedbackSerializer(testimonials[:BUNDLE_PAGE_SIZE], many=True, context=context).data,
+        },
+        'comments': {
+            'count': comments.count(),
+            'results': UserCommentSerializer(comments[:BUNDLE_PAGE_SIZE], many=True, context=context).data,
+        },
+    }
+
+
+def get_profile_bundle(user, request):
+    key = bundle_cache_key(user.id, request.get_host())
+    data = cache.get(key)
+    if data is None:
+        data = build_profile_bundle(user, request)
+        cache.set(key, data, settings.PROFILE_BUNDLE_CACHE_TTL)
+    return data
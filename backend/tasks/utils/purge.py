@@ -0,0 +1,106 @@
+"""
+Background purge of soft-deleted tasks and users.
+
+`Task.soft_delete()` / `User.soft_delete()` only stamp `deleted_at`, which hides
+the rows immediately. This module removes them and everything that used to
+cascade from them, one table at a time in bounded `DELETE ... WHERE id IN`
+batches, so no single statement or transaction grows with the size of the
+deleted object graph.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.utils import timezone
+
+from tasks.models import (
+    Task, TaskStatusLog, TaskComment, TaskEvent, TaskAssigneeHistory, TaskFeedback,
+    UserComment, Notification, PendingNotification, Purchase, Tombstone,
+)
+from tasks.utils.retention import detach_notifications, in_batches
+
+User = get_user_model()
+
+TASK_DEPENDENTS = (
+    (TaskStatusLog, 'task_id'),
+    (TaskComment, 'task_id'),
+    (TaskEvent, 'task_id'),
+    (TaskAssigneeHistory, 'task_id'),
+    (TaskFeedback, 'task_id'),
+)
+
+USER_DEPENDENTS = (
+    (Notification, 'user_id'),
+    (PendingNotification, 'user_id'),
+    (TaskComment, 'user_id'),
+    (UserComment, 'user_id'),
+    (UserComment, 'profile_id'),
+    (TaskFeedback, 'giver_id'),
+    (TaskFeedback, 'assignee_id'),
+    (Purchase, 'user_id'),
+)
+
+
+def _delete_dependents(dependents, ids, batch_size, pause):
+    for model, field in dependents:
+        queryset = model.objects.filter(**{f'{field}__in': ids})
+        in_batches(
+            queryset, batch_size, pause,
+            lambda batch, model=model: model.objects.filter(id__in=batch).delete(),
+            dry_run=False,
+        )
+
+
+def purge_tasks(batch_size, pause, cutoff):
+    """Remove soft-deleted tasks (deleted before `cutoff`) and their dependents."""
+    return _purge_tasks(Task.all_objects.filter(deleted_at__lte=cutoff), batch_size, pause)
+
+
+def _purge_tasks(queryset, batch_size, pause):
+    total = 0
+    while True:
+        ids = list(queryset.order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return total
+        _delete_dependents(TASK_DEPENDENTS, ids, batch_size, pause)
+        # deleted_at stops marking them for ?since= clients: leave tombstones from the same moment
+        deleted = Task.all_objects.filter(id__in=ids).values_list('id', 'deleted_at')
+        Tombstone.objects.bulk_create([
+            Tombstone(kind=Tombstone.TASK, object_id=task_id, deleted_at=deleted_at) for task_id, deleted_at in deleted
+        ])
+        detach_notifications(ids)
+        Task.all_objects.filter(id__in=ids).delete()
+        total += len(ids)
+
+
+def purge_users(batch_size, pause, cutoff):
+    """
+    Remove soft-deleted users. Their remaining tasks are marked deleted and
+    purged first, then the remaining CASCADE tables; SET_NULL references are
+    cleared by the final delete.
+    """
+    queryset = User.all_objects.filter(deleted_at__lte=cutoff)
+    total = 0
+    while True:
+        ids = list(queryset.order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return total
+        # Stamped now, not at `cutoff`: tombstones must not predate cursors clients hold
+        tasks = Task.all_objects.filter(Q(giver_id__in=ids) | Q(assignee_id__in=ids))
+        tasks.filter(deleted_at__isnull=True).update(deleted_at=timezone.now())
+        _purge_tasks(tasks, batch_size, pause)
+        _delete_dependents(USER_DEPENDENTS, ids, batch_size, pause)
+        User.all_objects.filter(id__in=ids).delete()
+        total += len(ids)
+
+
+def purge_deleted(batch_size=None, pause=None, grace=None):
+    """Purge everything soft-deleted more than `grace` ago. Returns row counts."""
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    pause = settings.PURGE_BATCH_PAUSE if pause is None else pause
+    grace = settings.PURGE_GRACE if grace is None else grace
+    cutoff = timezone.now() - grace
+
+    return {
+        'tasks': purge_tasks(batch_size, pause, cutoff),
+        'users': purge_users(batch_size, pause, cutoff),
+    }
@@ -0,0 +1,189 @@
+"""
+Retention and archival for the hot tables.
+
+Each policy in `settings.RETENTION_POLICIES` is applied in small batches:
+select up to `batch_size` ids, then `DELETE ... WHERE id IN (...)` (or copy
+into the archive tables first), commit, pause, repeat. Short transactions
+keep lock times and replication lag low while the app stays online.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from tasks.models import (
+    Task, TaskStatusLog, TaskComment, TaskEvent, TaskAssigneeHistory,
+    Notification, ArchivedTask, ArchivedTaskStatusLog, Tombstone,
+)
+
+ARCHIVED_TASK_FIELDS = [
+    'id', 'title', 'description', 'giver_id', 'assignee_id', 'status', 'priority',
+    'difficulty', 'deadline', 'approx_time', 'files', 'created_at', 'updated_at',
+    'exp_earned', 'honor_earned', 'time_in_work',
+]
+
+
+def _cutoff(policy, now):
+    days = policy.get('days')
+    if days is None:
+        return None
+    return now - timedelta(days=days)
+
+
+def in_batches(queryset, batch_size, pause, handle, dry_run):
+    """
+    Repeatedly take the next `batch_size` ids from `queryset` and pass them to
+    `handle(ids)`. Returns the number of rows handled.
+    """
+    if dry_run:
+        return queryset.count()
+
+    total = 0
+    while True:
+        ids = list(queryset.order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return total
+        with transaction.atomic():
+            handle(ids)
+        total += len(ids)
+        if len(ids) < batch_size:
+            return total
+        if pause:
+            time.sleep(pause)
+
+
+def prune_notifications(policy, now, batch_size, pause, dry_run=False):
+    cutoff = _cutoff(policy, now)
+    if cutoff is None:
+        return 0
+    queryset = Notification.objects.filter(created_at__lt=cutoff)
+    if policy.get('only_read', True):
+        queryset = queryset.filter(is_read=True)
+
+    def handle(ids):
+        Tombstone.record(Tombstone.NOTIFICATION, Notification.objects.filter(id__in=ids).values_list('id', 'user_id'))
+        Notification.objects.filter(id__in=ids).delete()
+
+    return in_batches(queryset, batch_size, pause, handle, dry_run)
+
+
+def _history_for(ids):
+    history = {task_id: {'comments': [], 'events': [], 'assignee_changes': []} for task_id in ids}
+    for row in TaskComment.objects.filter(task_id__in=ids).values('task_id', 'user_id', 'text', 'created_at'):
+        history[row.pop('task_id')]['comments'].append(row)
+    for row in TaskEvent.objects.filter(task_id__in=ids).values('task_id', 'type', 'user_id', 'message', 'created_at'):
+        history[row.pop('task_id')]['events'].append(row)
+    assignee_changes = TaskAssigneeHistory.objects.filter(task_id__in=ids).values(
+        'task_id', 'old_assignee_id', 'new_assignee_id', 'changed_by_id', 'timestamp'
+    )
+    for row in assignee_changes:
+        history[row.pop('task_id')]['assignee_changes'].append(row)
+
+    for entry in history.values():
+        for rows in entry.values():
+            for row in rows:
+                for key, value in row.items():
+                    if hasattr(value, 'isoformat'):
+                        row[key] = value.isoformat()
+    return history
+
+
+def detach_notifications(task_ids):
+    """
+    Clear `Notification.task` for tasks about to be deleted, moving `updated_at`
+    so `?since=` clients re-sync the row (the SET_NULL cascade would not).
+    """
+    Notification.objects.filter(task_id__in=task_ids).update(task=None, updated_at=timezone.now())
+
+
+def archive_tasks(policy, now, batch_size, pause, dry_run=False):
+    """
+    Move finished tasks (and their status logs) into ArchivedTask /
+    ArchivedTaskStatusLog. Comments, events and assignee changes are kept
+    in `ArchivedTask.history`. Tasks with feedback stay in place by default
+    because public testimonials are read from TaskFeedback.
+    """
+    cutoff = _cutoff(policy, now)
+    if cutoff is None:
+        return 0
+    queryset = Task.objects.filter(
+        status__in=policy.get('statuses', ['completed', 'failed']),
+        updated_at__lt=cutoff,
+        is_template=False,
+    )
+    if policy.get('keep_with_feedback', True):
+        queryset = queryset.filter(feedback__isnull=True)
+
+    def handle(ids):
+        history = _history_for(ids)
+        ArchivedTask.objects.bulk_create([
+            ArchivedTask(**row, history=history[row['id']])
+            for row in Task.objects.filter(id__in=ids).values(*ARCHIVED_TASK_FIELDS)
+        ])
+        ArchivedTaskStatusLog.objects.bulk_create([
+            ArchivedTaskStatusLog(**row)
+            for row in TaskStatusLog.objects.filter(task_id__in=ids).values(
+                'id', 'task_id', 'user_id', 'old_status', 'new_status', 'timestamp'
+            )
+        ])
+        for model in (TaskStatusLog, TaskComment, TaskEvent, TaskAssigneeHistory):
+            model.objects.filter(task_id__in=ids).delete()
+        detach_notifications(ids)
+        Task.objects.filter(id__in=ids).delete()
+        Tombstone.record(Tombstone.TASK, [(task_id, None) for task_id in ids])
+
+    return in_batches(queryset, batch_size, pause, handle, dry_run)
+
+
+def purge_archived_tasks(policy, now, batch_size, pause, dry_run=False):
+    cutoff = _cutoff(policy, now)
+    if cutoff is None:
+        return 0
+    queryset = ArchivedTask.objects.filter(updated_at__lt=cutoff)
+
+    def handle(ids):
+        ArchivedTaskStatusLog.objects.filter(task_id__in=ids).delete()
+        ArchivedTask.objects.filter(id__in=ids).delete()
+
+    return in_batches(queryset, batch_size, pause, handle, dry_run)
+
+
+def prune_tombstones(policy, now, batch_size, pause, dry_run=False):
+    """Forget deletes older than the policy; `?since=` cursors from before then get 410 (tasks.utils.delta)."""
+    cutoff = _cutoff(policy, now)
+    if cutoff is None:
+        return 0
+    queryset = Tombstone.objects.filter(deleted_at__lt=cutoff)
+
+    def handle(ids):
+        Tombstone.objects.filter(id__in=ids).delete()
+
+    return in_batches(queryset, batch_size, pause, handle, dry_run)
+
+
+POLICY_HANDLERS = {
+    'notifications': prune_notifications,
+    'tasks': archive_tasks,
+    'archived_tasks': purge_archived_tasks,
+    'tombstones': prune_tombstones,
+}
+
+
+def run_retention(only=None, dry_run=False, batch_size=None, pause=None, now=None):
+    """
+    Apply every configured policy (or just those named in `only`).
+    Returns `{policy_name: rows_moved_or_deleted}`.
+    """
+    policies = settings.RETENTION_POLICIES
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    pause = settings.RETENTION_BATCH_PAUSE if pause is None else pause
+    now = now or timezone.now()
+
+    report = {}
+    for name, handler in POLICY_HANDLERS.items():
+        if only and name not in only:
+            continue
+        report[name] = handler(policies.get(name, {}), now, batch_size, pause, dry_run)
+    return report
@@ -0,0 +1,489 @@
+"""
+Synthetic data for benchmarks and capacity tests (see the `seed_data` command).
+
+Everything is drawn from one `random.Random(seed)`, so a seed reproduces the
+same dataset (timestamps are relative to the time of the run). Shapes:
+
+- users join on a growth curve (more recent signups); ~10% are task givers;
+  work is assigned with Pareto weights, so a few users do most of it, which
+  gives the Hall of Fame its long-tailed EXP/honor curve
+- task age decides how far it got: old tasks are mostly completed/failed,
+  recent ones are spread over the open statuses
+- estimates are log-normal (median 4h), actual time scatters around the
+  estimate, deadlines are a multiple of it; EXP and honor use the same
+  formulas as tasks.utils.task_logic
+- status logs replay the real workflow (work sessions, mark_done,
+  moderation, verdict), so `total_time_in_work` sees realistic histories
+- feedback on ~60% of completed tasks, comments, notifications for
+  assignment and verdicts, profile comments, and purchases paid from the
+  honor each user earned
+
+Rows are written without model instances' save() or signals: primary keys
+are assigned here so children can reference parents before they are
+written, then rows go out in batches with `bulk_create`, or with COPY on
+PostgreSQL. auto_now/auto_now_add are suspended while writing so the
+generated history keeps its timestamps.
+"""
+import csv
+import io
+import math
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from tasks.models import (
+    Task, TaskStatusLog, TaskFeedback, TaskComment, UserComment,
+    Notification, StoreItem, Purchase,
+)
+from tasks.utils.levels import exp_to_level
+from tasks.utils.task_logic import BASE_HONOR, DIFFICULTY_MULTIPLIER, PRIORITY_MULTIPLIER
+
+User = get_user_model()
+
+DEFAULT_BATCH_SIZE = 10_000
+
+FIRST_NAMES = ('Alex', 'Maria', 'John', 'Olga', 'Chen', 'Fatima', 'Lucas', 'Aiko', 'Omar', 'Sofia', 'Ivan', 'Grace')
+LAST_NAMES = ('Smith', 'Ivanova', 'Garcia', 'Kim', 'Nowak', 'Rossi', 'Haddad', 'Tanaka', 'Müller', 'Okafor')
+JOB_POSITIONS = ('Developer', 'Designer', 'QA Engineer', 'Analyst', 'Support', 'Manager', 'DevOps', '')
+TASK_VERBS = ('Fix', 'Review', 'Write', 'Update', 'Design', 'Test', 'Migrate', 'Document', 'Refactor', 'Deploy')
+TASK_OBJECTS = ('login page', 'invoice export', 'onboarding flow', 'API docs', 'search index', 'billing report',
+                'mobile layout', 'backup job', 'email templates', 'dashboard widgets')
+TASK_DESCRIPTIONS = ('', 'See the attached notes.', 'Follow the checklist in the wiki and update the ticket when done.',
+                     'Customer reported this twice last week; reproduce first, then fix and add a regression test.')
+COMMENT_TEXTS = ('Looks good.', 'Can you clarify the scope?', 'Done, please check.', 'Blocked by the API change.',
+                 'Thanks!', 'Updated the attachment.', 'Needs another pass.', 'Great work on this one.')
+STORE_ITEMS = ('Coffee voucher', 'Extra day off', 'Team lunch', 'Conference ticket', 'Book of choice',
+               'Noise-cancelling headphones', 'Mentoring session', 'Desk plant', 'Company hoodie', 'Gym month',
+               'Online course', 'Late start pass', 'Parking spot (month)', 'Sticker pack', 'Mechanical keyboard')
+
+OPEN_STATUSES = ('not_in_work', 'in_work', 'not_moderated', 'moderation', 'moderation_stopped', 'returned')
+OPEN_WEIGHTS = (30, 35, 12, 10, 5, 8)
+PRIORITY_WEIGHTS = {'low': 30, 'medium': 50, 'high': 20}
+DIFFICULTY_WEIGHTS = {'low': 35, 'medium': 45, 'high': 20}
+RATING_WEIGHTS = {5: 45, 4: 30, 3: 15, 2: 6, 1: 4}
+
+# ───────────────────────────────────────────────────────────
+# Writers
+# ───────────────────────────────────────────────────────────
+
+@contextmanager
+def keep_timestamps(model):
+    """Suspend auto_now/auto_now_add so bulk_create stores the generated values."""
+    fields = [f for f in model._meta.concrete_fields if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)]
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class BulkWriter:
+    """Buffers rows (dicts keyed by attname, ids included) and writes them with bulk_create."""
+
+    def __init__(self, model):
+        self.model = model
+        self.fields = model._meta.concrete_fields
+        self.defaults = {f.attname: f.get_default() for f in self.fields if not f.primary_key}
+        self.rows = []
+        self.written = 0
+
+    def add(self, **values):
+        self.rows.append(values)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def flush(self):
+        if not self.rows:
+            return
+        self._write(self.rows)
+        self.written += len(self.rows)
+        self.rows = []
+
+    def _write(self, rows):
+        with keep_timestamps(self.model):
+            self.model._base_manager.bulk_create(
+                [self.model(**{**self.defaults, **row}) for row in rows], batch_size=1000,
+            )
+
+
+def _copy_value(value):
+    if value is None:
+        return r'\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class CopyWriter(BulkWriter):
+    """Same interface; streams each batch through PostgreSQL's COPY as CSV."""
+
+    def _write(self, rows):
+        attnames = [f.attname for f in self.fields]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([_copy_value(row[name] if name in row else self.defaults[name]) for name in attnames])
+        buffer.seek(0)
+
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(f.column) for f in self.fields)
+        sql = f"COPY {quote(self.model._meta.db_table)} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        with connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, 'copy_expert'):  # psycopg2
+                raw.copy_expert(sql, buffer)
+            else:  # psycopg 3
+                with raw.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+
+def copy_supported():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        return hasattr(cursor.cursor, 'copy_expert') or hasattr(cursor.cursor, 'copy')
+
+# ───────────────────────────────────────────────────────────
+# Generator
+# ───────────────────────────────────────────────────────────
+
+def _hours(value):
+    return timedelta(hours=value)
+
+
+def _pick(rng, weights):
+    return rng.choices(tuple(weights), tuple(weights.values()))[0]
+
+
+def honor_for(priority, difficulty, approx_time, hours, deadline_hours, is_late):
+    """tasks.utils.task_logic.calculate_honor on plain numbers."""
+    atc = approx_time or 1
+    d = deadline_hours if deadline_hours else atc
+    perf_ratio = hours / atc
+    deadline_ratio = hours / d if d else 1
+    honor = BASE_HONOR
+    if not is_late:
+        honor += max(0, 1 - perf_ratio) * BASE_HONOR + (1 - deadline_ratio) * BASE_HONOR
+    else:
+        honor -= max(0, perf_ratio - 1) * BASE_HONOR + (deadline_ratio - 1) * BASE_HONOR
+    honor *= DIFFICULTY_MULTIPLIER.get(difficulty, 1.0)
+    honor *= PRIORITY_MULTIPLIER.get(priority, 1.0)
+    return max(-100, min(200, int(honor)))
+
+
+class _UserStats:
+    __slots__ = ('joined', 'exp', 'honor', 'completed', 'failed', 'worked',
+                 'feedback', 'rating_sum', 'comments', 'last_active')
+
+    def __init__(self, joined):
+        self.joined = joined
+        self.exp = self.honor = self.completed = self.failed = 0
+        self.feedback = self.rating_sum = self.comments = 0
+        self.worked = 0.0
+        self.last_active = joined
+
+    def active_at(self, when):
+        if when < self.joined:
+            self.joined = when - timedelta(hours=1)
+        if when > self.last_active:
+            self.last_active = when
+
+
+class Seeder:
+    def __init__(self, users, tasks, seed=42, days=365, batch_size=DEFAULT_BATCH_SIZE,
+                 use_copy=None, password='seed', log=None):
+        self.n_users, self.n_tasks = users, tasks
+        self.rng = random.Random(seed)
+        self.days = days
+        self.batch_size = batch_size
+        self.use_copy = copy_supported() if use_copy is None else use_copy
+        self.password = password
+        self.log = log or (lambda message: None)
+        self.now = timezone.now()
+
+        writer = CopyWriter if self.use_copy else BulkWriter
+        # Parents before children: on databases without deferred FK checks
+        # the children of a batch must find their parents already written
+        self.writers = {model: writer(model) for model in (
+            User, StoreItem, Task, TaskStatusLog, TaskFeedback, TaskComment,
+            Notification, UserComment, Purchase,
+        )}
+        self.next_ids = {
+            model: (model._base_manager.aggregate(top=Max('pk'))['top'] or 0) + 1 for model in self.writers
+        }
+
+    # helpers
+
+    def _id(self, model):
+        value = self.next_ids[model]
+        self.next_ids[model] = value + 1
+        return value
+
+    def _add(self, model, **values):
+        values['id'] = self._id(model)
+        self.writers[model].add(**values)
+        return values['id']
+
+    def _flush(self, force=False):
+        if not force and all(len(w) < self.batch_size for w in self.writers.values()):
+            return
+        with transaction.atomic():
+            for writer in self.writers.values():
+                writer.flush()
+
+    def _ago(self, max_days):
+        """A point in the past, more likely recent than old (growth curve)."""
+        return self.now - timedelta(days=self.rng.triangular(0, max_days, 0))
+
+    # phases
+
+    def run(self):
+        if not self.n_users:
+            return {}
+        self._users()
+        self._store_items()
+        self._tasks()
+        self._profile_comments()
+        self._purchases()
+        self._flush(force=True)
+        self._finish_users()
+        self._reset_sequences()
+        return {model.__name__: writer.written for model, writer in self.writers.items()}
+
+    def _users(self):
+        rng = self.rng
+        hashed = make_password(self.password)
+        self.user_ids, self.stats, self.givers = [], [], []
+        weights = []
+        for i in range(self.n_users):
+            joined = self._ago(self.days)
+            role = 'admin' if rng.random() < 0.005 else 'user'
+            user_id = self._add(
+                User, password=hashed, username=f'seed{self.next_ids[User]}', email=f'seed{self.next_ids[User]}@example.com',
+                first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+                job_position=rng.choice(JOB_POSITIONS), role=role, is_staff=role == 'admin',
+                date_joined=joined, is_online=rng.random() < 0.02, default_password=False,
+            )
+            self.user_ids.append(user_id)
+            self.stats.append(_UserStats(joined))
+            weights.append(rng.paretovariate(1.16))  # 80/20 split of the work
+            if role == 'admin' or rng.random() < 0.1:
+                self.givers.append(i)
+            self._flush()
+        if not self.givers:
+            self.givers.append(0)
+        self.cum_weights = list(_accumulate(weights))
+        self.log(f'users: {self.n_users}')
+
+    def _store_items(self):
+        self.items = []
+        for name in STORE_ITEMS:
+            cost = int(min(3000, max(10, self.rng.lognormvariate(math.log(150), 0.9))) // 5 * 5)
+            item_id = self._add(StoreItem, name=name, description=f'{name} from the rewards store.', cost=cost, active=True)
+            self.items.append((item_id, cost))
+        self.items.sort(key=lambda item: item[1])
+
+    def _tasks(self):
+        rng = self.rng
+        chunk = 10_000
+        for start in range(0, self.n_tasks, chunk):
+            size = min(chunk, self.n_tasks - start)
+            assignees = rng.choices(range(self.n_users), cum_weights=self.cum_weights, k=size)
+            for assignee in assignees:
+                self._task(rng.choice(self.givers), assignee)
+                self._flush()
+            self.log(f'tasks: {start + size}/{self.n_tasks}')
+
+    def _task(self, giver, assignee):
+        rng = self.rng
+        priority, difficulty = _pick(rng, PRIORITY_WEIGHTS), _pick(rng, DIFFICULTY_WEIGHTS)
+        approx = round(min(80.0, max(0.5, rng.lognormvariate(math.log(4), 0.8))) * 2) / 2
+        hours = approx * rng.lognormvariate(0, 0.45) * DIFFICULTY_MULTIPLIER[difficulty]
+
+        age_days = rng.triangular(0, self.days, 0)
+        if rng.random() < min(0.97, 0.4 + age_days / 60):
+            status = 'completed' if rng.random() < 0.85 else 'failed'
+        else:
+            status = rng.choices(OPEN_STATUSES, OPEN_WEIGHTS)[0]
+        if status == 'not_in_work' and rng.random() < 0.3:
+            assignee = None
+
+        timeline, done_at = self._timeline(status, hours)
+        span = timeline[-1][2]
+        created = self.now - max(timedelta(days=age_days), span + timedelta(minutes=5))
+        deadline_hours = approx * rng.uniform(2, 12) + rng.uniform(4, 72) if rng.random() < 0.75 else None
+        deadline = created + _hours(deadline_hours) if deadline_hours else None
+
+        task = dict(
+            title=f'{rng.choice(TASK_VERBS)} {rng.choice(TASK_OBJECTS)}',
+            description=rng.choice(TASK_DESCRIPTIONS),
+            giver_id=self.user_ids[giver], assignee_id=self.user_ids[assignee] if assignee is not None else None,
+            status=status, priority=priority, difficulty=difficulty, approx_time=approx,
+            deadline=deadline, created_at=created, updated_at=created + span,
+        )
+        if done_at is not None:
+            is_late = bool(deadline and created + done_at > deadline)
+            task.update(time_in_work=round(hours, 2), exp_earned=int(hours * 100),
+                        honor_earned=honor_for(priority, difficulty, approx, hours, deadline_hours, is_late))
+        for old, new, offset in timeline:
+            if new == 'moderation':
+                task['moderation_started_at'] = created + offset
+            elif new == 'moderation_stopped':
+                task['moderation_stopped_at'] = created + offset
+        if status == 'failed':
+            task.update(exp_earned=0, honor_earned=0)
+        task_id = self._add(Task, **task)
+
+        for old, new, offset in timeline:
+            # The giver moderates; everything else is the assignee's doing
+            actor = giver if new in ('moderation', 'moderation_stopped', 'returned', 'completed', 'failed') else assignee
+            self._add(TaskStatusLog, task_id=task_id, user_id=self.user_ids[actor] if actor is not None else None,
+                      old_status=old, new_status=new, timestamp=created + offset)
+
+        self.stats[giver].active_at(created)
+        if assignee is None:
+            return
+        stats = self.stats[assignee]
+        stats.active_at(created + span)
+        self._notify(assignee, 'New task assigned', f'You have been assigned "{task["title"]}".', 'info', created)
+
+        if status == 'completed':
+            stats.completed += 1
+            stats.exp += task['exp_earned']
+            stats.honor += task['honor_earned']
+            stats.worked += task['time_in_work']
+            self._notify(assignee, 'Task completed', f'"{task["title"]}" was approved: +{task["exp_earned"]} EXP.',
+                         'info', created + span)
+            if rng.random() < 0.6:
+                rating = _pick(rng, RATING_WEIGHTS)
+                self._add(TaskFeedback, task_id=task_id, giver_id=self.user_ids[giver],
+                          assignee_id=self.user_ids[assignee], rating=rating,
+                          comment=rng.choice(COMMENT_TEXTS) if rng.random() < 0.5 else '',
+                          created_at=min(self.now, created + span + _hours(rng.uniform(0, 48))))
+                stats.feedback += 1
+                stats.rating_sum += rating
+        elif status == 'failed':
+            stats.failed += 1
+            self._notify(assignee, 'Task failed', f'"{task["title"]}" was marked as failed.', 'warning', created + span)
+
+        for _ in range(rng.choices((0, 1, 2, 3, 5), (55, 20, 12, 8, 5))[0]):
+            author = rng.choice((giver, assignee))
+            self._add(TaskComment, task_id=task_id, user_id=self.user_ids[author], text=rng.choice(COMMENT_TEXTS),
+                      created_at=created + span * rng.random())
+
+    def _timeline(self, status, hours):
+        """
+        Status-log rows [(old, new, offset from creation)] that take a new task
+        to `status`, and the offset of mark_done (None if not reached).
+        """
+        rng = self.rng
+        logs = [('not_in_work', 'not_in_work', timedelta())]
+        if status == 'not_in_work':
+            return logs, None
+
+        t = timedelta()
+        sessions = rng.choices((1, 2, 3, 4), (50, 30, 15, 5))[0]
+        for i in range(sessions):
+            t += _hours(rng.uniform(0.1, 24) if i == 0 else rng.uniform(1, 16))
+            logs.append((logs[-1][1], 'in_work', t))
+            if status == 'in_work' and i == sessions - 1:
+                return logs, None
+            t += _hours(hours / sessions)
+            if i < sessions - 1:
+                logs.append(('in_work', 'not_in_work', t))
+        logs.append(('in_work', 'not_moderated', t))
+        done_at = t
+        if status == 'not_moderated':
+            return logs, done_at
+
+        t += _hours(rng.uniform(0.5, 36))
+        logs.append(('not_moderated', 'moderation', t))
+        if status != 'moderation':
+            t += _hours(rng.uniform(0.1, 8))
+            logs.append(('moderation', status, t))
+        return logs, done_at
+
+    def _notify(self, user, title, message, type_, when):
+        age = self.now - when
+        self._add(Notification, user_id=self.user_ids[user], title=title, message=message, type=type_,
+                  category='task', is_read=self.rng.random() < (0.95 if age > timedelta(days=7) else 0.4),
+                  created_at=when, updated_at=when)
+
+    def _profile_comments(self):
+        rng = self.rng
+        if self.n_users < 2:
+            return
+        profiles = rng.choices(range(self.n_users), cum_weights=self.cum_weights, k=self.n_users // 2)
+        for profile in profiles:
+            author = rng.randrange(self.n_users)
+            if author == profile:
+                continue
+            when = max(self.stats[author].joined, self.stats[profile].joined) + timedelta(
+                seconds=rng.random() * (self.now - max(self.stats[author].joined, self.stats[profile].joined)).total_seconds())
+            self._add(UserComment, user_id=self.user_ids[author], profile_id=self.user_ids[profile],
+                      text=rng.choice(COMMENT_TEXTS), created_at=when)
+            self.stats[profile].comments += 1
+            self._flush()
+
+    def _purchases(self):
+        rng = self.rng
+        for i, stats in enumerate(self.stats):
+            # Spend part of the earned honor, cheapest-first budget check
+            while stats.honor >= self.items[0][1] and rng.random() < 0.6:
+                affordable = [item for item in self.items if item[1] <= stats.honor]
+                item_id, cost = rng.choice(affordable)
+                stats.honor -= cost
+                when = stats.joined + (self.now - stats.joined) * rng.random()
+                self._add(Purchase, user_id=self.user_ids[i], item_id=item_id, timestamp=when)
+            self._flush()
+
+    def _finish_users(self):
+        """Write the totals the generated history implies (same values rebuild_counters would compute)."""
+        rng = self.rng
+        fields = ['exp', 'honor', 'level', 'tasks_completed', 'tasks_failed', 'feedback_count',
+                  'feedback_rating_sum', 'comment_count', 'time_worked', 'date_joined', 'last_seen']
+        batch = []
+        for user_id, stats in zip(self.user_ids, self.stats):
+            batch.append(User(
+                id=user_id, exp=stats.exp, honor=stats.honor, level=max(1, exp_to_level(stats.exp)),
+                tasks_completed=stats.completed, tasks_failed=stats.failed, feedback_count=stats.feedback,
+                feedback_rating_sum=stats.rating_sum, comment_count=stats.comments, time_worked=round(stats.worked, 2),
+                date_joined=stats.joined,
+                last_seen=min(self.now, stats.last_active + timedelta(hours=rng.uniform(0, 72))),
+            ))
+            if len(batch) >= self.batch_size:
+                User._base_manager.bulk_update(batch, fields, batch_size=1000)
+                batch = []
+        if batch:
+            User._base_manager.bulk_update(batch, fields, batch_size=1000)
+
+    def _reset_sequences(self):
+        # Ids were assigned here; move the sequences past them (no-op on SQLite)
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), list(self.writers)):
+                cursor.execute(sql)
+
+
+def _accumulate(values):
+    total = 0.0
+    for value in values:
+        total += value
+        yield total
+
+
+def seed(users, tasks, **options):
+    """Generate `users` users and `tasks` tasks with their history; returns rows written per model."""
+    return Seeder(users, tasks, **options).run()
@@ -0,0 +1,104 @@
+"""
+Sparse fieldsets: `?fields=id,title,status` and `?expand=assignee`.
+
+Without either parameter responses are unchanged. With one of them the
+top-level serializer switches to sparse mode:
+
+- only the listed fields are rendered (all fields when `fields` is absent)
+- nested relations in `expandable_fields` render as their primary key
+  unless named in `expand`; the id comes from the FK column, so the related
+  row is never loaded
+- `sparse_queryset` narrows the view's queryset to match: `only()` the
+  columns those fields read and `select_related` just the expanded relations
+
+Unknown names are ignored. Write-only fields are always kept so writes
+validate as before; views prune querysets for safe methods only, so
+updates never save a partially loaded instance.
+"""
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+from tasks.utils.user_map import UserRefField
+
+
+def _names(value):
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+def sparse_params(request):
+    """(fields or None, expand) from the query string, or None when neither is sent."""
+    params = getattr(request, 'query_params', None) or getattr(request, 'GET', {})
+    if 'fields' not in params and 'expand' not in params:
+        return None
+    return (_names(params.get('fields')) or None), _names(params.get('expand'))
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin. `expandable_fields` names nested relations; `sparse_sources`
+    maps method/computed fields to the model columns they read, so the queryset
+    can be narrowed (fields missing from it disable `only()`).
+    """
+    expandable_fields = ()
+    sparse_sources = {}
+
+    @property
+    def sparse(self):
+        context = self.context
+        if 'sparse' not in context:
+            context['sparse'] = sparse_params(context.get('request'))
+        return context['sparse']
+
+    def _is_top_level(self):
+        parent = self.parent
+        return parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self._is_top_level() or self.sparse is None:
+            return fields
+        requested, expand = self.sparse
+        if requested:
+            fields = {name: field for name, field in fields.items() if name in requested or field.write_only}
+        for name in self.expandable_fields:
+            if name in fields and name not in expand:
+                fields[name] = serializers.PrimaryKeyRelatedField(read_only=True, source=fields[name].source)
+        return fields
+
+    @classmethod
+    def sparse_queryset(cls, queryset, request):
+        """Narrow `queryset` to what the sparse response will read (no-op outside sparse mode)."""
+        if sparse_params(request) is None:
+            return queryset
+        model = queryset.model
+        columns = {f.name for f in model._meta.concrete_fields}
+        serializer = cls(context={'request': request})
+
+        needed, related, prunable = set(), [], True
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if name in cls.sparse_sources:
+                needed.update(cls.sparse_sources[name])
+            elif field.source in columns:
+                needed.add(field.source)
+                if isinstance(field, (serializers.BaseSerializer, UserRefField)):
+                    related.append(field.source)
+            else:
+                prunable = False
+
+        queryset = queryset.select_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*needed) if prunable and needed else queryset
+
+
+class SparseFieldsViewMixin:
+    """Applies the serializer's `sparse_queryset` to list/retrieve querysets."""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        if self.request.method in SAFE_METHODS and hasattr(serializer_class, 'sparse_queryset'):
+            queryset = serializer_class.sparse_queryset(queryset, self.request)
+        return queryset
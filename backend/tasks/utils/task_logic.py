@@ -16,7 +16,7 @@ DIFFICULTY_MULTIPLIER = {
 }
 
 def total_time_in_work(task):
-    logs = task.status_logs.filter(new_status='in_work').order_by('timestamp')
+    logs = list(task.status_logs.filter(new_status='in_work').order_by('timestamp'))
     total_time = timedelta()
 
     for i in range(0, len(logs) - 1, 2):
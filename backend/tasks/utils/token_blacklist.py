@@ -0,0 +1,61 @@
+"""
+In-process copy of the simplejwt token blacklist.
+
+New BlacklistedToken rows are pulled incrementally (by id) at most every
+TOKEN_BLACKLIST_REFRESH_SECONDS; a full reload every
+TOKEN_BLACKLIST_FULL_RELOAD_SECONDS drops expired tokens so the set stays
+bounded. Lookups are a local set membership test.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+
+class LocalBlacklist:
+    def __init__(self):
+        self._jtis = set()
+        self._last_id = 0
+        self._refreshed_at = None
+        self._reloaded_at = None
+        self._lock = threading.Lock()
+
+    def contains(self, jti):
+        self._maybe_refresh()
+        return jti in self._jtis
+
+    def clear(self):
+        with self._lock:
+            self._jtis = set()
+            self._last_id = 0
+            self._refreshed_at = self._reloaded_at = None
+
+    def _maybe_refresh(self):
+        now = time.monotonic()
+        if self._refreshed_at is not None and now - self._refreshed_at < settings.TOKEN_BLACKLIST_REFRESH_SECONDS:
+            return
+        with self._lock:
+            if self._refreshed_at is not None and now - self._refreshed_at < settings.TOKEN_BLACKLIST_REFRESH_SECONDS:
+                return
+            if self._reloaded_at is None or now - self._reloaded_at >= settings.TOKEN_BLACKLIST_FULL_RELOAD_SECONDS:
+                self._reload(now)
+            else:
+                self._load(BlacklistedToken.objects.filter(id__gt=self._last_id), self._jtis)
+            self._refreshed_at = now
+
+    def _reload(self, now):
+        jtis = set()
+        self._last_id = 0
+        self._load(BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now()), jtis)
+        self._jtis = jtis
+        self._reloaded_at = now
+
+    def _load(self, queryset, target):
+        for row_id, jti in queryset.order_by('id').values_list('id', 'token__jti').iterator():
+            target.add(jti)
+            self._last_id = max(self._last_id, row_id)
+
+
+blacklist = LocalBlacklist()
@@ -0,0 +1,77 @@
+"""
+Set-based admin actions on users.
+
+Each action is a single `UPDATE ... WHERE` over the selected users; no model
+instances are loaded and `User.save()` (with its avatar re-encode) never runs.
+One AdminActionLog row is written per batch.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Case, Value, When
+from rest_framework.exceptions import ValidationError
+
+from tasks.models import AdminActionLog
+from tasks.utils.export import parse_bound
+from tasks.utils.user_cache import invalidate_all_users
+
+User = get_user_model()
+
+USER_ACTIONS = {
+    'reset_exp': lambda: {'exp': 0},
+    'reset_honor': lambda: {'honor': 0},
+    'toggle_role': lambda: {'role': Case(When(role='admin', then=Value('user')), default=Value('admin'))},
+    'deactivate': lambda: {'is_active': False, 'is_online': False},
+    'make_admin': lambda: {'role': 'admin'},
+    'make_user': lambda: {'role': 'user'},
+}
+
+TRUE_VALUES = {True, 'true', '1', 1}
+
+
+def users_matching(user_ids=None, filters=None):
+    """
+    Build the target queryset from explicit ids and/or a filter expression:
+    `role`, `is_active`, `last_seen_before`, `never_seen`.
+    At least one criterion is required so a typo cannot hit every user.
+    """
+    filters = filters or {}
+    if not user_ids and not filters:
+        raise ValidationError({'error': 'Provide user_ids or a filter.'})
+
+    unknown = set(filters) - {'role', 'is_active', 'last_seen_before', 'never_seen'}
+    if unknown:
+        raise ValidationError({'filter': f"Unsupported filter key(s): {', '.join(sorted(unknown))}"})
+
+    queryset = User.objects.all()
+    if user_ids:
+        if not isinstance(user_ids, (list, tuple)):
+            user_ids = [user_ids]
+        try:
+            user_ids = [int(user_id) for user_id in user_ids]
+        except (TypeError, ValueError):
+            raise ValidationError({'user_ids': 'Must be a list of integers.'})
+        queryset = queryset.filter(id__in=user_ids)
+    if 'role' in filters:
+        queryset = queryset.filter(role=filters['role'])
+    if 'is_active' in filters:
+        queryset = queryset.filter(is_active=filters['is_active'] in TRUE_VALUES)
+    if filters.get('last_seen_before'):
+        queryset = queryset.filter(last_seen__lt=parse_bound(filters['last_seen_before']))
+    if 'never_seen' in filters:
+        queryset = queryset.filter(last_seen__isnull=filters['never_seen'] in TRUE_VALUES)
+    return queryset
+
+
+def apply_user_action(queryset, action, actor=None, criteria=None):
+    """Run `action` as one UPDATE over `queryset`, audit it, return the row count (no audit when 0)."""
+    if action not in USER_ACTIONS:
+        raise ValidationError({'error': 'Invalid action'})
+
+    with transaction.atomic():
+        affected = queryset.update(**USER_ACTIONS[action]())
+        if not affected:
+            return 0
+        AdminActionLog.objects.create(actor=actor, action=action, criteria=criteria or {}, affected=affected)
+    # The UPDATE bypasses post_save, so drop every cached request.user at once
+    invalidate_all_users()
+    return affected
@@ -0,0 +1,52 @@
+"""
+Short-TTL, version-stamped cache of authenticated users.
+
+Entries are stored as `(stamp, user)` where the stamp is the pair
+(global generation, per-user version) read *before* the user row was loaded.
+Invalidation bumps a version, so an entry written from a stale read can
+never match again. Bulk `UPDATE`s that bypass `post_save` bump the global
+generation instead.
+
+With the default LocMemCache each worker has its own copy; configure a shared
+CACHES backend to make invalidation cross-process (staleness is otherwise
+bounded by AUTH_USER_CACHE_TTL).
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+GENERATION_KEY = 'auth:users:gen'
+
+
+def _keys(user_id):
+    return f'auth:user:{user_id}', f'auth:user:{user_id}:ver'
+
+
+def get_cached_user(user_id):
+    """Return `(user_or_None, stamp)`; pass the stamp back to `cache_user` on a miss."""
+    entry_key, version_key = _keys(user_id)
+    values = cache.get_many([entry_key, version_key, GENERATION_KEY])
+    stamp = (values.get(GENERATION_KEY, 0), values.get(version_key, 0))
+    entry = values.get(entry_key)
+    if entry and entry[0] == stamp:
+        return entry[1], stamp
+    return None, stamp
+
+
+def cache_user(user, stamp):
+    entry_key, _ = _keys(user.pk)
+    cache.set(entry_key, (stamp, user), settings.AUTH_USER_CACHE_TTL)
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def invalidate_user(user_id):
+    bump_version(_keys(user_id)[1])
+
+
+def invalidate_all_users():
+    bump_version(GENERATION_KEY)
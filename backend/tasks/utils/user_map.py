@@ -0,0 +1,135 @@
+"""
+Per-request identity map for nested users.
+
+Task, comment, status-log and feedback lists name the same few users over
+and over. Nested user fields are `UserRefField`s: they read the foreign key
+id, and the request's `UserIdentityMap` loads each referenced user once and
+serializes it once; every later occurrence reuses the same dict.
+
+- users a queryset already joined (`select_related`) are taken from the row
+- the first miss while rendering a list loads every user the list
+  references in one query, as compact `UserRecord`s rather than model
+  instances
+- the map lives on the request, so several serializers in one response
+  (e.g. the profile bundle) share it; without a request it lives in the
+  serializer context
+
+Records are a snapshot: code that changes a user after the response has
+started serializing users sees the old values for the rest of the request.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import Model, QuerySet
+from rest_framework import serializers
+
+User = get_user_model()
+
+_avatar_field = User._meta.get_field('avatar')
+
+
+class UserRecord:
+    """The user columns nested serializers read, without a model instance."""
+    __slots__ = ('id', 'username', 'first_name', 'last_name', 'level', 'exp', 'is_online', 'last_seen', 'avatar_name')
+    COLUMNS = ('id', 'username', 'first_name', 'last_name', 'level', 'exp', 'is_online', 'last_seen', 'avatar')
+
+    def __init__(self, id, username, first_name, last_name, level, exp, is_online, last_seen, avatar_name):
+        self.id = id
+        self.username = username
+        self.first_name = first_name
+        self.last_name = last_name
+        self.level = level
+        self.exp = exp
+        self.is_online = is_online
+        self.last_seen = last_seen
+        self.avatar_name = avatar_name
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(user.id, user.username, user.first_name, user.last_name, user.level, user.exp,
+                   user.is_online, user.last_seen, user.avatar.name)
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def avatar(self):
+        return _avatar_field.attr_class(self, _avatar_field, self.avatar_name)
+
+
+class UserIdentityMap:
+    def __init__(self):
+        self.records = {}
+        self.serialized = {}
+
+    def __contains__(self, user_id):
+        return user_id in self.records
+
+    def ref(self, instance, name):
+        """The id of `instance.<name>`; a user the row already holds is recorded without a query."""
+        field = instance._meta.get_field(name)
+        user_id = getattr(instance, field.attname)
+        if user_id is not None and user_id not in self.records and field.is_cached(instance):
+            self.records[user_id] = UserRecord.from_user(field.get_cached_value(instance))
+        return user_id
+
+    def load(self, user_ids):
+        """Load the users in `user_ids` not seen yet, in one query."""
+        missing = {user_id for user_id in user_ids if user_id is not None and user_id not in self.records}
+        if missing:
+            # Base manager, like foreign key access: soft-deleted users still render
+            for values in User._base_manager.filter(pk__in=missing).values_list(*UserRecord.COLUMNS):
+                self.records[values[0]] = UserRecord(*values)
+
+    def represent(self, user_id, serializer):
+        """`serializer`'s output for the user, computed on first use."""
+        key = (user_id, type(serializer))
+        data = self.serialized.get(key)
+        if data is None:
+            data = self.serialized[key] = serializer.to_representation(self.records[user_id])
+        return data
+
+
+def user_map(context):
+    """The identity map for the request in `context` (or for `context` itself when there is none)."""
+    holder = context.get('request')
+    if holder is None:
+        return context.setdefault('users', UserIdentityMap())
+    users = getattr(holder, '_user_identity_map', None)
+    if users is None:
+        users = holder._user_identity_map = UserIdentityMap()
+    return users
+
+
+class UserRefField(serializers.Field):
+    """
+    Read-only nested user rendered by `serializer_class` through the request's
+    UserIdentityMap; the output is what the nested serializer would give.
+    """
+
+    def __init__(self, serializer_class, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+        # Bound like a ListSerializer child: shares the root context and is not timed as a root
+        self.serializer = serializer_class()
+        self.serializer.bind(field_name='', parent=self)
+
+    def get_attribute(self, instance):
+        return user_map(self.context).ref(instance, self.source)
+
+    def to_representation(self, user_id):
+        users = user_map(self.context)
+        if user_id not in users:
+            users.load(self._sibling_ids() | {user_id})
+        return users.represent(user_id, self.serializer)
+
+    def _sibling_ids(self):
+        """Ids of the users referenced by user fields of every row rendered alongside this one."""
+        serializer = self.parent
+        if isinstance(serializer.parent, serializers.ListSerializer):
+            rows = serializer.parent.instance
+            if not isinstance(rows, (list, tuple, QuerySet)):
+                return set()  # rows we cannot iterate twice
+        else:
+            rows = [serializer.instance] if isinstance(serializer.instance, Model) else []
+        names = [field.source for field in serializer.fields.values() if isinstance(field, UserRefField)]
+        return {getattr(row, row._meta.get_field(name).attname) for row in rows for name in names}
@@ -1,61 +1,133 @@
 # ✨ Standard Library
 from django.utils import timezone
+import codecs
 import os
 
 # ✅ Third-Party Imports
 from rest_framework import generics, permissions, viewsets, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes, parser_classes
 from rest_framework.permissions import IsAdminUser
 from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly, IsAuthenticated, IsAdminUser
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.exceptions import ValidationError
 from rest_framework.generics import RetrieveAPIView, ListCreateAPIView, ListAPIView
 from rest_framework.parsers import MultiPartParser
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.db.models import Q
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
 from django.views.decorators.csrf import csrf_exempt
 
 # ✅ Internal Imports
 from .models import (
     Task, TaskStatusLog, TaskFeedback, TaskAssigneeHistory, TaskComment,
-    Notification, StoreItem, Purchase, UserComment
+    Notification, StoreItem, Purchase, UserComment,
+    ArchivedTask, ArchivedTaskStatusLog, Tombstone
 )
 from .serializers import (
     RegisterSerializer, UserSerializer, UserShortSerializer, UserHallOfFameSerializer, TaskCommentSerializer,
     TaskSerializer, TaskFeedbackSerializer, TaskStatusLogSerializer, TaskAssigneeHistorySerializer,
-    NotificationSerializer, StoreItemSerializer, PurchaseSerializer, UserCommentSerializer
+    NotificationSerializer, StoreItemSerializer, PurchaseSerializer, UserCommentSerializer,
+    ArchivedTaskSerializer, ArchivedTaskStatusLogSerializer
 )
 
+from .permissions import IsAdmin
+from .throttling import throttle_metrics
 from tasks.utils.task_logic import total_time_in_work, calculate_exp, calculate_honor
+from tasks.utils.export import filter_by_date, stream_csv, stream_ndjson
+from tasks.utils.importer import detect_format, read_rows, import_users, import_tasks
+from tasks.utils.user_actions import users_matching, apply_user_action
+from tasks.utils.profile_bundle import get_profile_bundle
+from tasks.utils.counters import bump_counters
+from tasks.utils import metrics
+from tasks.utils.sparse import SparseFieldsViewMixin
+from tasks.utils.fastread import FastListMixin
+from tasks.utils.delta import DeltaSyncMixin
+from tasks.utils import board
 
 User = get_user_model()
 
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 def admin_user_action(request):
-    user_id = request.data.get('user_id')
+    """
+    Apply one action to many users as a single UPDATE.
+    Target users with `user_ids` (or legacy `user_id`) and/or a `filter`
+    ({"role": ..., "is_active": ..., "last_seen_before": ..., "never_seen": ...}).
+    """
     action = request.data.get('action')
+    user_ids = request.data.get('user_ids') or request.data.get('user_id')
+    filters = request.data.get('filter') or {}
 
-    try:
-        user = User.objects.get(id=user_id)
-    except User.DoesNotExist:
+    queryset = users_matching(user_ids, filters)
+    criteria = {'user_ids': user_ids, 'filter': filters}
+    affected = apply_user_action(queryset, action, actor=request.user, criteria=criteria)
+
+    if request.data.get('user_id') and not affected:
         return Response({'error': 'User not found'}, status=404)
+    return Response({'status': 'success', 'action': action, 'affected': affected})
 
-    if action == 'reset_exp':
-        user.exp = 0
-    elif action == 'reset_honor':
-        user.honor = 0
-    elif action == 'toggle_role':
-        user.role = 'admin' if user.role != 'admin' else 'user'
-    elif action == 'deactivate':
-        user.is_active = False
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+@parser_classes([MultiPartParser])
+def admin_import(request):
+    kind = request.data.get('kind')
+    upload = request.FILES.get('file')
+
+    if kind not in ('users', 'tasks'):
+        return Response({'error': "kind must be 'users' or 'tasks'"}, status=400)
+    if not upload:
+        return Response({'error': 'No file uploaded'}, status=400)
+
+    # Check the encoding up front: rows are decoded lazily, and a bad byte
+    # halfway through would otherwise 500 after earlier batches were committed
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    try:
+        for chunk in upload.chunks():
+            decoder.decode(chunk)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return Response({'error': 'File must be UTF-8 encoded'}, status=400)
+    upload.seek(0)
+
+    fmt = request.data.get('format') or detect_format(upload.name)
+    rows = read_rows(codecs.iterdecode(upload, 'utf-8-sig'), fmt)
+    if kind == 'users':
+        # Hash in-process: no worker pool forked from a web worker (import_data uses one)
+        report = import_users(rows, workers=1)
     else:
-        return Response({'error': 'Invalid action'}, status=400)
+        report = import_tasks(rows, created_by=request.user)
+
+    return Response(report.as_dict(), status=status.HTTP_201_CREATED if report.created else 200)
 
-    user.save()
-    return Response({'status': 'success'})
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def throttle_metrics_view(request):
+    return Response(throttle_metrics())
+
+def prometheus_metrics(request):
+    """
+    Prometheus text exposition; plain Django view so scrapes skip JWT auth and throttling.
+    Scrapers send `Authorization: Bearer <METRICS_TOKEN>`; without a token configured
+    only staff signed in to the admin can read it.
+    """
+    if settings.METRICS_TOKEN:
+        allowed = request.META.get('HTTP_AUTHORIZATION') == f'Bearer {settings.METRICS_TOKEN}'
+    else:
+        allowed = request.user.is_authenticated and request.user.is_staff
+    if not allowed:
+        return HttpResponse(status=401)
+
+    throttled = metrics.Counter('throttle_requests_total', 'Throttle decisions by scope.', ('scope', 'outcome'))
+    for scope, outcomes in throttle_metrics().items():
+        for outcome, count in outcomes.items():
+            throttled.inc(count, scope=scope, outcome=outcome)
+    return HttpResponse(metrics.render_metrics(extra=[throttled]), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 # ───────────────────────────────────────────────────────────
 # ✅ AUTH / PROFILE
@@ -65,6 +137,7 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_scope = 'auth'
 
     def post(self, request, *args, **kwargs):
         data = request.data
@@ -122,10 +195,18 @@ class PublicProfileView(RetrieveAPIView):
 
     def get_serializer_context(self):
         return {'request': self.request}
+
+class PublicProfileBundleView(APIView):
+    """Profile, first page of testimonials and comments, and their counts in one cached response."""
+    permission_classes = [AllowAny]
+
+    def get(self, request, id):
+        user = get_object_or_404(User, id=id)
+        return Response(get_profile_bundle(user, request))
 # ───────────────────────────────────────────────────────────
 # Hall of Fame
 # ───────────────────────────────────────────────────────────
-class HallOfFameView(ListAPIView):
+class HallOfFameView(FastListMixin, SparseFieldsViewMixin, ListAPIView):
     serializer_class = UserHallOfFameSerializer
     permission_classes = [permissions.AllowAny]
 
@@ -148,7 +229,7 @@ class PublicCommentListCreateView(ListCreateAPIView):
     pagination_class = PublicCommentPagination
 
     def get_queryset(self):
-        return UserComment.objects.filter(profile_id=self.kwargs['id']).order_by('-created_at')
+        return UserComment.objects.filter(profile_id=self.kwargs['id']).select_related('user').order_by('-created_at')
 
     def perform_create(self, serializer):
         if not self.request.data:
@@ -162,7 +243,8 @@ class PublicCommentListCreateView(ListCreateAPIView):
             raise ValidationError("Comment text is required.")
 
         print("✅ Passed Validation")
-        serializer.save(user=self.request.user, profile_id=self.kwargs['id'])
+        with transaction.atomic():  # comment row + profile counter
+            serializer.save(user=self.request.user, profile_id=self.kwargs['id'])
 
 
 # ───────────────────────────────────────────────────────────
@@ -180,16 +262,17 @@ class PublicTestimonialListView(ListAPIView):
     def get_queryset(self):
         return TaskFeedback.objects.filter(
             assignee_id=self.kwargs['id']
-        ).order_by('-created_at')
+        ).select_related('giver', 'assignee').order_by('-created_at')
 
 # ───────────────────────────────────────────────────────────
 # ✅ TASKS
 # ───────────────────────────────────────────────────────────
 
-class TaskViewSet(viewsets.ModelViewSet):
-    queryset = Task.objects.all().order_by('-created_at')
+class TaskViewSet(DeltaSyncMixin, FastListMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
+    queryset = Task.objects.select_related('giver', 'assignee').order_by('-created_at')
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    sync_kind = Tombstone.TASK
 
     def perform_create(self, serializer):
         task = serializer.save(giver=self.request.user)
@@ -210,7 +293,30 @@ class TaskViewSet(viewsets.ModelViewSet):
         if task.giver != user and user.role != 'admin':
             raise PermissionDenied("You do not have permission to delete this task.")
         return super().destroy(request, *args, **kwargs)
+
+    def perform_destroy(self, instance):
+        # Hidden immediately; logs, comments, events etc. are removed by purge_deleted
+        instance.soft_delete()
         
+    @action(detail=False, methods=['get'])
+    def board(self, request):
+        """Kanban board: per-status counts and each status column's first page (tasks.utils.board)."""
+        queryset = board.scoped(self.filter_queryset(self.get_queryset()), request)
+        status = board.status_param(request)
+        paginator = board.BoardPagination()
+
+        if status is not None:
+            rows = paginator.paginate_queryset(
+                queryset.filter(status=status).order_by('-created_at', '-id'), request, view=self)
+            data = self.get_serializer(rows, many=True).data
+            return Response(board.column_response(status, paginator, data))
+
+        page_size = paginator.get_page_size(request)
+        counts = board.status_counts(queryset)
+        rows = board.first_pages(queryset, page_size)
+        data = self.get_serializer(rows, many=True).data  # one list, so fragments are fetched together
+        return Response(board.board_response(request, counts, rows, data, page_size))
+
     @action(detail=True, methods=['post'])
     def update_status(self, request, pk=None):
         task = self.get_object()
@@ -219,7 +325,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             TaskStatusLog.objects.create(task=task, user=request.user, old_status=task.status, new_status=new_status)
             task.status = new_status
             task.save()
-        return Response(TaskSerializer(task).data)
+        return Response(TaskSerializer(task, context=self.get_serializer_context()).data)
 
     @action(detail=True, methods=['post'])
     def submit_feedback(self, request, pk=None):
@@ -246,7 +352,8 @@ class TaskViewSet(viewsets.ModelViewSet):
         # Validate and save
         serializer = TaskFeedbackSerializer(data=data)
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():  # feedback row + assignee counters
+                serializer.save()
             return Response(serializer.data)
         return Response(serializer.errors, status=400)
 
@@ -273,7 +380,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         task.honor_earned = calculate_honor(task) if time_worked else 0
         task.save()
 
-        return Response(TaskSerializer(task).data)
+        return Response(TaskSerializer(task, context=self.get_serializer_context()).data)
 
     
     @action(detail=True, methods=["post"])
@@ -286,25 +393,28 @@ class TaskViewSet(viewsets.ModelViewSet):
         if task.status not in ['not_moderated', 'moderation', 'moderation_stopped']:
             return Response({'error': 'Task must be in moderation state to complete.'}, status=400)
 
-        # Award EXP + Honor to the assignee
-        assignee = task.assignee
-        if assignee:
-            assignee.exp += task.exp_earned or 0
-            assignee.honor += task.honor_earned or 0
-            assignee.save()
+        with transaction.atomic():
+            # Award EXP + Honor to the assignee and bump their stats in one UPDATE
+            bump_counters(
+                task.assignee_id,
+                exp=task.exp_earned or 0,
+                honor=task.honor_earned or 0,
+                tasks_completed=1,
+                time_worked=task.time_in_work or 0,
+            )
 
-        task.status = 'completed'
-        task.save()
+            task.status = 'completed'
+            task.save()
 
-        # Log the change
-        TaskStatusLog.objects.create(
-            task=task,
-            user=request.user,
-            old_status='moderation',
-            new_status='completed'
-        )
+            # Log the change
+            TaskStatusLog.objects.create(
+                task=task,
+                user=request.user,
+                old_status='moderation',
+                new_status='completed'
+            )
 
-        return Response(TaskSerializer(task).data)
+        return Response(TaskSerializer(task, context=self.get_serializer_context()).data)
     
     @action(detail=True, methods=["post"])
     def start_moderation(self, request, pk=None):
@@ -327,7 +437,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             new_status='moderation'
         )
 
-        return Response(TaskSerializer(task).data)
+        return Response(TaskSerializer(task, context=self.get_serializer_context()).data)
 
 
     @action(detail=True, methods=["post"])
@@ -350,7 +460,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             new_status=task.status
         )
 
-        return Response(TaskSerializer(task).data)
+        return Response(TaskSerializer(task, context=self.get_serializer_context()).data)
     
     @action(detail=True, methods=["post"])
     def return_to_assignee(self, request, pk=None):
@@ -372,7 +482,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         task.status = 'returned'
         task.save()
 
-        return Response(TaskSerializer(task).data)
+        return Response(TaskSerializer(task, context=self.get_serializer_context()).data)
 
 
     @action(detail=True, methods=["post"])
@@ -385,22 +495,24 @@ class TaskViewSet(viewsets.ModelViewSet):
         if task.status not in ['not_moderated', 'moderation', 'moderation_stopped']:
             return Response({'error': 'Task must be in moderation state to fail.'}, status=400)
 
-        TaskStatusLog.objects.create(
-            task=task,
-            user=request.user,
-            old_status=task.status,
-            new_status='failed'
-        )
+        with transaction.atomic():
+            TaskStatusLog.objects.create(
+                task=task,
+                user=request.user,
+                old_status=task.status,
+                new_status='failed'
+            )
 
-        task.status = 'failed'
+            task.status = 'failed'
 
-        # Optional: erase exp/honor (leave 0 just in case)
-        task.exp_earned = 0
-        task.honor_earned = 0
+            # Optional: erase exp/honor (leave 0 just in case)
+            task.exp_earned = 0
+            task.honor_earned = 0
 
-        task.save()
+            task.save()
+            bump_counters(task.assignee_id, tasks_failed=1)
 
-        return Response(TaskSerializer(task).data)
+        return Response(TaskSerializer(task, context=self.get_serializer_context()).data)
     
     @action(detail=True, methods=['get'])
     def logs(self, request, pk=None):
@@ -408,13 +520,48 @@ class TaskViewSet(viewsets.ModelViewSet):
         logs = TaskStatusLog.objects.filter(task=task).order_by('-timestamp')
         return Response(TaskStatusLogSerializer(logs, many=True).data)
     
+# ───────────────────────────────────────────────────────────
+# Archived Tasks (read-only, filled by apply_retention)
+# ───────────────────────────────────────────────────────────
+class ArchivePagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+class ArchivedTaskViewSet(SparseFieldsViewMixin, viewsets.ReadOnlyModelViewSet):
+    serializer_class = ArchivedTaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ArchivePagination
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = ArchivedTask.objects.select_related('giver', 'assignee')
+        if user.role != 'admin':
+            queryset = queryset.filter(Q(giver=user) | Q(assignee=user))
+        task_status = self.request.query_params.get('status')
+        if task_status:
+            queryset = queryset.filter(status=task_status)
+        return queryset
+
+    @action(detail=True, methods=['get'])
+    def logs(self, request, pk=None):
+        task = self.get_object()
+        logs = ArchivedTaskStatusLog.objects.filter(task=task).order_by('-timestamp')
+        return Response(ArchivedTaskStatusLogSerializer(logs, many=True, context={'request': request}).data)
+
 # ───────────────────────────────────────────────────────────
 # Task Comments
 # ───────────────────────────────────────────────────────────
-class TaskCommentView(generics.ListCreateAPIView):
+class TaskCommentView(SparseFieldsViewMixin, generics.ListCreateAPIView):
     serializer_class = TaskCommentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Task.objects hides soft-deleted tasks: their comments are gone too
+        if not Task.objects.filter(id=self.kwargs['task_id']).exists():
+            raise Http404
+
     def get_queryset(self):
         task_id = self.kwargs['task_id']
         return TaskComment.objects.filter(task_id=task_id).order_by('-created_at')
@@ -432,7 +579,7 @@ class UserListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        users = User.objects.all().order_by('-level', '-exp')
+        users = UserHallOfFameSerializer.sparse_queryset(User.objects.all().order_by('-level', '-exp'), request)
         serializer = UserHallOfFameSerializer(users, many=True, context={'request': request})
         return Response(serializer.data)
 
@@ -440,27 +587,36 @@ class UserListView(APIView):
 # ✅ NOTIFICATIONS
 # ───────────────────────────────────────────────────────────
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(DeltaSyncMixin, FastListMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    sync_kind = Tombstone.NOTIFICATION
 
     def get_queryset(self):
         return Notification.objects.filter(user=self.request.user)
 
+    def sync_scope(self):
+        return self.request.user.id
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            Tombstone.record(Tombstone.NOTIFICATION, [(instance.id, instance.user_id)])
+            instance.delete()
+
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
         notifications = Notification.objects.filter(user=request.user, is_read=False)
-        notifications.update(is_read=True)
+        notifications.update(is_read=True, updated_at=timezone.now())
         return Response({'status': 'all notifications marked as read'})
 
 # ───────────────────────────────────────────────────────────
 # ✅ HONOR STORE
 # ───────────────────────────────────────────────────────────
 
-class StoreItemViewSet(viewsets.ModelViewSet):
+class StoreItemViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     queryset = StoreItem.objects.all()
     serializer_class = StoreItemSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -470,12 +626,12 @@ class StoreItemViewSet(viewsets.ModelViewSet):
             return StoreItem.objects.all()
         return StoreItem.objects.filter(active=True)
 
-class PurchaseViewSet(viewsets.ModelViewSet):
+class PurchaseViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     serializer_class = PurchaseSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Purchase.objects.filter(user=self.request.user)
+        return Purchase.objects.filter(user=self.request.user).select_related('item')
 
     @action(detail=False, methods=['post'])
     def buy(self, request):
@@ -484,4 +640,46 @@ class PurchaseViewSet(viewsets.ModelViewSet):
             purchase = serializer.save()
             return Response(PurchaseSerializer(purchase).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        
\ No newline at end of file
+        
+
+# ───────────────────────────────────────────────────────────
+# ✅ EXPORTS (streamed, constant memory)
+# ───────────────────────────────────────────────────────────
+
+class TaskExportView(APIView):
+    permission_classes = [IsAdmin]
+    throttle_scope = 'export'
+    fields = [
+        'id', 'title', 'status', 'priority', 'difficulty',
+        'giver_id', 'giver__username', 'assignee_id', 'assignee__username',
+        'deadline', 'approx_time', 'time_in_work', 'exp_earned', 'honor_earned',
+        'created_at', 'updated_at',
+    ]
+
+    def get(self, request):
+        queryset = filter_by_date(Task.objects.order_by('id'), request, 'created_at')
+        return stream_csv(queryset, self.fields, 'tasks.csv')
+
+class StatusLogExportView(APIView):
+    permission_classes = [IsAdmin]
+    throttle_scope = 'export'
+    fields = [
+        'id', 'task_id', 'task__title', 'user_id', 'user__username',
+        'old_status', 'new_status', 'timestamp',
+    ]
+
+    def get(self, request):
+        queryset = filter_by_date(TaskStatusLog.objects.order_by('id'), request, 'timestamp')
+        return stream_ndjson(queryset, self.fields, 'status_logs.ndjson')
+
+class PurchaseExportView(APIView):
+    """Honor ledger: every store purchase with the cost charged."""
+    permission_classes = [IsAdmin]
+    throttle_scope = 'export'
+    fields = [
+        'id', 'user_id', 'user__username', 'item_id', 'item__name', 'item__cost', 'timestamp',
+    ]
+
+    def get(self, request):
+        queryset = filter_by_date(Purchase.objects.order_by('id'), request, 'timestamp')
+        return stream_csv(queryset, self.fields, 'purchases.csv')
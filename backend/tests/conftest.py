@@ -0,0 +1,39 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from tasks.throttling import reset_throttling
+from tasks.utils.fragments import reset_fragment_cache
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    """Throttle buckets, cached users, live-status stamps and task fragments must not leak between tests."""
+    cache.clear()
+    reset_throttling()
+    reset_fragment_cache()
+    yield
+
+
+@pytest.fixture
+def user(db):
+    """The user API tests act as; modules that seed their own data override it."""
+    return User.objects.create_user(username="reader", email="reader@example.com", password="pass")
+
+
+@pytest.fixture
+def client_for(db):
+    """`client_for(user)`: an APIClient authenticated as `user`, past the first request that marks them online."""
+    def make(user):
+        client = APIClient()
+        client.force_authenticate(user)
+        client.get("/tasks/")
+        return client
+    return make
+
+
+@pytest.fixture
+def client(user, client_for):
+    return client_for(user)
@@ -0,0 +1,126 @@
+import pytest
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from tasks.admin import EstimatedCountPaginator
+from tasks.models import Notification, Task, TaskStatusLog
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def superuser(db):
+    return User.objects.create_superuser(username="root", email="root@example.com", password="pass")
+
+
+@pytest.fixture
+def admin_client(superuser):
+    client = Client()
+    client.force_login(superuser)
+    return client
+
+
+@pytest.fixture
+def tasks(superuser):
+    worker = User.objects.create_user(username="worker", email="worker@example.com", password="pass")
+    return [
+        Task.objects.create(title=f"Task {i}", giver=superuser, assignee=worker, status="moderation")
+        for i in range(3)
+    ]
+
+
+def test_paginator_uses_estimate_only_for_large_unfiltered_tables(tasks, settings, monkeypatch):
+    settings.ADMIN_ESTIMATED_COUNT_THRESHOLD = 1000
+    queryset = Task.objects.order_by("id")
+
+    exact = EstimatedCountPaginator(queryset, 2)
+    assert exact.count == 3  # estimate not requested
+
+    monkeypatch.setattr(EstimatedCountPaginator, "_estimated_count", lambda self: 250_000)
+    estimated = EstimatedCountPaginator(queryset, 2)
+    estimated.estimate = True
+    assert estimated.count == 250_000
+
+    monkeypatch.setattr(EstimatedCountPaginator, "_estimated_count", lambda self: 500)
+    small = EstimatedCountPaginator(queryset, 2)
+    small.estimate = True
+    assert small.count == 3  # below the threshold the exact count is cheap
+
+    monkeypatch.setattr(EstimatedCountPaginator, "_estimated_count", lambda self: None)
+    unknown = EstimatedCountPaginator(queryset, 2)
+    unknown.estimate = True
+    assert unknown.count == 3  # no statistics (or not PostgreSQL)
+
+
+def test_paginator_estimates_only_unfiltered_changelists():
+    def paginator(query):
+        request = RequestFactory().get("/admin/tasks/task/", query)
+        return site._registry[Task].get_paginator(request, Task.objects.all(), 50)
+
+    assert paginator({}).estimate
+    assert paginator({"o": "1", "p": "2"}).estimate
+    assert not paginator({"status": "failed"}).estimate
+    assert not paginator({"q": "title"}).estimate
+
+
+def test_exact_count_on_sqlite(tasks):
+    paginator = EstimatedCountPaginator(Task.objects.order_by("id"), 2)
+    paginator.estimate = True
+    assert paginator._estimated_count() is None
+    assert paginator.count == 3
+
+
+@pytest.mark.parametrize("action, new_status", [
+    ("mark_failed", "failed"),
+    ("return_to_assignee", "returned"),
+    ("reset_to_not_in_work", "not_in_work"),
+])
+def test_bulk_task_transitions_are_set_based(admin_client, superuser, tasks, action, new_status):
+    before = {task.id: task.updated_at for task in tasks}
+    Task.objects.filter(id=tasks[0].id).update(status=new_status)  # already there: left alone
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = admin_client.post("/admin/tasks/task/", {"action": action, "_selected_action": list(before)})
+    assert response.status_code == 302
+
+    sql = [q["sql"] for q in ctx.captured_queries]
+    assert sum(s.startswith('UPDATE "tasks_task"') for s in sql) == 1
+    assert sum(s.startswith('INSERT INTO "tasks_taskstatuslog"') for s in sql) == 1
+
+    moved = [task.id for task in tasks[1:]]
+    logs = TaskStatusLog.objects.filter(new_status=new_status).order_by("task_id")
+    assert [(log.task_id, log.old_status, log.user_id) for log in logs] == [(i, "moderation", superuser.id) for i in moved]
+    for task in Task.objects.filter(id__in=moved):
+        assert task.status == new_status
+        assert task.updated_at > before[task.id]
+    assert not TaskStatusLog.objects.filter(task_id=tasks[0].id, new_status=new_status).exists()
+
+
+def test_mark_failed_clears_rewards(admin_client, tasks):
+    Task.objects.update(exp_earned=100, honor_earned=10)
+    admin_client.post("/admin/tasks/task/", {"action": "mark_failed", "_selected_action": [tasks[0].id]})
+    assert Task.objects.values_list("exp_earned", "honor_earned").get(id=tasks[0].id) == (0, 0)
+
+
+@pytest.mark.parametrize("url", [
+    "/admin/tasks/task/",
+    "/admin/tasks/task/?status=moderation",
+    "/admin/tasks/user/",
+    "/admin/tasks/taskstatuslog/",
+    "/admin/tasks/notification/",
+    "/admin/tasks/archivedtask/",
+    "/admin/tasks/purchase/",
+    "/admin/tasks/adminactionlog/",
+])
+def test_changelists_render(admin_client, tasks, url):
+    Notification.objects.create(user=tasks[0].giver, title="Hello", message="m")
+    assert admin_client.get(url).status_code == 200
+
+
+def test_change_form_renders(admin_client, tasks):
+    assert admin_client.get(f"/admin/tasks/task/{tasks[0].id}/change/").status_code == 200
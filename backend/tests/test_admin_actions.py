@@ -0,0 +1,40 @@
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from tasks.models import AdminActionLog
+
+User = get_user_model()
+
+@pytest.mark.django_db
+def test_batch_admin_user_action():
+    admin = User.objects.create_user(username="boss", email="boss@example.com", password="pass", is_staff=True, role="admin", honor=50)
+    stale = [
+        User.objects.create_user(username=f"stale{i}", email=f"stale{i}@example.com", password="pass", honor=50,
+                                 last_seen=timezone.now() - timedelta(days=90))
+        for i in range(3)
+    ]
+    active = User.objects.create_user(username="active", email="active@example.com", password="pass", honor=50,
+                                      last_seen=timezone.now())
+
+    client = APIClient()
+    client.force_authenticate(admin)
+
+    response = client.post('/admin/user-action/', {
+        "action": "reset_honor",
+        "filter": {"role": "user", "last_seen_before": (timezone.now() - timedelta(days=30)).isoformat()},
+    }, format="json")
+    assert response.data == {"status": "success", "action": "reset_honor", "affected": 3}
+    assert set(User.objects.filter(honor=0).values_list("id", flat=True)) == {u.id for u in stale}
+    assert User.objects.get(id=active.id).honor == 50
+
+    response = client.post('/admin/user-action/', {"action": "toggle_role", "user_ids": [admin.id, active.id]}, format="json")
+    assert response.data["affected"] == 2
+    assert User.objects.get(id=admin.id).role == "user"
+    assert User.objects.get(id=active.id).role == "admin"
+
+    assert client.post('/admin/user-action/', {"action": "deactivate", "user_id": 999999}).status_code == 404
+    assert client.post('/admin/user-action/', {"action": "deactivate"}).status_code == 400
+    assert client.post('/admin/user-action/', {"action": "deactivate", "filter": {"role": "nobody"}}, format="json").data["affected"] == 0
+    assert list(AdminActionLog.objects.values_list("action", flat=True).order_by("id")) == ["reset_honor", "toggle_role"]
@@ -0,0 +1,42 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, Client, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from tasks.models import Task, Notification
+
+User = get_user_model()
+
+@pytest.mark.django_db
+def test_async_reads_match_sync_responses():
+    giver = User.objects.create_user(username="giver", email="giver@example.com", password="pass")
+    worker = User.objects.create_user(username="worker", email="worker@example.com", password="pass")
+    task = Task.objects.create(title="Async", description="x" * 150, giver=giver, assignee=worker)
+    Task.objects.create(title="Unassigned", giver=giver)
+    notification = Notification.objects.filter(user=worker).first()
+    auth = {"headers": {"Authorization": f"Bearer {AccessToken.for_user(worker)}"}}
+
+    paths = [
+        "/tasks/", f"/tasks/{task.id}/", "/tasks/999999/",
+        "/notifications/", f"/notifications/{notification.id}/",
+        "/hall-of-fame/", f"/auth/public-profile/{giver.id}/",
+    ]
+    Client().get("/tasks/", **auth)  # let the live-status write (is_online/last_seen) happen first
+    expected = {path: Client().get(path, **auth) for path in paths}
+
+    with override_settings(ROOT_URLCONF="core.asgi_urls"):
+        client = AsyncClient()
+        for path in paths:
+            response = async_to_sync(client.get)(path, **auth)
+            assert response.status_code == expected[path].status_code, path
+            assert response.content == expected[path].content, path
+
+        # Anonymous reads of protected endpoints are rejected like DRF does
+        assert async_to_sync(client.get)("/tasks/").status_code == 401
+
+        # Writes on the same paths fall through to the sync viewsets
+        response = async_to_sync(client.post)(
+            "/tasks/", {"title": "Written"}, content_type="application/json", **auth
+        )
+        assert response.status_code == 201
+        assert Task.objects.filter(title="Written", giver=worker).exists()
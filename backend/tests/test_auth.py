@@ -21,4 +21,23 @@ def test_register_and_login():
     })
     assert login.status_code == 200
     assert 'access' in login.data
-    assert 'refresh' in login.data
\ No newline at end of file
+    assert 'refresh' in login.data
+
+@pytest.mark.django_db
+def test_jwt_user_is_cached_and_invalidated(django_assert_num_queries):
+    user = User.objects.create_user(username="cached", email="cached@example.com", password="TestPass123")
+    client = APIClient()
+    token = client.post('/auth/jwt/create/', {"username": "cached", "password": "TestPass123"}).data['access']
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    client.get('/auth/profile/')  # warms the cache (and the last_seen throttle)
+    with django_assert_num_queries(0):
+        assert client.get('/auth/profile/').data['role'] == 'user'
+
+    user.role = 'admin'
+    user.save()
+    assert client.get('/auth/profile/').data['role'] == 'admin'
+
+    user.is_active = False
+    user.save()
+    assert client.get('/auth/profile/').status_code == 401
@@ -0,0 +1,34 @@
+import pytest
+
+from benchmarks.cases import CASES
+from benchmarks.runner import compare_runs, find_run, load_history, record_run, run_benchmarks
+
+
+@pytest.mark.django_db
+def test_every_case_runs_and_is_recorded(tmp_path):
+    results = run_benchmarks(scales=(20,), repeat=1)
+    assert set(results) == set(CASES)
+    assert all(results[name]["20"]["median"] > 0 for name in CASES)
+
+    path = str(tmp_path / "history.json")
+    record_run(path, results, label="first")
+    record_run(path, results)
+    history = load_history(path)
+    assert [run["id"] for run in history] == [1, 2]
+    assert history[0]["label"] == "first"
+    assert find_run(history, -1)["id"] == 2
+
+
+def test_compare_flags_slowdowns_beyond_threshold():
+    base = {"id": 1, "results": {"calculate_exp": {"1000": {"median": 1.0}}, "exp_bar_percent": {"1000": {"median": 1.0}}}}
+    head = {"id": 2, "results": {
+        "calculate_exp": {"1000": {"median": 1.25}},
+        "exp_bar_percent": {"1000": {"median": 1.05}},
+        "task_serializer": {"1000": {"median": 9.0}},  # not in base: skipped
+    }}
+
+    rows = {row[0]: row for row in compare_runs(base, head, threshold=0.10)}
+
+    assert set(rows) == {"calculate_exp", "exp_bar_percent"}
+    assert rows["calculate_exp"][4] == pytest.approx(0.25) and rows["calculate_exp"][5] is True
+    assert rows["exp_bar_percent"][5] is False
@@ -0,0 +1,61 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tasks.models import STATUS_CHOICES, Task
+
+User = get_user_model()
+
+
+@pytest.fixture
+def world(db):
+    giver = User.objects.create_user(username="giver", email="giver@example.com", password="pass")
+    worker = User.objects.create_user(username="worker", email="worker@example.com", password="pass")
+    Task.objects.bulk_create(
+        [Task(title=f"work {i}", giver=giver, assignee=worker, status="in_work") for i in range(25)]
+        + [Task(title=f"done {i}", giver=giver, status="completed") for i in range(3)]
+        + [Task(title="theirs", giver=worker, status="in_work")]
+    )
+    return giver, worker
+
+
+@pytest.mark.django_db
+def test_board_columns(world, client_for):
+    giver, _ = world
+    client = client_for(giver)
+
+    with CaptureQueriesContext(connection) as ctx:
+        body = client.get("/tasks/board/").json()
+    columns = {column["status"]: column for column in body["columns"]}
+
+    assert [column["status"] for column in body["columns"]] == [value for value, _ in STATUS_CHOICES]
+    assert len([q for q in ctx.captured_queries if '"tasks_task"' in q["sql"]]) == 2
+    assert columns["in_work"]["count"] == 25
+    assert [t["title"] for t in columns["in_work"]["results"]][:2] == ["work 24", "work 23"]
+    assert len(columns["in_work"]["results"]) == 20
+    assert columns["completed"]["count"] == 3 and columns["completed"]["next"] is None
+    assert columns["failed"] == {"status": "failed", "label": "Failed", "count": 0, "next": None,
+                                 "previous": None, "results": []}
+
+    page = client.get(columns["in_work"]["next"]).json()
+    assert page["status"] == "in_work" and page["count"] == 25
+    assert [t["title"] for t in page["results"]] == [f"work {i}" for i in range(4, -1, -1)]
+    assert page["next"] is None and page["previous"] is not None
+
+
+@pytest.mark.django_db
+def test_board_scopes(world, client_for):
+    giver, worker = world
+    assignee_board = client_for(worker).get("/tasks/board/?scope=assignee").json()
+    assert sum(column["count"] for column in assignee_board["columns"]) == 25
+    assert client_for(worker).get("/tasks/board/").json()["columns"][1]["count"] == 1
+
+    assert client_for(giver).get("/tasks/board/?scope=all").status_code == 403
+    admin = User.objects.create_user(username="boss", email="boss@example.com", password="pass", role="admin")
+    everything = client_for(admin).get("/tasks/board/?scope=all&page_size=5").json()
+    assert sum(column["count"] for column in everything["columns"]) == 29
+    assert len(everything["columns"][1]["results"]) == 5
+
+    assert client_for(giver).get("/tasks/board/?scope=nobody").status_code == 400
+    assert client_for(giver).get("/tasks/board/?status=lost").status_code == 400
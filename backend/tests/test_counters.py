@@ -0,0 +1,72 @@
+import pytest
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from tasks.models import Purchase, StoreItem, Task
+from tasks.utils.counters import bump_counters
+from tasks.utils.user_cache import cache_user, get_cached_user
+
+User = get_user_model()
+
+@pytest.mark.django_db
+def test_counters_follow_events_and_rebuild_fixes_drift():
+    giver = User.objects.create_user(username="giver", email="giver@example.com", password="pass")
+    worker = User.objects.create_user(username="worker", email="worker@example.com", password="pass")
+    done = Task.objects.create(title="Done", giver=giver, assignee=worker, status="moderation",
+                               exp_earned=30, honor_earned=4, time_in_work=1.5)
+    flop = Task.objects.create(title="Flop", giver=giver, assignee=worker, status="not_moderated")
+
+    client = APIClient()
+    client.force_authenticate(giver)
+    assert client.post(f"/tasks/{done.id}/mark_completed/").status_code == 200
+    assert client.post(f"/tasks/{flop.id}/mark_failed/").status_code == 200
+    assert client.post(f"/tasks/{done.id}/submit_feedback/", {"rating": 4, "comment": "ok"}).status_code == 200
+    assert client.post(f"/auth/public-profile/{worker.id}/comments/", {"text": "Nice", "profile": worker.id, "profile_id": worker.id}).status_code == 201
+
+    worker.refresh_from_db()
+    assert (worker.exp, worker.honor) == (30, 4)
+    assert (worker.tasks_completed, worker.tasks_failed, worker.comment_count) == (1, 1, 1)
+    assert (worker.feedback_count, worker.average_rating, worker.time_worked) == (1, 4.0, 1.5)
+
+    profile = client.get(f"/auth/public-profile/{worker.id}/").json()
+    assert profile["tasks_completed"] == 1 and profile["average_rating"] == 4.0
+
+    # Counters are read-only through the profile endpoint
+    client.force_authenticate(worker)
+    response = client.put("/auth/profile/", {"tasks_completed": 99}, format="json")
+    assert response.status_code == 200 and response.data["tasks_completed"] == 1
+    worker.refresh_from_db()
+    assert worker.tasks_completed == 1
+
+    User.objects.filter(id=worker.id).update(tasks_completed=7, comment_count=0, time_worked=0)
+    call_command("rebuild_counters", "--chunk-size", "1")
+    worker.refresh_from_db()
+    assert (worker.tasks_completed, worker.comment_count, worker.time_worked) == (1, 1, 1.5)
+
+@pytest.mark.django_db(transaction=True)
+def test_bumped_user_is_invalidated_again_on_commit():
+    worker = User.objects.create_user(username="worker", email="worker@example.com", password="pass")
+    with transaction.atomic():
+        bump_counters(worker.id, exp=10)
+        # Another request reads and caches the committed (old) row before this transaction ends
+        _, stamp = get_cached_user(worker.id)
+        cache_user(User.objects.get(id=worker.id), stamp)
+    assert get_cached_user(worker.id)[0] is None
+
+@pytest.mark.django_db
+def test_cached_request_user_does_not_write_back_stale_columns():
+    worker = User.objects.create_user(username="worker", email="worker@example.com", password="pass", honor=10)
+    item = StoreItem.objects.create(name="Badge", cost=8)
+    client = APIClient()
+    client.force_authenticate(worker)  # `worker` stands in for a cached request.user
+
+    bump_counters(worker.id, exp=50, honor=5, tasks_completed=1)  # awarded meanwhile (another worker)
+    assert client.put("/auth/profile/", {"about_me": "hi"}, format="json").status_code == 200
+    assert client.post("/purchases/buy/", {"item_id": item.id}).status_code == 201
+    response = client.post("/purchases/buy/", {"item_id": item.id})
+    assert response.status_code == 400 and response.data == {"non_field_errors": ["Not enough Honor Points."]}
+
+    worker.refresh_from_db()
+    assert (worker.about_me, worker.exp, worker.honor, worker.tasks_completed) == ("hi", 50, 7, 1)
+    assert Purchase.objects.filter(user=worker).count() == 1
@@ -0,0 +1,90 @@
+import pytest
+from django.conf import settings
+from django.test import RequestFactory, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from tasks.db_router import PrimaryReplicaRouter
+from tasks.middleware import db_routing
+from tasks.middleware.db_routing import ReplicaRoutingMiddleware
+from tasks.models import Task
+
+User = get_user_model()
+router = PrimaryReplicaRouter()
+
+def routed(method, write=False, cookies=None, **headers):
+    """Run a request through the middleware; report where a read inside it would go, and the response."""
+    seen = []
+    def view(request):
+        if write:
+            router.db_for_write(Task)
+        seen.append(router.db_for_read(Task))
+        return HttpResponse()
+    request = RequestFactory().generic(method, "/tasks/", **headers)
+    request.COOKIES.update(cookies or {})
+    response = ReplicaRoutingMiddleware(view)(request)
+    return seen[0], {k: m.value for k, m in response.cookies.items()}
+
+@override_settings(DATABASE_REPLICA_ALIAS="replica")
+def test_router_uses_replica_for_safe_reads_until_client_writes():
+    assert routed("GET") == ("replica", {})
+    where, cookies = routed("POST")  # anonymous writes pin too
+    assert where == "default" and cookies == {"db_primary": "1"}
+    # Pinned to the primary after its write; other clients are not
+    assert routed("GET", cookies=cookies)[0] == "default"
+    assert routed("GET")[0] == "replica"
+    # A write during a GET sends the rest of that request to the primary
+    assert routed("GET", write=True) == ("default", cookies)
+    assert router.db_for_read(Task) == "default"  # outside a request
+
+@override_settings(DATABASE_REPLICA_ALIAS="replica")
+def test_user_stays_pinned_across_token_refresh():
+    user = User(id=42, username="writer")
+    first, refreshed = (f"Bearer {AccessToken.for_user(user)}" for _ in range(2))
+    assert first != refreshed
+    assert routed("GET", HTTP_AUTHORIZATION=first)[0] == "replica"
+    assert routed("POST", HTTP_AUTHORIZATION=first)[0] == "default"
+    assert routed("GET", HTTP_AUTHORIZATION=refreshed)[0] == "default"  # no cookie sent back
+    assert routed("GET", HTTP_AUTHORIZATION="Bearer forged")[0] == "replica"
+
+@override_settings(DATABASE_REPLICA_ALIAS="replica")
+@pytest.mark.django_db
+def test_register_then_profile_reads_the_primary(monkeypatch):
+    replica_safe = []
+    def begin_request(use_replica):
+        replica_safe.append(use_replica)
+        return begin(use_replica)
+    begin = db_routing.begin_request
+    monkeypatch.setattr(db_routing, "begin_request", begin_request)
+
+    client = APIClient()
+    assert client.post("/auth/register/", {
+        "username": "fresh", "email": "fresh@example.com", "password": "TestPass123",
+        "password2": "TestPass123", "first_name": "Fresh", "last_name": "User",
+    }).status_code == 201
+    token = client.post("/auth/jwt/create/", {"username": "fresh", "password": "TestPass123"}).data["access"]
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    assert client.get("/auth/profile/").data["username"] == "fresh"
+    assert replica_safe == [False, False, False]
+
+    client.cookies.clear()  # once the pin expires, reads go back to the replica
+    client.get("/auth/profile/")
+    assert replica_safe[-1] is True
+
+@pytest.mark.skipif("replica" not in settings.DATABASES, reason="run with --ds=core.settings.local_replica")
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_read_your_writes_with_sqlite_primary_and_replica():
+    user = User.objects.create_user(username="writer", email="writer@example.com", password="pass")
+    User.objects.using("replica").create(id=user.id, username="writer", email="writer@example.com", password="x")
+
+    writer, other = APIClient(), APIClient()
+    writer.credentials(HTTP_AUTHORIZATION="Bearer writer")
+    other.credentials(HTTP_AUTHORIZATION="Bearer other")
+    writer.force_authenticate(user)
+    other.force_authenticate(user)
+
+    assert writer.post("/tasks/", {"title": "Fresh"}, format="json").status_code == 201
+    # The stand-in replica never receives the row; only the writer is pinned to the primary
+    assert [t["title"] for t in writer.get("/tasks/").json()] == ["Fresh"]
+    assert other.get("/tasks/").json() == []
@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tasks.models import Notification, Task, Tombstone
+from tasks.utils.delta import encode_cursor
+from tasks.utils.purge import purge_deleted
+from tasks.utils.retention import run_retention
+
+User = get_user_model()
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("no_overlap")]
+
+
+@pytest.fixture
+def no_overlap(settings):
+    settings.DELTA_SYNC_OVERLAP_SECONDS = 0
+
+
+def test_tasks_since_cursor(client, user):
+    kept, edited, removed = (Task.objects.create(title=t, giver=user) for t in ("kept", "edited", "removed"))
+    start = client.get("/tasks/?since=0").json()
+    assert {t["id"] for t in start["results"]} == {kept.id, edited.id, removed.id}
+    assert start["deleted"] == []
+
+    edited.title = "edited again"
+    edited.save()
+    added = Task.objects.create(title="added", giver=user)
+    client.delete(f"/tasks/{removed.id}/")
+    body = client.get(f"/tasks/?since={start['cursor']}").json()
+
+    assert [t["id"] for t in body["results"]] == [added.id, edited.id]
+    assert body["results"][1]["title"] == "edited again"
+    assert body["deleted"] == [removed.id]
+    assert client.get(f"/tasks/?since={body['cursor']}").json()["results"] == []
+
+
+def test_notifications_since_cursor(client, user):
+    other = User.objects.create_user(username="other", email="other@example.com", password="pass")
+    first = Notification.objects.create(user=user, title="one", message="m")
+    gone = Notification.objects.create(user=user, title="two", message="m")
+    theirs = Notification.objects.create(user=other, title="theirs", message="m")
+    cursor = client.get("/notifications/?since=0").json()["cursor"]
+
+    client.post("/notifications/mark_all_read/")
+    client.delete(f"/notifications/{gone.id}/")
+    Tombstone.record(Tombstone.NOTIFICATION, [(theirs.id, other.id)])
+    body = client.get(f"/notifications/?since={cursor}").json()
+
+    assert [(n["id"], n["is_read"]) for n in body["results"]] == [(first.id, True)]
+    assert body["deleted"] == [gone.id]
+
+
+def test_retention_and_purge_leave_tombstones(client, user):
+    old = timezone.now() - timedelta(days=400)
+    archived = Task.objects.create(title="archived", giver=user, status="completed")
+    purged = Task.objects.create(title="purged", giver=user)
+    note = Notification.objects.create(user=user, title="old", message="m", is_read=True)
+    Task.objects.filter(id=archived.id).update(updated_at=old)
+    Notification.objects.filter(id=note.id).update(created_at=old)
+    cursor = client.get("/tasks/?since=0").json()["cursor"]
+
+    purged.soft_delete()
+    run_retention(only=["tasks", "notifications"], pause=0)
+    purge_deleted(pause=0)
+
+    assert client.get(f"/tasks/?since={cursor}").json()["deleted"] == sorted([archived.id, purged.id])
+    assert client.get(f"/notifications/?since={cursor}").json()["deleted"] == [note.id]
+
+
+def test_purged_users_tasks_reach_current_cursors(client, user):
+    worker = User.objects.create_user(username="leaver", email="leaver@example.com", password="pass")
+    worker.soft_delete()
+    User.all_objects.filter(id=worker.id).update(deleted_at=timezone.now() - timedelta(days=2))
+    task = Task.objects.create(title="left behind", giver=user, assignee_id=worker.id)
+    notification = Notification.objects.create(user=user, task=task, title="t", message="m")
+    cursor = client.get("/notifications/?since=0").json()["cursor"]
+
+    purge_deleted(pause=0, grace=timedelta(days=1))
+
+    assert client.get(f"/tasks/?since={cursor}").json()["deleted"] == [task.id]
+    body = client.get(f"/notifications/?since={cursor}").json()
+    assert [(n["id"], n["task"]) for n in body["results"]] == [(notification.id, None)]
+
+
+def test_bad_and_expired_cursors(client, settings):
+    assert client.get("/tasks/?since=yesterday").status_code == 400
+    expired = encode_cursor(timezone.now() - timedelta(days=settings.RETENTION_POLICIES["tombstones"]["days"] + 1))
+    response = client.get(f"/notifications/?since={expired}")
+    assert response.status_code == 410
+    assert response.json()["detail"].startswith("Sync cursor is older")
+
+
+def test_async_views_answer_deltas(client, user):
+    task = Task.objects.create(title="async", giver=user)
+    cursor = encode_cursor(timezone.now() - timedelta(minutes=1))
+    Task.objects.filter(id=task.id).update(deleted_at=timezone.now())
+    auth = {"headers": {"Authorization": f"Bearer {AccessToken.for_user(user)}"}}
+
+    with override_settings(ROOT_URLCONF="core.asgi_urls"):
+        async_client = AsyncClient()
+        tasks = async_to_sync(async_client.get)(f"/tasks/?since={cursor}", **auth).json()
+        notifications = async_to_sync(async_client.get)(f"/notifications/?since={cursor}", **auth).json()
+        invalid = async_to_sync(async_client.get)("/tasks/?since=x", **auth)
+
+    assert tasks["results"] == [] and tasks["deleted"] == [task.id]
+    assert set(notifications) == {"results", "deleted", "cursor"}
+    assert invalid.status_code == 400
+    assert invalid.content == client.get("/tasks/?since=x").content
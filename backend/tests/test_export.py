@@ -0,0 +1,36 @@
+import json
+import pytest
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from tasks.models import Task, TaskStatusLog
+
+User = get_user_model()
+
+@pytest.mark.django_db
+def test_export_tasks_and_status_logs():
+    admin = User.objects.create_user(username="boss", email="boss@example.com", password="pass", role="admin")
+    task = Task.objects.create(title="Payroll, Q3", giver=admin)
+    TaskStatusLog.objects.create(task=task, user=admin, old_status="not_in_work", new_status="in_work")
+
+    client = APIClient()
+    client.force_authenticate(admin)
+
+    response = client.get('/export/tasks.csv')
+    assert response.status_code == 200
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert lines[0].startswith("id,title,status")
+    assert '"Payroll, Q3"' in lines[1]
+
+    response = client.get('/export/status_logs.ndjson', {"from": "2000-01-01"})
+    rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+    assert rows[0]["new_status"] == "in_work"
+
+    response = client.get('/export/status_logs.ndjson', {"to": "2000-01-01"})
+    assert b"".join(response.streaming_content) == b""
+
+@pytest.mark.django_db
+def test_export_requires_admin():
+    user = User.objects.create_user(username="worker", email="worker@example.com", password="pass")
+    client = APIClient()
+    client.force_authenticate(user)
+    assert client.get('/export/tasks.csv').status_code == 403
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import serializers
+
+from tasks.models import Notification, Task
+from tasks.serializers import TaskSerializer, UserHallOfFameSerializer
+from tasks.utils.fastread import ReadPlan
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    user = User.objects.create_user(username="reader", email="reader@example.com", password="pass",
+                                    first_name="Zoë", level=3)
+    other = User.objects.create_user(username="other", email="other@example.com", password="pass")
+    User.objects.filter(pk=other.pk).update(avatar="avatars/other.png", feedback_count=3, feedback_rating_sum=14,
+                                            time_worked=2.7e-05, level=5)
+    now = timezone.now()
+    Task.objects.create(title="Unassigned", description="x" * 150, giver=user,
+                        deadline=now + timedelta(days=2), approx_time=0.1)
+    Task.objects.create(title="Ünïcödé ✓", description="", giver=other, assignee=user, status="in_work",
+                        files="task_files/spec.pdf", priority="high")
+    Task.objects.create(title="Plain", description="short", giver=user, assignee=other, status="completed")
+    Notification.objects.create(user=user, title="Hi", message="Ready — go", type="success", is_read=True)
+    Notification.objects.create(user=user, title="Second", message="line\u2028 and \u2029")
+    return user
+
+
+@pytest.mark.parametrize("url", [
+    "/tasks/?timestamps=exact",
+    "/tasks/?timestamps=none",
+    "/tasks/?fields=id,title,assignee,status_display&expand=assignee&timestamps=exact",
+    "/tasks/?fields=id,giver,files",
+    "/notifications/",
+    "/notifications/?fields=id,message",
+    "/hall-of-fame/",
+])
+@pytest.mark.django_db
+def test_fast_path_is_byte_identical(client, url):
+    fast = client.get(url)
+    with override_settings(FAST_READ_LISTS=False):
+        slow = client.get(url)
+
+    assert fast.status_code == slow.status_code == 200
+    assert fast["Content-Type"] == slow["Content-Type"]
+    assert fast.content == slow.content
+
+
+@pytest.mark.django_db
+def test_fast_path_reads_rows_with_one_query(client):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get("/tasks/?timestamps=exact")
+    task_queries = [q["sql"] for q in ctx.captured_queries if '"tasks_task"' in q["sql"]]
+
+    assert len(task_queries) == 1
+    assert "LEFT OUTER JOIN" in task_queries[0]
+
+
+@pytest.mark.django_db
+def test_browsable_api_and_indent_use_the_serializer(client):
+    assert client.get("/tasks/", HTTP_ACCEPT="application/json; indent=2").content.startswith(b"[\n")
+    assert b"<html" in client.get("/tasks/", HTTP_ACCEPT="text/html").content
+
+
+def test_unsupported_fields_fall_back():
+    class Extra(TaskSerializer):
+        extra = serializers.SerializerMethodField()
+
+    assert ReadPlan.for_serializer(Extra, {}) is None
+    assert ReadPlan.for_serializer(UserHallOfFameSerializer, {}) is not None
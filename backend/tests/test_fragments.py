@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+from tasks.utils.fragments import LRUCache, fragment_cache, fragment_key
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    user = User.objects.create_user(username="giver", email="giver@example.com", password="pass", first_name="Ann")
+    worker = User.objects.create_user(username="worker", email="worker@example.com", password="pass")
+    for i in range(6):
+        Task.objects.create(title=f"Task {i}", description="d" * (40 * i), giver=user,
+                            assignee=worker if i % 2 else None, files="task_files/a.pdf" if i == 3 else "",
+                            deadline=timezone.now() + timedelta(days=i))
+    return user
+
+
+def task_queries(ctx):
+    return [q["sql"] for q in ctx.captured_queries if 'FROM "tasks_task"' in q["sql"]]
+
+
+@pytest.mark.parametrize("url", ["/tasks/?timestamps=exact", "/tasks/?timestamps=none"])
+@pytest.mark.django_db
+def test_cached_lists_are_byte_identical(client, url):
+    task = Task.objects.first()
+    cold = client.get(url)
+    warm = client.get(url)
+    detail = client.get(f"/tasks/{task.id}/?timestamps=exact")
+    with override_settings(TASK_FRAGMENT_CACHE_SIZE=0):
+        uncached = client.get(url)
+        uncached_detail = client.get(f"/tasks/{task.id}/?timestamps=exact")
+    with override_settings(FAST_READ_LISTS=False):
+        serializer = client.get(url)
+
+    assert cold.content == warm.content == uncached.content == serializer.content
+    assert detail.content == uncached_detail.content
+
+
+@pytest.mark.django_db
+def test_warm_list_reads_only_volatile_columns(client):
+    client.get("/tasks/")
+    with CaptureQueriesContext(connection) as ctx:
+        client.get("/tasks/")
+    queries = task_queries(ctx)
+
+    assert len(queries) == 1
+    assert '"tasks_task"."description"' not in queries[0]
+
+
+@pytest.mark.django_db
+def test_serializer_reuses_fragments(user, monkeypatch):
+    context = {"request": RequestFactory().get("/")}
+    first = TaskSerializer(Task.objects.order_by("id"), many=True, context=context).data
+    calls = []
+    monkeypatch.setattr(TaskSerializer, "get_status_display", lambda self, obj: calls.append(obj.id))
+
+    again = TaskSerializer(Task.objects.order_by("id"), many=True, context={"request": RequestFactory().get("/")}).data
+
+    assert calls == []
+    assert again == first
+
+
+@pytest.mark.django_db
+def test_saved_task_gets_a_new_fragment(client):
+    task = Task.objects.order_by("id").first()
+    client.get("/tasks/")
+    old_key = fragment_key(TaskSerializer, task.pk, task.updated_at)
+    task.title = "Renamed"
+    task.save()
+
+    titles = [t["title"] for t in client.get("/tasks/").json()]
+
+    assert "Renamed" in titles
+    assert fragment_key(TaskSerializer, task.pk, task.updated_at) != old_key
+    assert client.get(f"/tasks/{task.id}/").json()["title"] == "Renamed"
+
+
+@pytest.mark.django_db
+def test_user_changes_show_through_cached_fragments(client, user):
+    client.get("/tasks/")
+    user.first_name = "Beth"
+    user.save()
+
+    assert {t["giver"]["first_name"] for t in client.get("/tasks/").json()} == {"Beth"}
+    with override_settings(FAST_READ_LISTS=False):
+        assert {t["giver"]["first_name"] for t in client.get("/tasks/").json()} == {"Beth"}
+
+
+@pytest.mark.django_db
+def test_sparse_responses_bypass_the_cache(client):
+    fragment_cache().clear()
+    client.get("/tasks/?fields=id,title")
+    with override_settings(FAST_READ_LISTS=False):
+        client.get("/tasks/?fields=id,title")
+
+    assert len(fragment_cache().local) == 0
+
+
+@pytest.mark.django_db
+def test_shared_tier(client):
+    task = Task.objects.order_by("id").first()
+    with override_settings(TASK_FRAGMENT_CACHE_SIZE=0, TASK_FRAGMENT_CACHE_ALIAS="default"):
+        cold = client.get("/tasks/").content
+        key = fragment_key(TaskSerializer, task.pk, task.updated_at)
+        assert cache.get(key)["title"] == task.title
+        assert client.get("/tasks/").content == cold
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(2)
+    lru.set_many({"a": 1, "b": 2})
+    lru.get_many(["a"])
+    lru.set_many({"c": 3})
+
+    assert lru.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+    assert len(lru) == 2
@@ -0,0 +1,80 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from tasks.models import Task, TaskStatusLog
+
+User = get_user_model()
+
+@pytest.mark.django_db
+def test_import_users_command_reports_bad_rows(tmp_path):
+    User.objects.create_user(username="taken", email="taken@example.com", password="pass")
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "username,email,password,role\n"
+        "alice,alice@example.com,Secret123,user\n"
+        "bob,bob@example.com,,admin\n"
+        "taken,other@example.com,,user\n"
+        "carol,not-an-email,,user\n"
+    )
+
+    call_command("import_data", "users", str(path), "--workers", "1")
+
+    alice = User.objects.get(username="alice")
+    bob = User.objects.get(username="bob")
+    assert alice.check_password("Secret123")
+    assert not bob.has_usable_password() and bob.default_password and bob.role == "admin"
+    assert not User.objects.filter(username="carol").exists()
+
+@pytest.mark.django_db
+def test_admin_import_tasks_endpoint():
+    admin = User.objects.create_user(username="boss", email="boss@example.com", password="pass", is_staff=True)
+    User.objects.create_user(username="worker", email="worker@example.com", password="pass")
+    upload = SimpleUploadedFile("tasks.jsonl", (
+        b'{"title": "Imported", "giver": "boss", "assignee": "worker", "status": "in_work"}\n'
+        b'{"title": "Orphan", "giver": "nobody"}\n'
+        b'not json\n'
+    ))
+
+    client = APIClient()
+    client.force_authenticate(admin)
+    response = client.post('/admin/import/', {"kind": "tasks", "file": upload}, format="multipart")
+
+    assert response.status_code == 201
+    assert response.data["created"] == 1
+    assert [e["row"] for e in response.data["errors"]] == [2, 3]
+    task = Task.objects.get(title="Imported")
+    assert TaskStatusLog.objects.filter(task=task, new_status="in_work").count() == 1
+
+@pytest.mark.django_db
+def test_admin_import_users_hashes_in_process(monkeypatch, settings):
+    settings.IMPORT_HASH_WORKERS = 4
+    pools = []
+    monkeypatch.setattr("tasks.utils.importer.hashing_pool", lambda workers: pools.append(workers))
+    admin = User.objects.create_user(username="boss", email="boss@example.com", password="pass", is_staff=True)
+    upload = SimpleUploadedFile("users.csv", b"username,email,password\nnew,new@example.com,Secret123\n")
+
+    client = APIClient()
+    client.force_authenticate(admin)
+    response = client.post('/admin/import/', {"kind": "users", "file": upload}, format="multipart")
+
+    assert response.data["created"] == 1 and pools == [1]
+    assert User.objects.get(username="new").check_password("Secret123")
+
+@pytest.mark.django_db
+def test_admin_import_users_rejects_taken_emails_and_bad_encoding():
+    admin = User.objects.create_user(username="boss", email="boss@example.com", password="pass", is_staff=True)
+    User.objects.create_user(username="mixed", email="Mixed@Example.com", password="pass")
+    client = APIClient()
+    client.force_authenticate(admin)
+
+    upload = SimpleUploadedFile("users.csv", b"username,email\nclash,MIXED@example.com\n")
+    response = client.post('/admin/import/', {"kind": "users", "file": upload}, format="multipart")
+    assert response.data["created"] == 0
+    assert response.data["errors"] == [{"row": 2, "errors": {"email": "A user with that email already exists."}}]
+
+    upload = SimpleUploadedFile("users.csv", b"username,email\nfine,fine@example.com\nlatin,caf\xe9@example.com\n")
+    response = client.post('/admin/import/', {"kind": "users", "file": upload}, format="multipart")
+    assert response.status_code == 400 and response.data == {"error": "File must be UTF-8 encoded"}
+    assert not User.objects.filter(username="fine").exists()
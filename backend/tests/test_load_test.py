@@ -0,0 +1,55 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from tasks.models import Purchase, Task
+from tasks.utils.loadgen import percentile
+
+User = get_user_model()
+
+LIFECYCLE_ENDPOINTS = [
+    "POST /auth/register/", "POST /auth/jwt/create/", "POST /tasks/",
+    "POST /tasks/{id}/update_status/", "POST /tasks/{id}/mark_done/",
+    "POST /tasks/{id}/start_moderation/", "POST /tasks/{id}/mark_completed/",
+    "GET /notifications/", "POST /purchases/buy/", "GET /hall-of-fame/",
+]
+
+
+@pytest.fixture
+def unthrottled(settings):
+    settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}
+
+
+def test_percentile():
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile([], 95) == 0.0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_load_test_replays_the_lifecycle(live_server, unthrottled):
+    out = StringIO()
+    call_command("load_test", base_url=live_server.url, users=2, iterations=2, stdout=out)
+    report = out.getvalue()
+
+    for endpoint in LIFECYCLE_ENDPOINTS:
+        assert endpoint in report
+    assert "4 completed" in report
+    assert "failed step" not in report
+
+    workers = User.objects.filter(username__startswith="loadtest-")
+    assert workers.count() == 2
+    assert Task.objects.filter(assignee__in=workers, status="completed").count() == 4
+    assert Purchase.objects.filter(user__in=workers).count() == 4
+    assert all(user.tasks_completed == 2 for user in workers)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_load_test_cleanup_removes_generated_accounts(live_server, unthrottled):
+    call_command("load_test", base_url=live_server.url, users=1, iterations=1, cleanup=True, stdout=StringIO())
+
+    assert not User.all_objects.filter(username__startswith="loadtest-").exists()
+    assert not Task.all_objects.exists()
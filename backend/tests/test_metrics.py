@@ -0,0 +1,77 @@
+import pytest
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from tasks.models import Task
+from tasks.utils.metrics import reset_metrics
+
+User = get_user_model()
+
+@pytest.mark.django_db
+def test_requests_and_commands_show_up_in_metrics(tmp_path):
+    reset_metrics()
+    user = User.objects.create_user(username="worker", email="worker@example.com", password="pass")
+    Task.objects.create(title="Measured", giver=user)
+
+    client = APIClient()
+    client.force_authenticate(user)
+    with override_settings(SERVER_TIMING=True, METRICS_TEXTFILE_DIR=str(tmp_path), METRICS_TOKEN="scrape"):
+        response = client.get("/tasks/")
+        assert response.status_code == 200
+        timing = response["Server-Timing"]
+        assert timing.startswith("db;dur=") and "queries" in timing and "serialize;dur=" in timing
+
+        call_command("reset_online")
+        assert (tmp_path / "command_reset_online.prom").exists()
+
+        assert client.get("/metrics").status_code == 401
+        body = client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape").content.decode()
+
+    assert 'gtm_http_request_duration_seconds_count{view="tasks-list",method="GET",status="200"} 1' in body
+    assert 'gtm_http_request_db_queries_bucket{view="tasks-list",le="+Inf"} 1' in body
+    assert 'gtm_http_request_serializer_duration_seconds_count{view="tasks-list"} 1' in body
+    assert 'gtm_command_last_success{command="reset_online"} 1' in body
+    assert 'gtm_throttle_requests_total{scope="read",outcome="allowed"}' in body
+
+@pytest.mark.django_db
+def test_clean_orphaned_avatars_reports_its_run(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.METRICS_TEXTFILE_DIR = str(tmp_path / "metrics")
+    avatars = tmp_path / "media" / "avatars"
+    avatars.mkdir(parents=True)
+    (avatars / "kept.png").write_bytes(b"x")
+    (avatars / "orphan.png").write_bytes(b"x")
+    User.objects.create_user(username="pictured", email="pictured@example.com", password="pass", avatar="avatars/kept.png")
+
+    call_command("clean_orphaned_avatars")
+
+    assert sorted(p.name for p in avatars.iterdir()) == ["kept.png"]
+    prom = (tmp_path / "metrics" / "command_clean_orphaned_avatars.prom").read_text()
+    assert 'gtm_command_last_success{command="clean_orphaned_avatars"} 1' in prom
+    assert 'gtm_command_last_affected{command="clean_orphaned_avatars"} 1' in prom
+
+@pytest.mark.django_db
+def test_metrics_without_token_are_staff_only(settings):
+    settings.METRICS_TOKEN = ""
+    client = APIClient()
+    assert client.get("/metrics").status_code == 401
+
+    worker = User.objects.create_user(username="worker", email="worker@example.com", password="pass")
+    client.force_login(worker)
+    assert client.get("/metrics").status_code == 401
+
+    staff = User.objects.create_user(username="staff", email="staff@example.com", password="pass", is_staff=True)
+    client.force_login(staff)
+    assert client.get("/metrics").status_code == 200
+
+@pytest.mark.django_db
+def test_reset_online_commands_report_separately(tmp_path, settings):
+    settings.METRICS_TEXTFILE_DIR = str(tmp_path / "metrics")
+    settings.BASE_DIR = tmp_path
+    call_command("reset_online")
+    call_command("reset_online_with_logging")
+    assert sorted(p.name for p in (tmp_path / "metrics").iterdir()) == [
+        "command_reset_online.prom", "command_reset_online_with_logging.prom",
+    ]
@@ -0,0 +1,124 @@
+import io
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from tasks.models import Notification, PendingNotification, Task, TaskStatusLog
+from tasks.utils import notify as notify_module
+from tasks.utils.notify import flush_digests, notify
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def giver(db):
+    return User.objects.create_user(username="giver", email="giver@example.com", password="pass")
+
+
+@pytest.fixture
+def worker(db):
+    return User.objects.create_user(username="worker", email="worker@example.com", password="pass")
+
+
+def move(task, user, *statuses):
+    for status in statuses:
+        TaskStatusLog.objects.create(task=task, user=user, old_status=task.status, new_status=status)
+        task.status = status
+
+
+def test_status_changes_coalesce_per_task_and_recipient(giver, worker):
+    task = Task.objects.create(title="Lifecycle", giver=giver, assignee=worker)
+    move(task, worker, "in_work", "not_moderated", "moderation", "completed")
+
+    rows = Notification.objects.filter(task=task).order_by("user_id")
+    assert [(n.user_id, n.count) for n in rows] == [(giver.id, 4), (worker.id, 5)]
+    assert all(n.message == "Status of task 'Lifecycle' changed to 'completed'." for n in rows)
+
+
+def test_read_notification_starts_a_new_one(giver, worker):
+    task = Task.objects.create(title="Reread", giver=giver, assignee=worker)
+    move(task, worker, "in_work")
+    Notification.objects.filter(user=worker).update(is_read=True)
+    move(task, worker, "not_moderated")
+
+    assert list(Notification.objects.filter(user=worker).order_by("id").values_list("is_read", "count")) == [
+        (True, 2), (False, 1),
+    ]
+
+
+def test_digest_users_get_one_summary(giver, worker, settings, tmp_path):
+    settings.METRICS_TEXTFILE_DIR = str(tmp_path)
+    worker.notification_digest = True
+    worker.save()
+    first = Task.objects.create(title="First", giver=giver, assignee=worker)
+    second = Task.objects.create(title="Second", giver=giver, assignee=worker)
+    move(first, giver, "in_work", "not_moderated")
+    move(second, giver, "in_work")
+    notify(worker, "Deadline", "Soon", type="warning", task=second)
+
+    assert PendingNotification.objects.filter(user=worker).count() == 2
+    assert Notification.objects.filter(user=worker).count() == 1  # warnings are never held
+
+    out = io.StringIO()
+    call_command("flush_notification_digests", stdout=out)
+    assert out.getvalue().strip() == "Sent 1 notification digest(s)."
+    assert not PendingNotification.objects.exists()
+    digest = Notification.objects.get(user=worker, title__startswith="Digest")
+    assert digest.title == "Digest: 5 updates"
+    assert digest.message.splitlines() == [
+        "- Task Status Updated: Status of task 'Second' changed to 'in_work'. (2 updates)",
+        "- Task Status Updated: Status of task 'First' changed to 'not_moderated'. (3 updates)",
+    ]
+    assert flush_digests() == 0
+
+
+def test_digest_caps_listed_items(giver, worker, settings):
+    settings.NOTIFICATION_DIGEST_MAX_ITEMS = 2
+    worker.notification_digest = True
+    worker.save()
+    for title in ("a", "b", "c"):
+        notify(worker, title, "m", task=Task.objects.create(title=title, giver=giver))
+
+    flush_digests()
+    lines = Notification.objects.get(user=worker).message.splitlines()
+    assert lines == ["- c: m", "- b: m", "...and 1 more."]
+
+
+def test_api_cannot_break_one_unread_row_per_task(giver, worker):
+    task = Task.objects.create(title="Guarded", giver=giver, assignee=worker)
+    client = APIClient()
+    client.force_authenticate(worker)
+
+    created = client.post("/notifications/", {"title": "Mine", "message": "m", "task": task.id, "count": 9})
+    assert created.status_code == 201
+    assert (created.data["task"], created.data["count"]) == (None, 1)
+
+    read = Notification.objects.get(user=worker, task=task)
+    read.is_read = True
+    read.save()
+    move(task, giver, "in_work")
+    response = client.patch(f"/notifications/{read.id}/", {"is_read": False}, format="json")
+    assert response.status_code == 400
+    assert "is_read" in response.data
+
+    Notification.objects.filter(user=worker, task=task, is_read=False).delete()
+    assert client.patch(f"/notifications/{read.id}/", {"is_read": False}, format="json").status_code == 200
+
+
+def test_losing_the_insert_race_merges(giver, worker, monkeypatch):
+    task = Task.objects.create(title="Raced", giver=giver, assignee=worker)
+    merge, calls = notify_module._merge, []
+
+    def merge_after_race(*args):
+        calls.append(args)
+        return 0 if len(calls) == 1 else merge(*args)  # the other request's row lands after our lookup
+
+    monkeypatch.setattr(notify_module, "_merge", merge_after_race)
+    notify(worker, "Task Status Updated", "raced", task=task)
+
+    row = Notification.objects.get(user=worker, task=task)
+    assert (row.count, row.message, len(calls)) == (2, "raced", 2)
@@ -0,0 +1,29 @@
+import pytest
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from tasks.models import Task, TaskFeedback, UserComment
+
+User = get_user_model()
+
+@pytest.mark.django_db
+def test_public_profile_bundle_is_cached_and_invalidated(django_assert_num_queries):
+    worker = User.objects.create_user(username="worker", email="worker@example.com", password="pass")
+    fan = User.objects.create_user(username="fan", email="fan@example.com", password="pass")
+    for i in range(7):
+        task = Task.objects.create(title=f"T{i}", giver=fan, assignee=worker, status="completed")
+        TaskFeedback.objects.create(task=task, giver=fan, assignee=worker, rating=5)
+        UserComment.objects.create(user=fan, profile=worker, text=f"nice {i}")
+
+    client = APIClient()
+    url = f'/auth/public-profile/{worker.id}/bundle/'
+    with django_assert_num_queries(5):
+        data = client.get(url).data
+    assert data['profile']['username'] == 'worker'
+    assert data['testimonials']['count'] == 7 and len(data['testimonials']['results']) == 5
+    assert data['comments']['count'] == 7 and data['comments']['results'][0]['user']['username'] == 'fan'
+
+    with django_assert_num_queries(1):  # the user lookup only
+        assert client.get(url).data == data
+
+    UserComment.objects.create(user=fan, profile=worker, text="fresh")
+    assert client.get(url).data['comments']['count'] == 8
@@ -0,0 +1,237 @@
+"""
+Query budgets for every route in tasks/urls.py.
+
+Each case runs its request against a small and a larger seeded dataset and
+asserts that the number of SQL queries (a) does not grow with the data and
+(b) stays within the declared budget. Failures list the offending SQL.
+A route added to tasks/urls.py without a case here fails
+`test_every_route_has_a_budget`.
+"""
+import io
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+import tasks.urls
+from tasks.models import (
+    Task, TaskStatusLog, TaskComment, TaskFeedback, UserComment, Notification,
+    StoreItem, Purchase, ArchivedTask, ArchivedTaskStatusLog,
+)
+
+User = get_user_model()
+
+SMALL, LARGE = 2, 8
+PASSWORD = "pass"
+
+# ───────────────────────────────────────────────────────────
+# Seed data
+# ───────────────────────────────────────────────────────────
+
+def make_world():
+    hashed = make_password(PASSWORD)
+    world = SimpleNamespace(size=0, extra_users=[])
+    world.admin = User.objects.create(username="admin", email="admin@example.com", password=hashed,
+                                      role="admin", is_staff=True, honor=10_000)
+    world.worker = User.objects.create(username="worker", email="worker@example.com", password=hashed, honor=10_000)
+    world.task = Task.objects.create(title="Focus", giver=world.admin, assignee=world.worker, status="in_work")
+    world.archived = ArchivedTask.objects.create(
+        id=10_000_000, title="Archived focus", giver=world.admin, assignee=world.worker, status="completed",
+        priority="medium", difficulty="medium", created_at=timezone.now(), updated_at=timezone.now(),
+    )
+    world.item = StoreItem.objects.create(name="Focus item", cost=1)
+    world.notification = Notification.objects.create(user=world.worker, title="Focus", message="")
+    world.purchase = Purchase.objects.create(user=world.worker, item=world.item)
+    return world
+
+
+def grow(world, size):
+    """Add rows until every list the routes return holds `size` more entries."""
+    for i in range(world.size, size):
+        other = User.objects.create(username=f"user{i}", email=f"user{i}@example.com", password="!", exp=i)
+        world.extra_users.append(other)
+        done = Task.objects.create(title=f"Done {i}", giver=world.admin, assignee=world.worker, status="completed")
+        TaskFeedback.objects.create(task=done, giver=world.admin, assignee=world.worker, rating=4)
+        TaskStatusLog.objects.create(task=world.task, user=other, old_status="in_work", new_status="in_work")
+        TaskComment.objects.create(task=world.task, user=other, text=f"Comment {i}")
+        UserComment.objects.create(user=other, profile=world.worker, text=f"Hi {i}")
+        Notification.objects.create(user=world.worker, title=f"Note {i}", message="")
+        item = StoreItem.objects.create(name=f"Item {i}", cost=1)
+        Purchase.objects.create(user=world.worker, item=item)
+        ArchivedTask.objects.create(
+            id=20_000_000 + i, title=f"Archived {i}", giver=world.admin, assignee=world.worker,
+            status="completed", priority="low", difficulty="low",
+            created_at=timezone.now(), updated_at=timezone.now(),
+        )
+        ArchivedTaskStatusLog.objects.create(
+            id=30_000_000 + i, task=world.archived, user=other,
+            old_status="moderation", new_status="completed", timestamp=timezone.now(),
+        )
+    world.size = size
+
+
+def fresh_task(world, status):
+    return Task.objects.create(title=f"Fresh {status}", giver=world.admin, assignee=world.worker, status=status,
+                               exp_earned=10, honor_earned=2, time_in_work=1.0)
+
+# ───────────────────────────────────────────────────────────
+# Route cases: (route name, method, as user, budget, request builder)
+# A builder returns (path, data) or (path, data, format) and may create the
+# row it acts on, outside the measured block.
+# ───────────────────────────────────────────────────────────
+
+def csv_upload(n):
+    upload = io.BytesIO(f"username,email\nimported{n},imported{n}@example.com\n".encode())
+    upload.name = "users.csv"
+    return upload
+
+
+def avatar_to_delete(world):
+    # Skip User.save(): the file need not exist, the view only clears the field
+    User.objects.filter(pk=world.worker.pk).update(avatar="avatars/missing.png")
+    world.worker.avatar = "avatars/missing.png"
+    return "/auth/profile/delete_avatar/", None
+
+
+# (route name, method, user, budget, world -> (path, data[, format[, headers]]))
+CASES = [
+    ("register", "post", None, 4, lambda w: (
+        "/auth/register/",
+        {"username": f"new{w.size}", "email": f"new{w.size}@example.com", "password": "Secret123!", "password2": "Secret123!",
+         "first_name": "New", "last_name": "User"},
+    )),
+    ("profile", "get", "worker", 1, lambda w: ("/auth/profile/", None)),
+    ("profile", "put", "worker", 2, lambda w: ("/auth/profile/", {"about_me": f"Size {w.size}"})),
+    ("token_obtain_pair", "post", None, 3, lambda w: (
+        "/auth/jwt/create/", {"username": "worker", "password": PASSWORD})),
+    ("token_refresh", "post", None, 13, lambda w: (
+        "/auth/jwt/refresh/", {"refresh": str(RefreshToken.for_user(w.worker))})),
+    ("token_verify", "post", None, 1, lambda w: (
+        "/auth/jwt/verify/", {"token": str(RefreshToken.for_user(w.worker).access_token)})),
+    ("user-list", "get", "worker", 2, lambda w: ("/auth/users/", None)),
+    ("public-profile", "get", None, 1, lambda w: (f"/auth/public-profile/{w.worker.id}/", None)),
+    ("public-testimonials", "get", None, 1, lambda w: (f"/auth/public-profile/{w.worker.id}/testimonials/", None)),
+    ("public-comments", "get", None, 2, lambda w: (f"/auth/public-profile/{w.worker.id}/comments/", None)),
+    ("public-comments", "post", "admin", 6, lambda w: (
+        f"/auth/public-profile/{w.worker.id}/comments/", {"text": "Nice", "profile": w.worker.id, "profile_id": w.worker.id})),
+    ("public-profile-bundle", "get", None, 5, lambda w: (f"/auth/public-profile/{w.worker.id}/bundle/", None)),
+    ("task-comments", "get", "worker", 4, lambda w: (f"/tasks/{w.task.id}/comments/", None)),
+    ("task-comments", "post", "worker", 3, lambda w: (f"/tasks/{w.task.id}/comments/", {"text": "More"})),
+    ("delete-avatar", "post", "worker", 2, avatar_to_delete),
+    ("hall-of-fame", "get", None, 1, lambda w: ("/hall-of-fame/", None)),
+    ("admin-user-action", "post", "admin", 5, lambda w: (
+        "/admin/user-action/", {"action": "reset_exp", "user_ids": [u.id for u in w.extra_users]})),
+    ("admin-import", "post", "admin", 6, lambda w: (
+        "/admin/import/", {"kind": "users", "file": csv_upload(w.size)}, "multipart")),
+    ("admin-throttle-metrics", "get", "admin", 1, lambda w: ("/admin/throttle-metrics/", None)),
+    ("metrics", "get", None, 0, lambda w: ("/metrics", None, "json", {"HTTP_AUTHORIZATION": "Bearer scrape"})),
+    ("export-tasks", "get", "admin", 2, lambda w: ("/export/tasks.csv", None)),
+    ("export-status-logs", "get", "admin", 2, lambda w: ("/export/status_logs.ndjson", None)),
+    ("export-purchases", "get", "admin", 2, lambda w: ("/export/purchases.csv", None)),
+    ("tasks-list", "get", "worker", 2, lambda w: ("/tasks/", None)),
+    ("tasks-list", "post", "admin", 10, lambda w: ("/tasks/", {"title": "Created", "assignee_id": w.worker.id})),
+    ("tasks-detail", "get", "worker", 2, lambda w: (f"/tasks/{w.task.id}/", None)),
+    ("tasks-detail", "patch", "admin", 3, lambda w: (f"/tasks/{w.task.id}/", {"description": f"Size {w.size}"})),
+    ("tasks-detail", "delete", "admin", 4, lambda w: (f"/tasks/{fresh_task(w, 'in_work').id}/", None)),
+    ("tasks-board", "get", "worker", 3, lambda w: ("/tasks/board/?scope=assignee", None)),
+    ("tasks-board", "get", "worker", 3, lambda w: ("/tasks/board/?scope=assignee&fields=id,title", None)),
+    ("tasks-logs", "get", "worker", 4, lambda w: (f"/tasks/{w.task.id}/logs/", None)),
+    ("tasks-update-status", "post", "worker", 9, lambda w: (
+        f"/tasks/{fresh_task(w, 'in_work').id}/update_status/", {"status": "not_moderated"})),
+    ("tasks-mark-done", "post", "worker", 10, lambda w: (f"/tasks/{fresh_task(w, 'in_work').id}/mark_done/", None)),
+    ("tasks-start-moderation", "post", "admin", 9, lambda w: (
+        f"/tasks/{fresh_task(w, 'not_moderated').id}/start_moderation/", None)),
+    ("tasks-stop-moderation", "post", "admin", 9, lambda w: (
+        f"/tasks/{fresh_task(w, 'moderation').id}/stop_moderation/", None)),
+    ("tasks-return-to-assignee", "post", "admin", 9, lambda w: (
+        f"/tasks/{fresh_task(w, 'moderation').id}/return_to_assignee/", None)),
+    ("tasks-mark-completed", "post", "admin", 12, lambda w: (
+        f"/tasks/{fresh_task(w, 'moderation').id}/mark_completed/", None)),
+    ("tasks-mark-failed", "post", "admin", 12, lambda w: (
+        f"/tasks/{fresh_task(w, 'moderation').id}/mark_failed/", None)),
+    ("tasks-submit-feedback", "post", "admin", 10, lambda w: (
+        f"/tasks/{fresh_task(w, 'completed').id}/submit_feedback/", {"rating": 5, "comment": "Great"})),
+    ("archived-tasks-list", "get", "worker", 3, lambda w: ("/archive/tasks/", None)),
+    ("archived-tasks-detail", "get", "worker", 2, lambda w: (f"/archive/tasks/{w.archived.id}/", None)),
+    ("archived-tasks-logs", "get", "worker", 4, lambda w: (f"/archive/tasks/{w.archived.id}/logs/", None)),
+    ("notifications-list", "get", "worker", 2, lambda w: ("/notifications/", None)),
+    ("notifications-list", "post", "worker", 2, lambda w: ("/notifications/", {"title": "Self", "message": "note"})),
+    ("notifications-detail", "get", "worker", 2, lambda w: (f"/notifications/{w.notification.id}/", None)),
+    ("notifications-detail", "patch", "worker", 3, lambda w: (f"/notifications/{w.notification.id}/", {"is_read": True})),
+    ("notifications-mark-all-read", "post", "worker", 2, lambda w: ("/notifications/mark_all_read/", None)),
+    ("store-list", "get", "worker", 2, lambda w: ("/store/", None)),
+    ("store-detail", "get", "worker", 2, lambda w: (f"/store/{w.item.id}/", None)),
+    ("purchases-list", "get", "worker", 2, lambda w: ("/purchases/", None)),
+    ("purchases-detail", "get", "worker", 2, lambda w: (f"/purchases/{w.purchase.id}/", None)),
+    ("purchases-buy", "post", "worker", 6, lambda w: ("/purchases/buy/", {"item_id": w.item.id})),
+    ("api-root", "get", "worker", 1, lambda w: ("/", None)),
+]
+
+
+def route_names(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from route_names(pattern.url_patterns)
+        elif pattern.name:
+            yield pattern.name
+
+
+def test_every_route_has_a_budget():
+    missing = set(route_names(tasks.urls.urlpatterns)) - {name for name, *_ in CASES}
+    assert not missing, f"Declare query budgets for: {', '.join(sorted(missing))}"
+
+# ───────────────────────────────────────────────────────────
+# Measurement
+# ───────────────────────────────────────────────────────────
+
+def measure(world, method, as_user, build):
+    path, data, *rest = build(world)
+    fmt = rest[0] if rest else "json"
+    headers = rest[1] if len(rest) > 1 else {}
+
+    client = APIClient()
+    if as_user:
+        client.force_authenticate(getattr(world, as_user))
+    cache.clear()  # cold user/bundle/live-status caches at both sizes
+    with CaptureQueriesContext(connection) as queries:
+        response = getattr(client, method)(path, data, format=fmt, **headers)
+        if response.streaming:
+            b"".join(response.streaming_content)
+    assert response.status_code < 400, f"{method.upper()} {path} -> {response.status_code}: {response.content[:300]}"
+    return [query["sql"] for query in queries.captured_queries]
+
+
+def listing(sql):
+    return "\n".join(f"  {i}. {statement}" for i, statement in enumerate(sql, 1))
+
+
+@pytest.fixture(autouse=True)
+def metrics_token(settings):
+    settings.METRICS_TOKEN = "scrape"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("name, method, as_user, budget, build", CASES, ids=[f"{c[1]}:{c[0]}" for c in CASES])
+def test_query_budget(name, method, as_user, budget, build):
+    world = make_world()
+
+    grow(world, SMALL)
+    small = measure(world, method, as_user, build)
+    grow(world, LARGE)
+    large = measure(world, method, as_user, build)
+
+    assert len(large) == len(small), (
+        f"{method.upper()} {name}: {len(small)} queries with {SMALL} rows but {len(large)} with {LARGE} "
+        f"(N+1?)\n{listing(large)}"
+    )
+    assert len(large) <= budget, (
+        f"{method.upper()} {name}: {len(large)} queries, budget {budget}\n{listing(large)}"
+    )
@@ -0,0 +1,39 @@
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from tasks.models import Task, TaskStatusLog, TaskComment, Notification, ArchivedTask
+from tasks.utils.retention import run_retention
+
+User = get_user_model()
+
+@pytest.mark.django_db
+def test_retention_archives_finished_tasks_and_prunes_notifications():
+    giver = User.objects.create_user(username="giver", email="giver@example.com", password="pass")
+    old = Task.objects.create(title="Old", giver=giver, status="completed")
+    fresh = Task.objects.create(title="Fresh", giver=giver, status="completed")
+    TaskStatusLog.objects.create(task=old, user=giver, old_status="moderation", new_status="completed")
+    TaskComment.objects.create(task=old, user=giver, text="done")
+    Notification.objects.all().delete()
+    Notification.objects.create(user=giver, title="seen", message="", is_read=True)
+    Notification.objects.create(user=giver, title="unseen", message="")
+
+    later = timezone.now() + timedelta(days=365)
+    Task.objects.filter(id=fresh.id).update(updated_at=later)
+    Notification.objects.update(created_at=timezone.now() - timedelta(days=365))
+
+    report = run_retention(batch_size=1, pause=0, now=later)
+
+    assert report == {"notifications": 1, "tasks": 1, "archived_tasks": 0, "tombstones": 2}
+    assert list(Task.objects.values_list("id", flat=True)) == [fresh.id]
+    archived = ArchivedTask.objects.get(id=old.id)
+    assert archived.status_logs.count() == 1
+    assert archived.history["comments"][0]["text"] == "done"
+    assert list(Notification.objects.values_list("title", flat=True)) == ["unseen"]
+
+    client = APIClient()
+    client.force_authenticate(giver)
+    response = client.get("/archive/tasks/")
+    assert response.data["count"] == 1
+    assert client.get(f"/archive/tasks/{old.id}/logs/").data[0]["new_status"] == "completed"
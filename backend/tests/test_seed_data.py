@@ -0,0 +1,68 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+
+from tasks.models import Notification, Purchase, Task, TaskFeedback, TaskStatusLog
+from tasks.utils.counters import rebuild_counters
+from tasks.utils.seeding import seed
+
+User = get_user_model()
+
+
+def task_shape():
+    return list(Task.all_objects.order_by("id").values_list("status", "priority", "difficulty", "approx_time", "exp_earned"))
+
+
+@pytest.mark.django_db
+def test_seed_data_command_writes_requested_volume():
+    out = StringIO()
+    call_command("seed_data", users=40, tasks=400, method="bulk", stdout=out)
+
+    assert User.objects.count() == 40
+    assert Task.objects.count() == 400
+    assert TaskStatusLog.objects.count() >= 400
+    assert "Wrote" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_seeded_history_is_consistent():
+    counts = seed(40, 400, seed=3, use_copy=False)
+
+    # Save hooks and signals were bypassed: no extra notifications
+    assert Notification.objects.count() == counts["Notification"]
+    # Generated history keeps its own timestamps
+    assert Task.objects.filter(created_at__lt=timezone.now() - timedelta(days=30)).exists()
+    # Every task's last log is its current status
+    for task in Task.objects.prefetch_related("status_logs"):
+        assert max(task.status_logs.all(), key=lambda log: log.timestamp).new_status == task.status
+    # Feedback only on completed tasks; purchases never overdraw honor
+    assert not TaskFeedback.objects.exclude(task__status="completed").exists()
+    assert Purchase.objects.exists() and not User.objects.filter(honor__lt=0, purchases__isnull=False).exists()
+    # Stored counters match what the history implies
+    assert rebuild_counters(dry_run=True)["drifted"] == 0
+
+
+@pytest.mark.django_db
+def test_same_seed_same_dataset():
+    seed(20, 200, seed=11, use_copy=False)
+    first = task_shape()
+    Task.all_objects.all().delete()
+    User.all_objects.all().delete()
+
+    seed(20, 200, seed=11, use_copy=False)
+    assert task_shape() == first
+
+    Task.all_objects.all().delete()
+    seed(20, 200, seed=12, use_copy=False)
+    assert task_shape() != first
+
+
+@pytest.mark.django_db
+def test_new_rows_get_ids_after_seeded_ones():
+    seed(5, 20, use_copy=False)
+    user = User.objects.create_user(username="after-seed", email="after@example.com", password="x")
+    assert user.id > User.objects.exclude(id=user.id).order_by("-id").first().id
@@ -0,0 +1,118 @@
+import pytest
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.contrib.admin.sites import site
+from django.test import Client, RequestFactory
+from tasks.models import Task, TaskStatusLog, TaskComment, Notification
+from tasks.utils.importer import import_users
+
+User = get_user_model()
+
+@pytest.mark.django_db
+def test_task_destroy_hides_then_purge_removes_dependents():
+    giver = User.objects.create_user(username="giver", email="giver@example.com", password="pass")
+    task = Task.objects.create(title="Doomed", giver=giver)
+    TaskStatusLog.objects.create(task=task, user=giver, old_status="not_in_work", new_status="in_work")
+    TaskComment.objects.create(task=task, user=giver, text="bye")
+
+    client = APIClient()
+    client.force_authenticate(giver)
+    assert client.delete(f"/tasks/{task.id}/").status_code == 204
+    assert client.get(f"/tasks/{task.id}/").status_code == 404
+    assert TaskStatusLog.objects.filter(task_id=task.id).exists()
+
+    call_command("purge_deleted", "--batch-size", "1", "--pause", "0")
+
+    assert not Task.all_objects.filter(id=task.id).exists()
+    assert not TaskStatusLog.objects.filter(task_id=task.id).exists()
+    assert not TaskComment.objects.filter(task_id=task.id).exists()
+
+@pytest.mark.django_db
+def test_user_soft_delete_hides_user_and_tasks():
+    giver = User.objects.create_user(username="giver", email="giver@example.com", password="pass")
+    worker = User.objects.create_user(username="worker", email="worker@example.com", password="pass")
+    Task.objects.create(title="Given", giver=giver, assignee=worker)
+
+    worker.soft_delete()
+
+    assert not User.objects.filter(id=worker.id).exists()
+    assert not Task.objects.exists()
+
+    call_command("purge_deleted", "--pause", "0")
+
+    assert not User.all_objects.filter(id=worker.id).exists()
+    assert not Task.all_objects.exists()
+    assert not Notification.objects.filter(user_id=worker.id).exists()
+    assert User.objects.filter(id=giver.id).exists()
+
+@pytest.mark.django_db
+def test_soft_deleted_user_still_holds_username_and_email():
+    gone = User.objects.create_user(username="gone", email="gone@example.com", password="pass")
+    gone.soft_delete()
+
+    response = APIClient().post("/auth/register/", {
+        "username": "gone", "email": "gone@example.com", "password": "TestPass123", "password2": "TestPass123",
+        "first_name": "Re", "last_name": "Turn",
+    })
+    assert response.status_code == 400
+    assert set(response.data) == {"username", "email"}
+
+    report = import_users([(2, {"username": "gone", "email": "new@example.com"})], workers=1)
+    assert report.created == 0 and report.errors[0]["errors"] == {"username": "A user with that username already exists."}
+
+@pytest.mark.django_db
+def test_admin_bulk_delete_is_set_based(django_assert_num_queries):
+    admin = User.objects.create_user(username="boss", email="boss@example.com", password="pass", is_staff=True)
+    users = [User.objects.create_user(username=f"u{i}", email=f"u{i}@example.com", password="pass") for i in range(3)]
+    for user in users:
+        Task.objects.create(title=user.username, giver=admin, assignee=user)
+    request = RequestFactory().post("/admin/tasks/user/")
+    request.user = admin
+
+    # ids, users, their tasks
+    with django_assert_num_queries(3):
+        site._registry[User].delete_queryset(request, User.objects.filter(username__startswith="u"))
+    assert list(User.objects.values_list("username", flat=True)) == ["boss"]
+    assert not Task.objects.exists()
+
+    tasks = [Task.objects.create(title=f"t{i}", giver=admin) for i in range(3)]
+    with django_assert_num_queries(2):
+        site._registry[Task].delete_queryset(request, Task.objects.all())
+    assert Task.all_objects.filter(id__in=[t.id for t in tasks], deleted_at__isnull=False).count() == 3
+
+@pytest.mark.django_db
+def test_task_comments_404_once_task_is_soft_deleted():
+    giver = User.objects.create_user(username="giver", email="giver@example.com", password="pass")
+    task = Task.objects.create(title="Doomed", giver=giver)
+    client = APIClient()
+    client.force_authenticate(giver)
+    assert client.post(f"/tasks/{task.id}/comments/", {"text": "hi"}).status_code == 201
+
+    task.soft_delete()
+    assert client.get(f"/tasks/{task.id}/comments/").status_code == 404
+    assert client.post(f"/tasks/{task.id}/comments/", {"text": "late"}).status_code == 404
+    assert TaskComment.objects.filter(task_id=task.id).count() == 1
+
+@pytest.mark.django_db
+def test_admin_forms_see_soft_deleted_usernames_and_emails():
+    root = User.objects.create_superuser(username="root", email="root@example.com", password="pass")
+    gone = User.objects.create_user(username="gone", email="gone@example.com", password="pass")
+    gone.soft_delete()
+    client = Client()
+    client.force_login(root)
+
+    response = client.post("/admin/tasks/user/add/", {
+        "username": "gone", "password1": "TestPass123!x", "password2": "TestPass123!x",
+        "first_name": "Re", "last_name": "Turn",
+    })
+    assert response.status_code == 200
+    assert response.context["adminform"].form.errors["username"] == ["A user with that username already exists."]
+
+    other = User.objects.create_user(username="other", email="other@example.com", password="pass")
+    request = RequestFactory().post(f"/admin/tasks/user/{other.id}/change/")
+    request.user = root
+    form_class = site._registry[User].get_form(request, other, fields=["username", "email"])
+    form = form_class(data={"username": "other", "email": "gone@example.com"}, instance=other)
+    assert form.errors["email"] == ["A user with that email already exists."]
+    assert "username" not in form.errors  # its own row
@@ -0,0 +1,74 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tasks.models import Notification, StoreItem, Task
+
+User = get_user_model()
+
+
+@pytest.fixture
+def task(user):
+    other = User.objects.create_user(username="other", email="other@example.com", password="pass")
+    return Task.objects.create(title="Sparse", description="Body", giver=user, assignee=other)
+
+
+def task_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    return response.json(), [q["sql"] for q in ctx.captured_queries if '"tasks_task"' in q["sql"]]
+
+
+@pytest.mark.django_db
+def test_fields_limits_keys_and_columns(client, task):
+    rows, sql = task_queries(client, "/tasks/?fields=id,title,status")
+
+    assert rows == [{"id": task.id, "title": "Sparse", "status": "not_in_work"}]
+    assert "JOIN" not in sql[-1] and '"description"' not in sql[-1]
+
+
+@pytest.mark.django_db
+def test_unexpanded_relations_render_as_ids(client, task):
+    row = client.get(f"/tasks/{task.id}/?fields=id,assignee,giver").json()
+    assert row == {"id": task.id, "assignee": task.assignee_id, "giver": task.giver_id}
+
+    row, sql = task_queries(client, f"/tasks/{task.id}/?fields=id,assignee&expand=assignee")
+    assert row["assignee"]["username"] == "other"
+    assert "JOIN" in sql[-1]
+
+
+@pytest.mark.django_db
+def test_expand_alone_keeps_all_fields(client, task):
+    full = client.get(f"/tasks/{task.id}/").json()
+    row = client.get(f"/tasks/{task.id}/?expand=giver").json()
+
+    assert row.keys() == full.keys()
+    assert row["giver"] == full["giver"] and row["assignee"] == task.assignee_id
+
+
+@pytest.mark.django_db
+def test_default_response_unchanged(client, task):
+    assert client.get("/tasks/").content == client.get("/tasks/?unrelated=1").content
+    assert client.get("/tasks/").json()[0]["assignee"]["username"] == "other"
+
+
+@pytest.mark.django_db
+def test_other_endpoints_prune(client, user):
+    StoreItem.objects.create(name="Hat", description="A hat", cost=5)
+    Notification.objects.create(user=user, message="hi")
+
+    assert client.get("/store/?fields=name,cost").json() == [{"name": "Hat", "cost": 5}]
+    assert client.get("/notifications/?fields=message").json() == [{"message": "hi"}]
+    assert set(client.get("/hall-of-fame/?fields=username,level").json()[0]) == {"username", "level"}
+
+
+@pytest.mark.django_db
+def test_writes_ignore_sparse_queryset(client, task):
+    response = client.patch(f"/tasks/{task.id}/?fields=id,title", {"title": "Renamed"}, format="json")
+
+    assert response.status_code == 200
+    assert response.json() == {"id": task.id, "title": "Renamed"}
+    task.refresh_from_db()
+    assert task.title == "Renamed" and task.description == "Body"
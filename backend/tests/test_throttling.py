@@ -0,0 +1,23 @@
+import pytest
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from tasks.throttling import throttle_metrics
+
+User = get_user_model()
+
+@pytest.mark.django_db
+def test_token_bucket_throttles_per_scope(settings):
+    settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {'read': '2/min', 'write': '100/min'}}
+    user = User.objects.create_user(username="poller", email="poller@example.com", password="pass")
+    client = APIClient()
+    client.force_authenticate(user)
+
+    assert client.get('/notifications/').status_code == 200
+    assert client.get('/notifications/').status_code == 200
+    throttled = client.get('/notifications/')
+    assert throttled.status_code == 429
+    assert int(throttled['Retry-After']) >= 1
+
+    # writes draw from their own bucket
+    assert client.post('/notifications/mark_all_read/').status_code == 200
+    assert throttle_metrics()['read'] == {'allowed': 2, 'throttled': 1}
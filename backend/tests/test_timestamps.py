@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+from tasks.utils import formatting_dt
+from tasks.utils.formatting_dt import TimestampFormatter, format_timestamp
+
+User = get_user_model()
+FORMATTED = ("created_at_formatted", "updated_at_formatted", "deadline_formatted")
+
+
+def test_formatter_matches_format_timestamp_at_minute_resolution():
+    now = timezone.now().replace(second=30, microsecond=0)
+    dt = now - timedelta(minutes=5)
+    formatter = TimestampFormatter(now=now)
+
+    assert formatter(dt) == f"{format_timestamp(dt).split(' — ')[0]} — 5 minutes ago"
+    assert TimestampFormatter("exact", now=now)(dt) == format_timestamp(dt).split(" — ")[0]
+    assert formatter(now + timedelta(hours=2)).endswith("2 hours from now")
+    assert formatter(None) is None
+
+
+def test_relative_text_rendered_once_per_distinct_minute(monkeypatch):
+    calls = []
+    real = formatting_dt.humanize.naturaltime
+    monkeypatch.setattr(formatting_dt.humanize, "naturaltime", lambda value: calls.append(value) or real(value))
+    formatting_dt._relative.cache_clear()
+
+    now = timezone.now()
+    giver = User(id=1, username="g")
+    tasks = [Task(id=i, title="t", giver=giver, created_at=now - timedelta(seconds=i * 7), updated_at=now)
+             for i in range(1000)]
+    TaskSerializer(tasks, many=True).data
+
+    distinct_minutes = {int(t.created_at.timestamp() // 60) for t in tasks} | {int(now.timestamp() // 60)}
+    assert len(calls) <= len(distinct_minutes) + 1
+
+
+@pytest.mark.django_db
+def test_timestamps_none_omits_formatted_fields(client, user):
+    Task.objects.create(title="T", giver=user, assignee=user)
+
+    row = client.get("/tasks/?timestamps=none").json()[0]
+
+    assert not set(FORMATTED) & set(row)
+    assert row["created_at"] and "updated_at" in row
+
+
+@pytest.mark.django_db
+def test_exact_mode_is_byte_identical_and_default_is_relative(client, user):
+    task = Task.objects.create(title="T", giver=user, assignee=user, deadline=timezone.now() + timedelta(days=1))
+
+    client.get("/tasks/")  # first request marks the user online
+    first = client.get(f"/tasks/{task.id}/?timestamps=exact").content
+    assert client.get(f"/tasks/{task.id}/?timestamps=exact").content == first
+    assert b"ago" not in first
+
+    row = client.get(f"/tasks/{task.id}/").json()
+    assert row["created_at_formatted"].endswith(" — now")
+    assert row["deadline_formatted"].endswith("from now")
+
+
+@pytest.mark.django_db
+def test_action_responses_honour_the_flag(client, user):
+    task = Task.objects.create(title="T", giver=user, assignee=user)
+
+    row = client.post(f"/tasks/{task.id}/update_status/?timestamps=none", {"status": "in_work"}, format="json").json()
+
+    assert row["status"] == "in_work"
+    assert not set(FORMATTED) & set(row)
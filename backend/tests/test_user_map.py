@@ -0,0 +1,90 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from tasks.models import Task, TaskComment, TaskStatusLog
+from tasks.serializers import TaskCommentSerializer, TaskStatusLogSerializer, UserShortSerializer
+
+User = get_user_model()
+
+
+@pytest.fixture
+def world(db):
+    giver = User.objects.create_user(username="giver", email="giver@example.com", password="pass")
+    worker = User.objects.create_user(username="worker", email="worker@example.com", password="pass")
+    User.objects.filter(pk=worker.pk).update(avatar="avatars/worker.png")
+    task = Task.objects.create(title="T", giver=giver, assignee=worker)
+    TaskComment.objects.bulk_create(
+        TaskComment(task=task, user=(giver, worker)[i % 2], text=f"c{i}") for i in range(20)
+    )
+    return task
+
+
+def user_queries(ctx):
+    return [q["sql"] for q in ctx.captured_queries if 'FROM "tasks_user"' in q["sql"]]
+
+
+@pytest.mark.django_db
+def test_nested_users_match_user_short_serializer(world):
+    request = RequestFactory().get("/")
+    comments = TaskComment.objects.filter(task=world).order_by("id")
+
+    data = TaskCommentSerializer(comments, many=True, context={"request": request}).data
+
+    worker = User.objects.get(username="worker")
+    assert data[1]["user"] == UserShortSerializer(worker, context={"request": request}).data
+    assert data[1]["user"]["avatar"] == "http://testserver/media/avatars/worker.png"
+
+
+@pytest.mark.django_db
+def test_each_user_loaded_and_serialized_once(world, monkeypatch):
+    calls = []
+    real = UserShortSerializer.get_avatar
+    monkeypatch.setattr(UserShortSerializer, "get_avatar", lambda self, obj: calls.append(obj.id) or real(self, obj))
+    comments = TaskComment.objects.filter(task=world)
+
+    with CaptureQueriesContext(connection) as ctx:
+        data = TaskCommentSerializer(comments, many=True, context={"request": RequestFactory().get("/")}).data
+
+    assert len(data) == 20
+    assert len(user_queries(ctx)) == 1
+    assert sorted(calls) == sorted({world.giver_id, world.assignee_id})
+    assert data[0]["user"] is data[2]["user"]
+
+
+@pytest.mark.django_db
+def test_joined_users_need_no_query(world):
+    comments = TaskComment.objects.filter(task=world).select_related("user")
+
+    with CaptureQueriesContext(connection) as ctx:
+        TaskCommentSerializer(comments, many=True).data
+
+    assert len(ctx.captured_queries) == 1
+
+
+@pytest.mark.django_db
+def test_map_is_shared_across_serializers_of_a_request(world):
+    TaskStatusLog.objects.create(task=world, user=world.giver, old_status="not_in_work", new_status="in_work")
+    context = {"request": RequestFactory().get("/")}
+    TaskCommentSerializer(TaskComment.objects.filter(task=world), many=True, context=context).data
+
+    with CaptureQueriesContext(connection) as ctx:
+        logs = TaskStatusLogSerializer(TaskStatusLog.objects.filter(task=world), many=True, context=context).data
+
+    assert logs[0]["user"]["username"] == "giver"
+    assert user_queries(ctx) == []
+
+
+@pytest.mark.django_db
+def test_soft_deleted_and_missing_users(world, client_for):
+    ghost = User.objects.create_user(username="ghost", email="ghost@example.com", password="pass")
+    TaskComment.objects.create(task=world, user=ghost, text="boo")
+    ghost.soft_delete()
+    TaskStatusLog.objects.create(task=world, user=None, old_status="not_in_work", new_status="in_work")
+    client = client_for(world.giver)
+
+    comments = client.get(f"/tasks/{world.id}/comments/").json()
+    assert {c["user"]["username"] for c in comments} == {"giver", "worker", "ghost"}
+    assert client.get(f"/tasks/{world.id}/logs/").json()[0]["user"] is None